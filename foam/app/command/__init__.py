@@ -1,4 +1,4 @@
-__all__ = ['adapter', 'core']
+__all__ = ['adapter', 'core', 'criterion', 'monitor', 'usage']
 
 
-from . import adapter, core
+from . import adapter, core, criterion, monitor, usage
@@ -1,7 +1,8 @@
-__all__ = ['Apps', 'Default']
+__all__ = ['Apps', 'Default', 'Tee']
 
 
 import re
+import time
 import typing as t
 
 from ...base.lib import tqdm
@@ -34,34 +35,111 @@ class Default(Base):
 
         return cls(Foam.default())
 
+    def attach(self, proc: Any) -> None:
+        '''Running process (`subprocess.Popen` or `asyncio.subprocess.Process`)'''
+        pass
+
     def step(self, line: bytes) -> None:
+        self.feed(line)
+
+    def feed(self, lines: bytes) -> None:
+        '''Complete lines of output (chunk)'''
         pass
 
     def close(self) -> None:
         pass
 
 
+class Tee(Default):
+    '''Feed output to several apps'''
+
+    __slots__ = ('apps', )
+
+    def __init__(self, *apps: Default) -> None:
+        self.apps = apps
+
+    def __enter__(self) -> 'te.Self':
+        for app in self.apps:
+            app.__enter__()
+        return self
+
+    def __exit__(self, type: Any, value: Any, traceback: Any) -> None:
+        for app in self.apps:
+            app.__exit__(type, value, traceback)
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls()
+
+    def attach(self, proc: Any) -> None:
+        for app in self.apps:
+            app.attach(proc)
+
+    def feed(self, lines: bytes) -> None:
+        for app in self.apps:
+            app.feed(lines)
+
+
 class AppBase(Default):
-    '''Base app'''
+    '''Base app
 
-    __slots__ = ('pbar', '_new', '_old')
+    Note:
+        - all dialects are alternatives of one compiled pattern (`table`), each app picks its named group
+        - only the last progress value of a chunk matters, so the keyword is searched backwards and the line is validated by `table`
+        - progress bar is refreshed at most once per `interval` seconds
+    '''
+
+    __slots__ = ('pbar', '_new', '_old', '_time')
+    group = ''  # named group in table
+    interval = 0.1  # at most 10 Hz
+    table = re.compile(rb'''
+        ^[ \t]*(?:
+            Time\ =\ (?P<TimeI>[-+.\deE]+)
+            | Time:\ (?P<TimeII>[-+.\deE]+)
+            | Iteration\ =\ (?P<IterationI>[-+.\deE]+)
+            | Iteration:\ (?P<IterationII>[-+.\deE]+)
+            | Processor\ (?P<Processor>\d+)[ \t\r]*$
+        )
+    ''', re.MULTILINE | re.VERBOSE)
+    keywords = {
+        'TimeI': b'Time = ', 'TimeII': b'Time: ',
+        'IterationI': b'Iteration = ', 'IterationII': b'Iteration: ',
+        'Processor': b'Processor ',
+    }
 
     def __init__(self, foam: 'Foam', desc: t.Optional[str] = None) -> None:
         start = float(foam['foam']['system', 'controlDict', 'startTime'])
         end = float(foam['foam']['system', 'controlDict', 'endTime'])
         self.pbar = tqdm.tqdm(total=end-start, desc=desc)
         self._new = self._old = start
+        self._time = 0.0
 
     def __exit__(self, type: Any, value: Any, traceback: Any) -> None:
+        self.refresh()
         self.pbar.close()
 
-    def step(self, line: bytes) -> None:
-        now = self.now(line) or self._new
-        self._new, self._old = now, self._new
+    def feed(self, lines: bytes) -> None:
+        now = self.now(lines)
+        if now is not None:
+            self._new = now
+            if time.monotonic()-self._time >= self.interval:
+                self.refresh()
+
+    def now(self, lines: bytes) -> t.Optional[float]:
+        '''Last progress value in lines'''
+        keyword, end = self.keywords[self.group], len(lines)
+        while True:
+            end = lines.rfind(keyword, 0, end)
+            if end < 0:
+                return None
+            match = self.table.match(lines, lines.rfind(b'\n', 0, end)+1)
+            if match is not None and match.lastgroup == self.group:
+                return float(match.group(self.group))
+
+    def refresh(self) -> None:
+        self._time = time.monotonic()
         self.pbar.update(self._new-self._old)
-
-    def now(self, line: bytes) -> t.Optional[float]:
-        raise NotImplementedError
+        self._old = self._new
 
 
 class AppByTimeI(AppBase):
@@ -141,11 +219,7 @@ class AppByTimeI(AppBase):
     '''
 
     __slots__ = ()
-
-    def now(self, line: bytes) -> t.Optional[float]:
-        line = line.strip()
-        if line.startswith(b'Time = '):
-            return float(line[7:])
+    group = 'TimeI'
 
 
 class AppByTimeII(AppBase):
@@ -156,11 +230,7 @@ class AppByTimeII(AppBase):
     '''
 
     __slots__ = ()
-
-    def now(self, line: bytes) -> t.Optional[float]:
-        line = line.strip()
-        if line.startswith(b'Time: '):
-            return float(line[6:])
+    group = 'TimeII'
 
 
 class AppByIterationI(AppBase):
@@ -171,11 +241,7 @@ class AppByIterationI(AppBase):
     '''
 
     __slots__ = ()
-
-    def now(self, line: bytes) -> t.Optional[float]:
-        line = line.strip()
-        if line.startswith(b'Iteration = '):
-            return float(line[12:])
+    group = 'IterationI'
 
 
 class AppByIterationII(AppBase):
@@ -187,11 +253,7 @@ class AppByIterationII(AppBase):
     '''
 
     __slots__ = ()
-
-    def now(self, line: bytes) -> t.Optional[float]:
-        line = line.strip()
-        if line.startswith(b'Iteration: '):
-            return float(line[11:])
+    group = 'IterationII'
 
 
 class AppByProcessor(AppBase):
@@ -203,17 +265,14 @@ class AppByProcessor(AppBase):
     '''
 
     __slots__ = ()
+    group = 'Processor'
 
     def __init__(self, foam: 'Foam', desc: t.Optional[str] = None) -> None:
         start = 0
         end = foam.number_of_processors - 1
         self.pbar = tqdm.tqdm(total=end-start, desc=desc)
         self._new = self._old = start
-
-    def now(self, line: bytes) -> t.Optional[float]:
-        line = line.strip()
-        if line.startswith(b'Processor ') and line[10:].isdigit():
-            return int(line[10:])
+        self._time = 0.0
 
 
 class AppByOther(AppBase):
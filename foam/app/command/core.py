@@ -1,14 +1,25 @@
 __all__ = ['Command']
 
 
+import asyncio
+import bisect
+import concurrent.futures as cf
+import json
+import os
+import pathlib as p
 import shlex
 import shutil
 import subprocess as s
+import threading
+import time
 import typing as t
 import warnings as w
 
-from .adapter import Default, Apps
-from ...base.type import CmdItem, CmdItems, DictStr2, DictStrAny, Func1, ListFloat, ListInt, ListStr, SetPath
+from .adapter import Default, Apps, Tee
+from .criterion import Criterion, Stop
+from .monitor import Monitor
+from .usage import Usage
+from ...base.type import CmdItem, CmdItems, DictStr, DictStr2, DictStrAny, Func1, ListFloat, ListInt, ListStr, SetPath
 from ...compat.functools import cached_property
 from ...util.function import deprecated_classmethod
 from ...util.implementation import Base
@@ -22,13 +33,31 @@ if t.TYPE_CHECKING:
     Kwargs = te.ParamSpecKwargs(P)
 
 
+class Index(t.NamedTuple):
+    '''Directory index of case (or `processor*`) directory'''
+
+    mtime: int  # nanoseconds
+    times: ListFloat  # sorted
+    names: ListStr  # names of time directories, in the same order as `times`
+    logs: ListStr
+    processors: ListInt  # sorted
+
+
 class Command(Base):
     '''OpenFOAM command wrapper'''
 
-    __slots__ = ('_foam', )
+    __slots__ = ('_foam', '_monitors', '_index')
+    chunk = 2**16  # bytes read from pipe at a time
+    interval = 0.1  # seconds between reads of log file in direct mode
+    limit = 2**24  # buffer size of asynchronous streams
+    record = 'log.stats.jsonl'  # resource usage of each executed step
+    _lock = threading.Lock()
+    racy = 2 * 10**9  # nanoseconds, directories modified more recently are rescanned (coarse mtime granularity)
 
     def __init__(self, foam: 'Foam') -> None:
         self._foam = foam
+        self._monitors: DictStr[Monitor] = {}
+        self._index: t.Dict[p.Path, Index] = {}
 
     @classmethod
     def default(cls) -> 'te.Self':
@@ -48,23 +77,72 @@ class Command(Base):
     @property
     def times(self) -> ListFloat:
         '''Time directories'''
-        times = []
-        for path in self._foam.destination.iterdir():
-            try:
-                time = float(path.name)
-            except ValueError:
-                continue
-            times.append(time)
-        return sorted(times)
+        return list(self._scan(self._foam.destination).times)
 
     @property
     def logs(self) -> SetPath:
         '''Log files'''
-        logs = set()
-        for path in self._foam.destination.iterdir():
-            if path.stem == 'log':
-                logs.add(path)
-        return logs
+        root = self._foam.destination
+        return {root/name for name in self._scan(root).logs}
+
+    @property
+    def processors(self) -> ListInt:
+        '''Indices of `processor*` directories'''
+        return list(self._scan(self._foam.destination).processors)
+
+    def select(
+        self,
+        start: t.Optional[float] = None, end: t.Optional[float] = None, stride: int = 1,
+        processor: t.Optional[int] = None,
+    ) -> ListFloat:
+        '''Time directories within [start, end], every `stride`-th, of `processor<N>` if specified
+
+        Example:
+            >>> foam.cmd.select(0.1, 0.5, stride=2, processor=0)
+            [0.1, 0.3, 0.5]
+
+        Note:
+            - directory index is cached until modification time of directory changes
+        '''
+        times = self._scan(self._root(processor)).times
+        lo = 0 if start is None else bisect.bisect_left(times, start)
+        hi = len(times) if end is None else bisect.bisect_right(times, end)
+        return times[lo:hi:stride]
+
+    def directory(self, time: float, processor: t.Optional[int] = None) -> p.Path:
+        '''Path of time directory (original spelling of name, e.g. "0.10")'''
+        root = self._root(processor)
+        index = self._scan(root)
+        ith = bisect.bisect_left(index.times, time)
+        if ith == len(index.times) or index.times[ith] != time:
+            raise KeyError(time)
+        return root / index.names[ith]
+
+    @property
+    def stats(self) -> DictStr[DictStrAny]:
+        '''Resource usage of latest run of each step (log file name as key)
+
+        Example:
+            >>> foam.cmd.stats['log.icoFoam']
+            {'command': 'icoFoam', 'log': 'log.icoFoam', 'code': 0, 'start': 1700000000.0, 'wall': 1.8, 'user': 1.7, 'sys': 0.1, ...}
+
+        Note:
+            - see `usage.Usage` for the meaning of each entry
+        '''
+        path = self._foam.destination / self.record
+        if not path.exists():
+            return {}
+        records = map(json.loads, path.read_text().splitlines())
+        return {record['log']: record for record in records}
+
+    @property
+    def monitors(self) -> DictStr[Monitor]:
+        '''Streaming log parsers of monitored steps (log file name as key), readable while running
+
+        Note:
+            - steps running the application are monitored, dictionary step can set `monitor` explicitly
+        '''
+        return self._monitors
 
     @cached_property
     def macros(self) -> DictStr2:
@@ -82,7 +160,8 @@ class Command(Base):
     def all_run(
         self,
         overwrite: bool = False, exception: bool = False,
-        parallel: bool = True, unsafe: bool = True,
+        parallel: bool = True, unsafe: bool = True, cores: t.Optional[int] = None,
+        criteria: t.Optional[t.List[Criterion]] = None,
     ) -> ListInt:
         '''Inspired by  `Allrun`'''
         if not self._foam.pipeline:
@@ -90,7 +169,23 @@ class Command(Base):
 
             return [self.raw('./Allrun').returncode]
         else:
-            return self.run(self._foam.pipeline, overwrite=overwrite, exception=exception, parallel=parallel, unsafe=unsafe)
+            return self.run(self._foam.pipeline, overwrite=overwrite, exception=exception, parallel=parallel, unsafe=unsafe, cores=cores, criteria=criteria)
+
+    async def all_arun(
+        self,
+        overwrite: bool = False, exception: bool = False,
+        parallel: bool = True, unsafe: bool = True, timeout: t.Optional[float] = None,
+        criteria: t.Optional[t.List[Criterion]] = None,
+    ) -> ListInt:
+        '''Asynchronous `Command::all_run`'''
+        if not self._foam.pipeline:
+            assert (self._foam.destination/'Allrun').exists()
+
+            proc = await asyncio.create_subprocess_exec('./Allrun', cwd=self._foam.destination, stdout=s.PIPE, stderr=s.PIPE)
+            await self._await(proc, proc.communicate(), timeout)
+            return [proc.returncode]
+        else:
+            return await self.arun(self._foam.pipeline, overwrite=overwrite, exception=exception, parallel=parallel, unsafe=unsafe, timeout=timeout, criteria=criteria)
 
     def all_clean(self) -> None:
         '''Inspired by `Allclean`'''
@@ -102,37 +197,62 @@ class Command(Base):
         self,
         commands: CmdItems,
         suffix: str = '', overwrite: bool = False, exception: bool = True,
-        parallel: bool = True, unsafe: bool = False,
+        parallel: bool = True, unsafe: bool = False, cores: t.Optional[int] = None, direct: bool = False,
+        criteria: t.Optional[t.List[Criterion]] = None,
     ) -> ListInt:
         '''Inspired by `runApplication` and `runParallel`
 
+        Example:
+            >>> foam.cmd.run([
+            ...     {'command': 'postProcess -func writeCellCentres', 'suffix': '.C', 'depends_on': []},
+            ...     {'command': 'postProcess -func writeCellVolumes', 'suffix': '.V', 'depends_on': []},
+            ...     {'command': 'foamToVTK', 'depends_on': [0, 1], 'resources': 1},
+            ... ], cores=4)
+            [0, 0, 0]
+
+        Note:
+            - output is copied to log file in chunks, progress apps scan complete lines of each chunk
+            - with `direct` (also a key of dictionary step), process writes to log file itself and progress is read back from the file
+            - with `cores`, ready steps run concurrently within the core budget, return codes are still in declared order
+            - `depends_on` lists indices (or `name`) of steps, steps without it wait for all previous steps
+            - `resources` defaults to the number of processes a step launches
+            - resource usage of each executed step is appended to `log.stats.jsonl`, see `Command::stats`
+            - `criteria` (also a key of dictionary step, together with `signal`) stop monitored steps early, see `criterion.Stop`
+
         Reference:
             - https://github.com/OpenFOAM/OpenFOAM-7/blob/master/bin/tools/RunFunctions
         '''
-        codes: ListInt = [-1] * len(commands)
-        for ith, command in enumerate(commands):
-            option = self._command(command, suffix=suffix, overwrite=overwrite, exception=exception, parallel=parallel)
-            raws = self._split(option['command'], False)
-            args = self._split(option['command'], option['parallel'] and self._foam.number_of_processors>1)
-            path = self._foam.destination / f'log.{raws[0].replace("./", "")}{option["suffix"]}'
-            # Option: overwrite, exception
-            if not option['overwrite'] and path.exists():
-                message = f'{raws[0]} already run on {path.parent.absolute()}: remove log file "{path.name}" to re-run'
-                if option['exception']:
-                    raise Exception(message)
-                else:
-                    w.warn(message)
-                    continue
-            # TODO: verbose?
-            print(f'Running {raws[0]} on {path.parent.absolute()} using {self._foam.number_of_processors} processes if in parallel')
-            # TODO: rewritten as parenthesized context managers when updated to 3.10
-            App: Func1['Foam', Default] \
-                = lambda foam: Apps.get(raws[0], Default)(foam, raws[0])
-            with self._popen(args, unsafe) as proc, open(path, 'wb') as file, App(self._foam) as app:
-                for line in proc.stdout:
-                    file.write(line)
-                    app.step(line)
-            codes[ith] = proc.returncode
+        options = [
+            self._command(command, suffix=suffix, overwrite=overwrite, exception=exception, parallel=parallel, direct=direct, criteria=criteria)
+            for command in commands
+        ]
+        if cores is None:
+            return [self._run(option, unsafe) for option in options]
+        else:
+            return self._schedule(options, unsafe, cores)
+
+    async def arun(
+        self,
+        commands: CmdItems,
+        suffix: str = '', overwrite: bool = False, exception: bool = True,
+        parallel: bool = True, unsafe: bool = False, timeout: t.Optional[float] = None,
+        criteria: t.Optional[t.List[Criterion]] = None,
+    ) -> ListInt:
+        '''Asynchronous `Command::run`, output is streamed without blocking the event loop
+
+        Example:
+            >>> async def main(foams):
+            ...     return await asyncio.gather(*(foam.cmd.all_arun(timeout=3600) for foam in foams))
+            >>> asyncio.run(main(foams))
+            [[0, 0], [0, 0], ...]
+
+        Note:
+            - `timeout` (seconds) applies to each step, the process is terminated on timeout or cancellation
+        '''
+        codes: ListInt = []
+        for command in commands:
+            option = self._command(command, suffix=suffix, overwrite=overwrite, exception=exception, parallel=parallel, criteria=criteria)
+            codes.append(await self._arun(option, unsafe, timeout))
         return codes
 
     def raw(self, command: str, output: bool = True) -> s.CompletedProcess:
@@ -144,6 +264,196 @@ class Command(Base):
         stdout = self.raw(f'which {command}', output=True).stdout.decode().strip()
         return stdout or None
 
+    def _root(self, processor: t.Optional[int] = None) -> p.Path:
+        root = self._foam.destination
+        return root if processor is None else root/f'processor{processor}'
+
+    def _scan(self, root: p.Path) -> Index:
+        '''Directory index with `os.scandir`, cached until modification time of directory changes'''
+        mtime = os.stat(root).st_mtime_ns
+        index = self._index.get(root, None)
+        if index is not None and index.mtime == mtime:
+            return index
+        pairs, logs, processors = [], [], []
+        with os.scandir(root) as entries:
+            for entry in entries:
+                name = entry.name
+                if name[0] in '0123456789+-.':
+                    try:
+                        pairs.append((float(name), name))
+                    except ValueError:
+                        pass
+                elif name.startswith('log') and p.PurePath(name).stem == 'log':
+                    logs.append(name)
+                elif name.startswith('processor') and name[9:].isdigit() and entry.is_dir():
+                    processors.append(int(name[9:]))
+        pairs.sort()
+        index = Index(mtime, [time for time, _ in pairs], [name for _, name in pairs], logs, sorted(processors))
+        if time.time_ns()-mtime > self.racy:
+            self._index[root] = index
+        return index
+
+    def _run(self, option: DictStrAny, unsafe: bool) -> int:
+        '''Run single step, -1 if skipped'''
+        prepared = self._prepare(option)
+        if prepared is None:
+            return -1
+        args, path, App = prepared
+        start = time.time()
+        with Usage() as usage:
+            if option.get('direct', False):
+                code = self._run_direct(args, path, App, unsafe, usage)
+            else:
+                code = self._run_pipe(args, path, App, unsafe, usage)
+        self._record(args, path, code, start, usage)
+        return code
+
+    def _run_pipe(self, args: ListStr, path: p.Path, App: Func1['Foam', Default], unsafe: bool, usage: Usage) -> int:
+        '''Output is copied to log file in chunks'''
+        # TODO: rewritten as parenthesized context managers when updated to 3.10
+        with self._popen(args, unsafe) as proc, open(path, 'wb') as file, App(self._foam) as app:
+            usage.attach(proc.pid)
+            app.attach(proc)
+            rest = b''
+            for chunk in iter(lambda: proc.stdout.read1(self.chunk), b''):
+                file.write(chunk)  # buffered writer writes whole chunk
+                file.flush()  # log file can be tailed while step runs
+                rest = self._step(app, rest, chunk)
+            self._step(app, rest, b'', final=True)
+        return proc.returncode
+
+    def _run_direct(self, args: ListStr, path: p.Path, App: Func1['Foam', Default], unsafe: bool, usage: Usage) -> int:
+        '''Process writes to log file descriptor, only progress parsing stays in Python'''
+        with open(path, 'wb') as file, self._popen(args, unsafe, stdout=file) as proc, App(self._foam) as app:
+            usage.attach(proc.pid)
+            if type(app) is Default:
+                return proc.wait()
+            app.attach(proc)
+            with open(path, 'rb') as tail:
+                rest = b''
+                while proc.poll() is None:
+                    time.sleep(self.interval)
+                    rest = self._step(app, rest, tail.read())
+                self._step(app, rest, tail.read(), final=True)
+        return proc.returncode
+
+    def _step(self, app: Default, rest: bytes, chunk: bytes, final: bool = False) -> bytes:
+        '''Pass complete lines to progress app, return incomplete last line'''
+        if type(app) is Default:  # nothing to parse
+            return b''
+        data = rest + chunk
+        end = len(data) if final else data.rfind(b'\n')+1
+        if end:
+            app.feed(data[:end])
+        return data[end:]
+
+    async def _arun(self, option: DictStrAny, unsafe: bool, timeout: t.Optional[float]) -> int:
+        prepared = self._prepare(option)
+        if prepared is None:
+            return -1
+        args, path, App = prepared
+        kwargs = {'cwd': self._foam.destination, 'stdout': s.PIPE, 'limit': self.limit}
+        start = time.time()
+        with Usage() as usage:
+            if unsafe:
+                proc = await asyncio.create_subprocess_shell(' '.join(args), **kwargs)
+            else:
+                proc = await asyncio.create_subprocess_exec(*args, **kwargs)
+            usage.attach(proc.pid)
+            with open(path, 'wb') as file, App(self._foam) as app:
+                app.attach(proc)
+                await self._await(proc, self._pump(proc, file, app), timeout)
+        self._record(args, path, proc.returncode, start, usage)
+        return proc.returncode
+
+    async def _pump(self, proc: 'asyncio.subprocess.Process', file: t.BinaryIO, app: Default) -> None:
+        rest = b''
+        while True:
+            chunk = await proc.stdout.read(self.chunk)
+            if not chunk:
+                break
+            file.write(chunk)
+            rest = self._step(app, rest, chunk)
+        self._step(app, rest, b'', final=True)
+        await proc.wait()
+
+    async def _await(self, proc: 'asyncio.subprocess.Process', awaitable: t.Awaitable[t.Any], timeout: t.Optional[float]) -> None:
+        '''Terminate process on timeout or cancellation'''
+        try:
+            await asyncio.wait_for(awaitable, timeout)
+        except BaseException:  # asyncio.CancelledError, asyncio.TimeoutError, ...
+            if proc.returncode is None:
+                proc.terminate()
+                await proc.wait()
+            raise
+
+    def _prepare(self, option: DictStrAny) -> t.Optional[t.Tuple[ListStr, p.Path, Func1['Foam', Default]]]:
+        '''Arguments, log path and progress app of step, None if skipped'''
+        raws = self._split(option['command'], False)
+        args = self._split(option['command'], self._in_parallel(option))
+        path = self._foam.destination / f'log.{raws[0].replace("./", "")}{option["suffix"]}'
+        # Option: overwrite, exception
+        if not option['overwrite'] and path.exists():
+            message = f'{raws[0]} already run on {path.parent.absolute()}: remove log file "{path.name}" to re-run'
+            if option['exception']:
+                raise Exception(message)
+            else:
+                w.warn(message)
+                return None
+        # TODO: verbose?
+        print(f'Running {raws[0]} on {path.parent.absolute()} using {self._foam.number_of_processors} processes if in parallel')
+        App: Func1['Foam', Default] \
+            = lambda foam: Apps.get(raws[0], Default)(foam, raws[0])
+        if option.get('monitor', raws[0] == self._foam.application):
+            monitor = self._monitors[path.name] = Monitor(self._foam, raws[0])
+            if option.get('criteria', None):
+                stop = Stop(self._foam, monitor, option['criteria'], option.get('signal', None))
+                return args, path, lambda foam: Tee(App(foam), monitor, stop)
+            return args, path, lambda foam: Tee(App(foam), monitor)
+        return args, path, App
+
+    def _record(self, args: ListStr, path: p.Path, code: int, start: float, usage: Usage) -> None:
+        '''Append resource usage of step to run record'''
+        record = {'command': ' '.join(args), 'log': path.name, 'code': code, 'start': start, **usage.to_dict()}
+        with self._lock, open(self._foam.destination/self.record, 'a') as f:
+            f.write(json.dumps(record)+'\n')
+
+    def _schedule(self, options: t.List[DictStrAny], unsafe: bool, cores: int) -> ListInt:
+        '''Run steps whose dependencies are finished, first fit in declared order'''
+        names = {option['name']: ith for ith, option in enumerate(options) if 'name' in option}
+        depends = [
+            set(range(ith)) if 'depends_on' not in option else {names.get(d, d) for d in option['depends_on']}
+            for ith, option in enumerate(options)
+        ]
+        codes: ListInt = [-1] * len(options)
+        pending, finished, free = list(range(len(options))), set(), cores
+        running: t.Dict[cf.Future, t.Tuple[int, int]] = {}
+        with cf.ThreadPoolExecutor(max(1, len(options))) as executor:
+            while pending or running:
+                for ith in list(pending):
+                    need = min(cores, self._resources(options[ith]))
+                    if depends[ith] <= finished and need <= free:
+                        pending.remove(ith)
+                        free -= need
+                        running[executor.submit(self._run, options[ith], unsafe)] = (ith, need)
+                if not running:
+                    raise Exception(f'Unsatisfiable dependencies: {[options[ith]["command"] for ith in pending]}')
+                done, _ = cf.wait(running, return_when=cf.FIRST_COMPLETED)
+                for future in done:
+                    ith, need = running.pop(future)
+                    free += need
+                    codes[ith] = future.result()
+                    finished.add(ith)
+        return codes
+
+    def _resources(self, option: DictStrAny) -> int:
+        if 'resources' in option:
+            return max(1, int(option['resources']))
+        return self._foam.number_of_processors if self._in_parallel(option) else 1
+
+    def _in_parallel(self, option: DictStrAny) -> bool:
+        return option['parallel'] and self._foam.number_of_processors>1 and '__app__' in option['command']
+
     def _replace(self, command: str) -> str:
         for old, new in self.macros.items():
             command = command.replace(old, new)
@@ -165,9 +475,9 @@ class Command(Base):
         else:
             raise Exception('`command` does not currently support variables other than `str`, `dict`')
 
-    def _popen(self, args: ListStr, unsafe: bool) -> s.Popen:
+    def _popen(self, args: ListStr, unsafe: bool, stdout: t.Any = s.PIPE) -> s.Popen:
         cmd = ' '.join(args) if unsafe else args
-        return s.Popen(cmd, cwd=self._foam.destination, shell=unsafe, stdout=s.PIPE)
+        return s.Popen(cmd, cwd=self._foam.destination, shell=unsafe, stdout=stdout)
 
     from_foam = deprecated_classmethod(fromFoam)
     from_foam_without_asserting = deprecated_classmethod(fromFoamWithoutAsserting)
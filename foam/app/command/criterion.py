@@ -0,0 +1,192 @@
+__all__ = ['Budget', 'Criterion', 'Divergence', 'Plateau', 'Residual', 'Stop']
+
+
+import math
+import re
+import time
+import typing as t
+
+from .adapter import Default
+from .monitor import Monitor
+from ...base.type import Any, ListStr
+from ...util.implementation import Base
+
+if t.TYPE_CHECKING:
+    import typing_extensions as te
+
+    from ...base.core import Foam
+
+
+class Criterion(Base):
+    '''Stopping criterion, `check` returns the reason to stop or None'''
+
+    __slots__ = ()
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        '''Called when a step starts'''
+        pass
+
+    def check(self, monitor: Monitor) -> t.Optional[str]:
+        raise NotImplementedError
+
+
+class Residual(Criterion):
+    '''Latest initial residuals of all (or given) fields are below tolerance'''
+
+    __slots__ = ('tolerance', 'fields')
+
+    def __init__(self, tolerance: float, fields: t.Optional[ListStr] = None) -> None:
+        self.tolerance = tolerance
+        self.fields = fields
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls(1e-5)
+
+    def check(self, monitor: Monitor) -> t.Optional[str]:
+        fields = self.fields or monitor.fields
+        if fields and all(field in monitor and monitor[field][-1, 1] < self.tolerance for field in fields):
+            return f'initial residuals of {", ".join(fields)} below {self.tolerance}'
+        return None
+
+
+class Plateau(Criterion):
+    '''Monitored quantity changes less than relative tolerance over the last `window` values'''
+
+    __slots__ = ('key', 'window', 'tolerance')
+
+    def __init__(self, key: str, window: int = 100, tolerance: float = 1e-3) -> None:
+        self.key = key
+        self.window = window
+        self.tolerance = tolerance
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls('p')
+
+    def check(self, monitor: Monitor) -> t.Optional[str]:
+        if self.key not in monitor or len(monitor[self.key]) < self.window:
+            return None
+        values = monitor[self.key][-self.window:, 1]
+        scale = max(abs(values.mean()), 1e-300)
+        if (values.max()-values.min()) / scale < self.tolerance:
+            return f'{self.key} changed less than {self.tolerance} over {self.window} values'
+        return None
+
+
+class Budget(Criterion):
+    '''Wall-clock budget (seconds) of step'''
+
+    __slots__ = ('seconds', '_start')
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+        self._start = time.monotonic()
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls(3600.0)
+
+    def reset(self) -> None:
+        self._start = time.monotonic()
+
+    def check(self, monitor: Monitor) -> t.Optional[str]:
+        if time.monotonic()-self._start > self.seconds:
+            return f'wall-clock budget of {self.seconds} seconds exceeded'
+        return None
+
+
+class Divergence(Criterion):
+    '''Latest initial residual is not finite or above threshold'''
+
+    __slots__ = ('threshold', )
+
+    def __init__(self, threshold: float = 1e3) -> None:
+        self.threshold = threshold
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls()
+
+    def check(self, monitor: Monitor) -> t.Optional[str]:
+        for field in monitor.fields:
+            value = monitor[field][-1, 1]
+            if not math.isfinite(value) or value > self.threshold:
+                return f'initial residual of {field} diverged ({value})'
+        return None
+
+
+class Stop(Default):
+    '''Stop running solver cleanly once a criterion fires, the reason is recorded in `Monitor::reason`
+
+    Example:
+        >>> foam.cmd.all_run(criteria=[Residual(1e-5), Divergence(), Budget(3600)])
+        >>> foam.cmd.monitors['log.simpleFoam'].reason
+        'Residual: initial residuals of Ux, Uy, p below 1e-05'
+
+    Note:
+        - by default `stopAt writeNow` is written to `system/controlDict` (requires `runTimeModifiable`), the original file is restored when the step finishes
+        - with `signal`, the process is signalled instead, e.g. `signal.SIGTERM` or the signal of `stopAtWriteNowSignal` optimisation switch
+        - criteria are checked whenever the solver writes output
+
+    Reference:
+        - https://github.com/OpenFOAM/OpenFOAM-7/blob/master/src/OpenFOAM/db/Time/Time.C
+    '''
+
+    __slots__ = ('_foam', '_monitor', '_criteria', '_signal', '_proc', '_backup')
+    pattern = re.compile(rb'(\bstopAt\s+)\w+(\s*;)')
+
+    def __init__(
+        self,
+        foam: 'Foam', monitor: Monitor, criteria: t.List[Criterion],
+        signal: t.Optional[int] = None,
+    ) -> None:
+        self._foam = foam
+        self._monitor = monitor
+        self._criteria = criteria
+        self._signal = signal
+        self._proc: t.Optional[Any] = None
+        self._backup: t.Optional[bytes] = None
+
+    def __enter__(self) -> 'te.Self':
+        for criterion in self._criteria:
+            criterion.reset()
+        return self
+
+    def __exit__(self, type: Any, value: Any, traceback: Any) -> None:
+        if self._backup is not None:
+            (self._foam.destination/'system'/'controlDict').write_bytes(self._backup)
+            self._backup = None
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        from ...base.core import Foam
+
+        return cls(Foam.default(), Monitor.default(), [])
+
+    def attach(self, proc: Any) -> None:
+        self._proc = proc
+
+    def feed(self, lines: bytes) -> None:
+        if self._monitor.reason is not None:
+            return
+        for criterion in self._criteria:
+            reason = criterion.check(self._monitor)
+            if reason is not None:
+                self._monitor.reason = f'{type(criterion).__name__}: {reason}'
+                self.stop()
+                break
+
+    def stop(self) -> None:
+        if self._signal is not None:
+            if self._proc is not None and self._proc.returncode is None:
+                self._proc.send_signal(self._signal)
+        else:
+            path = self._foam.destination / 'system' / 'controlDict'
+            self._backup = path.read_bytes()
+            text, count = self.pattern.subn(rb'\1writeNow\2', self._backup, count=1)
+            path.write_bytes(text if count else self._backup+b'\nstopAt writeNow;\n')
@@ -0,0 +1,167 @@
+__all__ = ['Monitor', 'Series']
+
+
+import re
+import typing as t
+
+from .adapter import Default
+from ...base.lib import numpy
+from ...base.type import Array2, DictStr, ListStr, Path
+from ...util.implementation import Base
+
+if t.TYPE_CHECKING:
+    import typing_extensions as te
+
+    from ...base.core import Foam
+
+
+class Series(Base):
+    '''Growable array of rows (time, value), capacity is doubled when full
+
+    Note:
+        - `array` is a view of the rows filled so far, it does not follow later appends (the buffer may be reallocated), read `array` again for new rows
+    '''
+
+    __slots__ = ('_data', '_size')
+
+    def __init__(self, capacity: int = 64, width: int = 2) -> None:
+        self._data = numpy.empty((capacity, width))
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls()
+
+    @property
+    def array(self) -> Array2:
+        return self._data[:self._size]
+
+    def append(self, *row: float) -> None:
+        if self._size == len(self._data):
+            data = numpy.empty((2*len(self._data), self._data.shape[1]))
+            data[:self._size] = self._data
+            self._data = data
+        self._data[self._size] = row
+        self._size += 1
+
+
+class Monitor(Default):
+    '''Streaming solver log parser, data of each time step is available while the solver runs
+
+    Example:
+        >>> thread = threading.Thread(target=foam.cmd.all_run)
+        >>> thread.start()
+        >>> foam.cmd.monitors['log.icoFoam']['Ux'][-1]  # initial residual of last time step
+        array([0.1  , 0.002])
+        >>> thread.join()
+
+    Note:
+        - keys follow `foamLog`, e.g. `Ux`, `UxFinalRes`, `UxIters`, `p_1` (second solve of `p` in a time step), `contLocal_1`, `CourantMax`, `executionTime`
+        - arrays have two columns: time and value
+
+    Reference:
+        - https://github.com/OpenFOAM/OpenFOAM-7/blob/master/bin/foamLog
+        - https://github.com/OpenFOAM/OpenFOAM-7/blob/master/bin/tools/foamLog.db
+    '''
+
+    __slots__ = ('reason', '_series', '_time', '_solves')
+    chunk = 2**20
+    pattern = re.compile(rb'''
+        ^[ \t]*(?:
+            Time\ =\ (?P<time>[-+.\deE]+)
+            | Courant\ Number\ mean:\ (?P<CourantMean>[-+.\deE]+)\ max:\ (?P<CourantMax>[-+.\deE]+)
+            | (?:\w+:\s+)?Solving\ for\ (?P<field>\w+),
+                \ Initial\ residual\ =\ (?P<initial>[-+.\deE]+),
+                \ Final\ residual\ =\ (?P<final>[-+.\deE]+),
+                \ No\ Iterations\ (?P<iterations>\d+)
+            | ExecutionTime\ =\ (?P<executionTime>[-+.\deE]+)\ s\s+ClockTime\ =\ (?P<clockTime>[-+.\deE]+)\ s
+            | time\ step\ continuity\ errors\ :
+                \ sum\ local\ =\ (?P<contLocal>[-+.\deE]+),
+                \ global\ =\ (?P<contGlobal>[-+.\deE]+),
+                \ cumulative\ =\ (?P<contCumulative>[-+.\deE]+)
+        )
+    ''', re.MULTILINE | re.VERBOSE)
+
+    def __init__(self, foam: t.Optional['Foam'] = None, desc: t.Optional[str] = None) -> None:
+        self.reason: t.Optional[str] = None  # why the step was stopped early
+        self._series: DictStr[Series] = {}
+        self._time: t.Optional[float] = None
+        self._solves: DictStr[int] = {}  # times each field is solved (or continuity is reported) in current time step
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._series
+
+    def __getitem__(self, key: str) -> Array2:
+        return self._series[key].array
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls()
+
+    @classmethod
+    def fromPath(cls, path: Path) -> 'te.Self':
+        self = cls()
+        with open(path, 'rb') as f:
+            rest = b''
+            for chunk in iter(lambda: f.read(self.chunk), b''):
+                data = rest + chunk
+                end = data.rfind(b'\n') + 1
+                self.feed(data[:end])
+                rest = data[end:]
+            self.feed(rest)
+        return self
+
+    @property
+    def time(self) -> t.Optional[float]:
+        '''Latest time'''
+        return self._time
+
+    @property
+    def fields(self) -> ListStr:
+        '''Solved fields'''
+        return [key for key in self._series if f'{key}FinalRes' in self._series]
+
+    def keys(self) -> ListStr:
+        return list(self._series)
+
+    def to_dict(self) -> DictStr[Array2]:
+        return {key: series.array for key, series in self._series.items()}
+
+    def feed(self, lines: bytes) -> None:
+        for match in self.pattern.finditer(lines):
+            group = match.lastgroup
+            if group == 'time':
+                self._time = float(match.group('time'))
+                self._solves.clear()
+            elif self._time is None:  # before first time step
+                continue
+            elif group == 'iterations':
+                field = match.group('field').decode()
+                suffix = self._suffix(field)
+                self._append(f'{field}{suffix}', match.group('initial'))
+                self._append(f'{field}FinalRes{suffix}', match.group('final'))
+                self._append(f'{field}Iters{suffix}', match.group('iterations'))
+            elif group == 'CourantMax':
+                self._append('CourantMean', match.group('CourantMean'))
+                self._append('CourantMax', match.group('CourantMax'))
+            elif group == 'clockTime':
+                self._append('executionTime', match.group('executionTime'))
+                self._append('clockTime', match.group('clockTime'))
+            elif group == 'contCumulative':  # once per pressure corrector (e.g. PISO)
+                suffix = self._suffix('contLocal')
+                for key in ['contLocal', 'contGlobal', 'contCumulative']:
+                    self._append(f'{key}{suffix}', match.group(key))
+
+    def _suffix(self, key: str) -> str:
+        '''Suffix of repeated entry in current time step, e.g. `_1` for second one'''
+        count = self._solves.get(key, 0)
+        self._solves[key] = count + 1
+        return f'_{count}' if count else ''
+
+    def _append(self, key: str, value: bytes) -> None:
+        if key not in self._series:
+            self._series[key] = Series()
+        self._series[key].append(self._time, float(value))
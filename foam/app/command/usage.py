@@ -0,0 +1,136 @@
+__all__ = ['Usage']
+
+
+import pathlib as p
+import threading
+import time
+import typing as t
+
+from ...base.type import Any, DictStrAny
+from ...util.implementation import Base
+
+if t.TYPE_CHECKING:
+    import typing_extensions as te
+
+
+class Usage(Base):
+    '''Resource usage of a step: wall time, user/sys CPU, peak RSS and I/O bytes
+
+    Example:
+        >>> with Usage() as usage:
+        ...     with subprocess.Popen(['blockMesh']) as proc:
+        ...         usage.attach(proc.pid)
+        >>> usage.to_dict()
+        {'wall': 0.12, 'user': 0.05, 'sys': 0.02, 'maxrss': 25731072, 'read_bytes': 0, 'write_bytes': 40960, 'processes': 1}
+
+    Note:
+        - user/sys CPU are deltas of `resource.getrusage(RUSAGE_CHILDREN)`, which also counts steps finishing concurrently
+        - process tree (e.g. MPI ranks) is polled in `/proc` every `interval` seconds for peak RSS and I/O bytes
+    '''
+
+    __slots__ = ('_pid', '_start', '_before', '_after', '_wall', '_seen', '_peak', '_stop', '_thread')
+    interval = 0.2
+    proc = p.Path('/proc')
+
+    def __init__(self) -> None:
+        self._pid: t.Optional[int] = None
+        self._start = 0.0
+        self._before: t.Optional[Any] = None
+        self._after: t.Optional[Any] = None
+        self._wall = 0.0
+        self._seen: t.Dict[int, t.Tuple[int, int]] = {}  # pid: (read_bytes, write_bytes)
+        self._peak = 0  # bytes
+        self._stop = threading.Event()
+        self._thread: t.Optional[threading.Thread] = None
+
+    def __enter__(self) -> 'te.Self':
+        self._start = time.monotonic()
+        self._before = self._rusage()
+        return self
+
+    def __exit__(self, type: Any, value: Any, traceback: Any) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._after = self._rusage()
+        self._wall = time.monotonic() - self._start
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls()
+
+    def attach(self, pid: int) -> None:
+        '''Start polling process tree of pid'''
+        self._pid = pid
+        if self.proc.is_dir():
+            self._thread = threading.Thread(target=self._poll, daemon=True)
+            self._thread.start()
+
+    def to_dict(self) -> DictStrAny:
+        ans = {
+            'wall': self._wall, 'user': 0.0, 'sys': 0.0, 'maxrss': self._peak,
+            'read_bytes': sum(read for read, _ in self._seen.values()),
+            'write_bytes': sum(write for _, write in self._seen.values()),
+            'processes': len(self._seen),
+        }
+        if self._before is not None and self._after is not None:
+            ans['user'] = self._after.ru_utime - self._before.ru_utime
+            ans['sys'] = self._after.ru_stime - self._before.ru_stime
+            if self._after.ru_maxrss > self._before.ru_maxrss:  # KiB on Linux
+                ans['maxrss'] = max(ans['maxrss'], self._after.ru_maxrss*1024)
+            if not self._seen:
+                ans['read_bytes'] = (self._after.ru_inblock-self._before.ru_inblock) * 512
+                ans['write_bytes'] = (self._after.ru_oublock-self._before.ru_oublock) * 512
+        return ans
+
+    def _poll(self) -> None:
+        while True:
+            self._sample()
+            if self._stop.wait(self.interval):
+                break
+
+    def _sample(self) -> None:
+        rss = 0
+        for pid in self._tree():
+            status, io = self._read(pid, 'status'), self._read(pid, 'io')
+            if not status:
+                continue
+            for line in status.splitlines():
+                if line.startswith(b'VmHWM:'):
+                    self._peak = max(self._peak, int(line.split()[1])*1024)
+                elif line.startswith(b'VmRSS:'):
+                    rss += int(line.split()[1]) * 1024
+            counters = dict(line.split(b': ') for line in io.splitlines() if b': ' in line)
+            read, write = int(counters.get(b'read_bytes', 0)), int(counters.get(b'write_bytes', 0))
+            old = self._seen.get(pid, (0, 0))
+            self._seen[pid] = (max(old[0], read), max(old[1], write))
+        self._peak = max(self._peak, rss)
+
+    def _tree(self) -> t.List[int]:
+        '''Process and its descendants'''
+        children: t.Dict[int, t.List[int]] = {}
+        for path in self.proc.iterdir():
+            if path.name.isdigit():
+                stat = self._read(int(path.name), 'stat')
+                if stat:
+                    ppid = int(stat[stat.rfind(b')')+2:].split()[1])
+                    children.setdefault(ppid, []).append(int(path.name))
+        ans, stack = [], [self._pid]
+        while stack:
+            pid = stack.pop()
+            ans.append(pid)
+            stack.extend(children.get(pid, []))
+        return ans
+
+    def _read(self, pid: int, name: str) -> bytes:
+        try:
+            return (self.proc/str(pid)/name).read_bytes()
+        except OSError:  # process exited or permission denied
+            return b''
+
+    def _rusage(self) -> t.Optional[Any]:
+        try:
+            import resource
+        except ImportError:  # not POSIX
+            return None
+        return resource.getrusage(resource.RUSAGE_CHILDREN)
@@ -1,4 +1,4 @@
-__all__ = ['core']
+__all__ = ['cache', 'core', 'native', 'sample', 'spatial', 'stream']
 
 
-from . import core
+from . import cache, core, native, sample, spatial, stream
@@ -0,0 +1,157 @@
+__all__ = ['Cache']
+
+
+import hashlib
+import json
+import os
+import pathlib as p
+import shutil
+import threading
+import typing as t
+
+from ...base.lib import numpy
+from ...base.type import Array12, DictStr, DictStrAny, ListAny, Path
+from ...util.implementation import Base
+
+if t.TYPE_CHECKING:
+    import typing_extensions as te
+
+
+Arrays = DictStr[Array12]
+
+
+class Cache(Base):
+    '''Persistent columnar cache of decoded time steps, one `.npy` file per array
+
+    Example:
+        >>> cache = Cache.fromPath('cavity', variant='VTK')
+        >>> cache.put('cavity/VTK/cavity_100.vtk', 0.5, {'points': points, 'cell.p': p})
+        >>> cache.get('cavity/VTK/cavity_100.vtk')['cell.p']  # memory-mapped
+        memmap([...], dtype=float32)
+
+    Note:
+        - entries are keyed on source path (relative to case) and `variant` (how the source was read, e.g. class and fields), and stamped with modification time and size of source files
+        - entries of removed sources stay valid, so that `foamToVTK` output can be deleted once cached
+        - arrays are uncompressed and loaded with `numpy.load(mmap_mode='r')`, i.e. read-only and paged in on demand
+    '''
+
+    __slots__ = ('_root', '_case', '_entries', '_lock', '_variant')
+    directory = '.cache'
+    name = 'manifest.json'
+
+    def __init__(self, case: Path, entries: t.Optional[DictStrAny] = None, variant: str = '') -> None:
+        self._case = p.Path(case)
+        self._root = self._case / self.directory
+        self._entries: DictStrAny = entries or {}
+        self._lock = threading.Lock()
+        self._variant = variant
+
+    def __contains__(self, source: Path) -> bool:
+        return self._valid(self._key(source))
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls('.')
+
+    @classmethod
+    def fromPath(cls, case: Path, variant: str = '') -> 'te.Self':
+        '''Load manifest, empty if it does not exist or is broken'''
+        try:
+            entries = json.loads((p.Path(case)/cls.directory/cls.name).read_text())
+        except (FileNotFoundError, ValueError):
+            entries = {}
+        return cls(case, entries if isinstance(entries, dict) else {}, variant)
+
+    @property
+    def root(self) -> p.Path:
+        return self._root
+
+    @property
+    def variant(self) -> str:
+        return self._variant
+
+    @property
+    def sources(self) -> t.Dict[float, p.Path]:
+        '''Sources of valid entries of variant (time as key)'''
+        return {
+            entry['time']: self._case/entry['source']
+            for key, entry in sorted(self._entries.items(), key=lambda item: item[1]['time'])
+            if self._valid(key)
+        }
+
+    def get(self, source: Path) -> t.Optional[Arrays]:
+        key = self._key(source)
+        if not self._valid(key):
+            return None
+        directory = self._root / self._entries[key]['directory']
+        try:
+            return {
+                name: numpy._().load(directory/f'{name}.npy', mmap_mode='r')
+                for name in self._entries[key]['arrays']
+            }
+        except (FileNotFoundError, ValueError):  # removed or truncated
+            return None
+
+    def put(self, source: Path, time: float, arrays: Arrays) -> None:
+        np = numpy._()
+        key = self._key(source)
+        directory = key.replace('/', '__').replace(':', '__')
+        (self._root/directory).mkdir(parents=True, exist_ok=True)
+        for name, array in arrays.items():
+            path = self._root / directory / f'{name}.npy'
+            temp = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+            with open(temp, 'wb') as f:
+                np.save(f, np.ascontiguousarray(array))
+            temp.replace(path)
+        with self._lock:
+            self._entries[key] = {
+                'time': time, 'source': self._source(source), 'variant': self._variant,
+                'stamp': self._stamp(self._case/self._source(source)), 'directory': directory, 'arrays': sorted(arrays),
+            }
+            self.dump()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            shutil.rmtree(self._root, ignore_errors=True)
+
+    def dump(self) -> p.Path:
+        '''Dump manifest atomically (temporary file plus rename)'''
+        path = self._root / self.name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        temp.write_text(json.dumps(self._entries, indent=4, sort_keys=True))
+        temp.replace(path)
+        return path
+
+    def _key(self, source: Path) -> str:
+        '''Source and digest of variant'''
+        digest = hashlib.sha256(self._variant.encode()).hexdigest()[:16]
+        return f'{self._source(source)}:{digest}'
+
+    def _source(self, source: Path) -> str:
+        source = p.Path(source)
+        try:
+            return source.relative_to(self._case).as_posix()
+        except ValueError:  # already relative
+            return source.as_posix()
+
+    def _valid(self, key: str) -> bool:
+        entry = self._entries.get(key, None)
+        if entry is None or entry.get('variant', None) != self._variant:  # other variant (or older manifest)
+            return False
+        path = self._case / entry['source']
+        return not path.exists() or entry['stamp'] == self._stamp(path)
+
+    def _stamp(self, path: p.Path) -> ListAny:
+        '''Name, modification time and size of source file (or files of source directory and mesh)'''
+        if path.is_file():
+            files = [path]
+        else:
+            mesh = self._case / 'constant' / 'polyMesh'
+            files = [file for directory in (path, mesh) if directory.is_dir() for file in sorted(directory.iterdir()) if file.is_file()]
+        ans: ListAny = []
+        for file in files:
+            stat = file.stat()
+            ans.append([file.relative_to(self._case).as_posix(), stat.st_mtime_ns, stat.st_size])
+        return ans
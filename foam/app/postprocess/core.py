@@ -1,11 +1,18 @@
 __all__ = ['PostProcess', 'VTK']
 
 
+import functools
+import json
 import typing as t
 import warnings as w
 
+from .cache import Cache
+from .sample import Scheme, Topology
+from .spatial import Grid
+from .stream import Steps
+from ..command.monitor import Monitor
 from ...base.lib import numpy, vtkmodules
-from ...base.type import Array1, Array2, Array01, Array12, DictAny2, DictFloat, DictStr, Location, Func1, Path, SetStr
+from ...base.type import Array1, Array2, Array01, Array12, DictAny2, DictFloat, DictStr, DictStrAny, Location, Func1, Path, SetStr
 from ...util.function import deprecated_classmethod
 from ...util.implementation import Base
 
@@ -36,7 +43,7 @@ class PostProcess(Base):
 
     def __init__(self, foam: 'Foam') -> None:
         self._foam = foam
-        self._vtks: t.Optional[t.List['VTK']] = None
+        self._vtks: t.Optional[Steps] = None
         self._logs: t.Optional[DictAny2] = None
 
     @classmethod
@@ -50,38 +57,125 @@ class PostProcess(Base):
         return cls(foam)
 
     @property
-    def vtks(self) -> t.List['VTK']:
+    def vtks(self) -> Steps:
+        '''Time steps converted by `foamToVTK`, read lazily (see `Steps`)'''
         if self._vtks is None:
-            self._vtks = list(VTK.fromFoam(self._foam))
+            self.vtks_set()
         return self._vtks
 
     @property
     def logs(self) -> DictStr[Array2]:
-        '''Script extract data for each time-step from a log file for graphing
+        '''Data for each time-step from the log file of application (same keys as `foamLog`)
+
+        Note:
+            - parsed while the solver runs (`Command::monitors`), otherwise from the log file, no `foamLog` process is spawned
 
         Reference:
             - https://github.com/OpenFOAM/OpenFOAM-7/blob/master/bin/foamLog
         '''
         if self._logs is None:
-            filename = next(log for log in self._foam.cmd.logs if self._foam.application in log.name).name
-            self._foam.cmd.run([f'foamLog {filename}'], overwrite=True, exception=False, unsafe=True)
-            self._logs = {
-                path.name.replace('_0', ''): numpy.loadtxt(path)
-                for path in (self._foam.destination/'logs').iterdir()
-                if path.suffix != '.awk'
-            }
+            path = next(log for log in self._foam.cmd.logs if self._foam.application in log.name)
+            monitor = self._foam.cmd.monitors.get(path.name, None) or Monitor.fromPath(path)
+            self._logs = monitor.to_dict()
         return self._logs
 
-    def vtks_set(self, **kwargs: 'Kwargs') -> t.List['VTK']:
-        self._vtks = list(VTK.fromFoam(self._foam, **kwargs))
+    def vtks_set(
+        self,
+        options: str = '', overwrite: bool = False, capacity: int = 4, ahead: int = 1,
+        native: bool = False, cache: bool = False, cores: t.Optional[int] = None,
+        **kwargs: 'Kwargs',
+    ) -> Steps:
+        '''
+        Note:
+            - with `native`, time directories are read directly (`native.Native`), neither `foamToVTK` nor `vtkmodules` is required
+            - with `cache`, decoded time steps are written to (and memory-mapped from) `Cache` in case directory, `foamToVTK` is skipped if all times are cached
+            - `cores` is the core budget of the conversion (see `VTK::paths`)
+        '''
+        times = self._foam.cmd.times
+        if native:
+            from .native import Native
+
+            cls: t.Type[VTK] = Native
+        else:
+            cls = VTK
+        store = Cache.fromPath(self._foam.destination, variant=self._variant(cls, kwargs)) if cache else None
+        sources = {} if store is None else store.sources
+        if native:
+            paths = [self._foam.cmd.directory(time) for time in times]
+        elif times and all(time in sources for time in times):
+            paths = [sources[time] for time in times]
+        else:
+            paths = VTK.paths(self._foam, options=options, overwrite=overwrite, cores=cores)
+        loader = functools.partial(cls.fromPath, foam=self._foam, **kwargs)
+        if store is not None:
+            loader = functools.partial(self._cached, store, loader, cls, dict(zip(paths, times)))
+        self._vtks = Steps(paths, times[:len(paths)], loader, capacity=capacity, ahead=ahead)
         return self._vtks
 
-    def centroid(self, key: str, structured: bool = False) -> Centroid:
-        ans = {}
-        for time, vtk in zip(self._foam.cmd.times, self.vtks):
-            ans[time] = vtk.centroid(key, structured)
+    @property
+    def times(self) -> t.List[float]:
+        '''Times of `PostProcess::vtks`'''
+        return self.vtks.times
+
+    def cube(
+        self,
+        key: str, point: bool = False,
+        index: t.Optional[Array1] = None, path: t.Optional[Path] = None,
+    ) -> Array2:
+        '''Field of all time steps in one contiguous array of shape (time, point or cell[, component])
+
+        Example:
+            >>> foam.post.cube('U').shape
+            (6, 400, 3)
+            >>> foam.post.cube('p', path='p.npy')  # memory-mapped file (`.npy` format)
+            memmap([[...]], dtype=float32)
+
+        Note:
+            - `index` selects points (or cells) of each time step, e.g. probe histories
+            - the array is allocated once and filled step by step, with `path` it is memory-mapped instead
+        '''
+        np = numpy._()
+        vtks = self.vtks
+        selection = slice(None) if index is None else index
+        fields = ((vtk.point_fields if point else vtk.cell_fields)[key][selection] for vtk in vtks)
+        first = next(fields, None)
+        if first is None:
+            return np.empty((0, 0))
+        shape = (len(vtks), *first.shape)
+        if path is None:
+            ans = np.empty(shape, dtype=first.dtype)
+        else:
+            ans = np.lib.format.open_memmap(str(path), mode='w+', dtype=first.dtype, shape=shape)
+        ans[0] = first
+        for ith, field in enumerate(fields, start=1):
+            ans[ith] = field
         return ans
 
+    def average(self, key: str) -> Array12:
+        '''Volume average of field at each time step, array of shape (time[, component])'''
+        weights = self.vtks[0].cell_fields['V']
+        field = self.cube(key)
+        return (field*self._expand(weights, field.ndim)).sum(axis=1) / weights.sum()
+
+    def centroid(self, key: str, structured: bool = False) -> Centroid:
+        '''
+        Note:
+            - mesh is assumed static, coordinates (and volumes) of the first time step are used
+        '''
+        if not self.vtks:
+            return {}
+        vtk = self.vtks[0]
+        field = self.cube(key, point=structured)
+        if structured:
+            coords = vtk.points
+        else:
+            coords = vtk.cells
+            field = field * self._expand(vtk.cell_fields['V'], field.ndim)
+        if field.ndim != 2:
+            w.warn(f'Array2D is not yet guaranteed: {key}')
+        ans = numpy._().einsum('nd,tn...->td...', coords, field) / field.sum(axis=1)[:, None]
+        return dict(zip(self.times, ans))
+
     def centroids(
         self,
         keys: t.Optional[SetStr] = None, structured: bool = False,
@@ -104,16 +198,69 @@ class PostProcess(Base):
         *locations: Location,
         keys: t.Optional[SetStr] = None, point: bool = True, func: t.Optional[ProbFunc] = None,
     ) -> Probes:
-        ans = {}
-        for time, vtk in zip(self._foam.cmd.times, self.vtks):
-            probes = vtk.probes(*locations, keys=keys, point=point, func=func)
-            for location, probe in probes.items():
-                for key, value in probe.items():
-                    ans \
-                        .setdefault(location, {}) \
-                        .setdefault(key, {}) \
-                        .setdefault(time, value)
-        return ans
+        '''
+        Note:
+            - mesh is assumed static, nearest points (or cells) are queried once and gathered from `PostProcess::cube`
+        '''
+        if not self.vtks:
+            return {}
+        indices = self.vtks[0].nearest(locations, point=point, func=func)
+        histories = {key: self.cube(key, point=point, index=indices) for key in (keys or self._foam.fields)}
+        times = self.times
+        return {
+            tuple(map(float, location)): {
+                key: dict(zip(times, history[:, ith]))
+                for key, history in histories.items()
+            }
+            for ith, location in enumerate(locations)
+        }
+
+    def interpolate(
+        self,
+        locations: t.Union[Array2, t.Sequence[Location]],
+        keys: t.Optional[SetStr] = None, scheme: Scheme = 'cellPoint',
+    ) -> Fields12:
+        '''Interpolated fields at locations (e.g. `line`, `plane`) of all time steps, arrays of shape (time, location[, component])
+
+        Example:
+            >>> from foam.app.postprocess.sample import line
+            >>> foam.post.interpolate(line((0, 0.05, 0.005), (0.1, 0.05, 0.005), 200), keys={'U'})['U'].shape
+            (6, 200, 3)
+
+        Note:
+            - mesh is assumed static, locations are located once in the first time step
+        '''
+        if not self.vtks:
+            return {}
+        interpolation = self.vtks[0].topology.locate(locations, scheme=scheme)
+        return {
+            key: interpolation.apply(
+                self.cube(key, point=True) if scheme != 'cell' else None,
+                self.cube(key, point=False) if scheme != 'inverseDistance' else None,
+                axis=1,
+            )
+            for key in (keys or self._foam.fields)
+        }
+
+    def _cached(self, cache: Cache, loader: Func1[Path, 'VTK'], cls: t.Type['VTK'], times: t.Dict[Path, float], path: Path) -> 'VTK':
+        arrays = cache.get(path)
+        if arrays is not None:
+            return cls.fromArrays(arrays, foam=self._foam)
+        vtk = loader(path)
+        cache.put(path, times[path], vtk.to_arrays())
+        return vtk
+
+    @classmethod
+    def _variant(cls, type: t.Type['VTK'], kwargs: DictStrAny) -> str:
+        '''Class and loader options (defaults filled in) that decoded arrays depend on'''
+        options = {'point': True, 'cell': True, 'keys': None, **kwargs}
+        if options['keys'] is not None:
+            options['keys'] = sorted(options['keys'])
+        return json.dumps({'class': type.__name__, **options}, sort_keys=True)
+
+    def _expand(self, array: Array1, ndim: int) -> Array12:
+        '''Broadcast mesh array against (time, mesh[, component])'''
+        return array.reshape((1, -1) + (1,)*(ndim-2))
 
     from_foam = deprecated_classmethod(fromFoam)
 
@@ -121,7 +268,7 @@ class PostProcess(Base):
 class VTK(Base):
     '''OpenFOAM VTK post-processing'''
 
-    __slots__ = ('_foam', '_points', '_cells', '_point_fields', '_cell_fields')
+    __slots__ = ('_foam', '_points', '_cells', '_point_fields', '_cell_fields', '_grids', '_connectivity')
 
     def __init__(
         self,
@@ -132,6 +279,8 @@ class VTK(Base):
         self._points, self._cells = None, None
         self._point_fields = {}
         self._cell_fields = {}
+        self._grids: t.Dict[bool, Grid] = {}
+        self._connectivity: t.Optional[DictStr[Array1]] = None  # `Topology` is built on demand
         if point:
             self._points = self._to_numpy(reader.GetOutput().GetPoints().GetData())
             arrays = reader.GetOutput().GetPointData()
@@ -143,6 +292,8 @@ class VTK(Base):
             for ith in range(arrays.GetNumberOfArrays()):
                 array = arrays.GetArray(ith)
                 self._cell_fields[array.GetName()] = self._to_numpy(array)
+            if point:
+                self._connectivity = self._to_connectivity(reader.GetOutput())
             cell_ids = set(self._cell_fields['cellID'])  # TODO: explore why cell_id is sometimes repeated
             for key, value in self._cell_fields.items():
                 self._cell_fields[key] = value[:len(cell_ids)]
@@ -166,23 +317,53 @@ class VTK(Base):
         reader.CloseVTKFile()
         return self
 
+    @classmethod
+    def fromArrays(cls, arrays: Fields12, foam: t.Optional['Foam'] = None) -> 'te.Self':
+        '''From arrays of `VTK::to_arrays` (e.g. memory-mapped by `Cache`)'''
+        self = cls.__new__(cls)
+        self._foam = foam
+        self._points = arrays.get('points', None)
+        self._point_fields, self._cell_fields, connectivity = {}, {}, {}
+        for name, array in arrays.items():
+            group, _, key = name.partition('.')
+            {'point': self._point_fields, 'cell': self._cell_fields, 'topology': connectivity}.get(group, {})[key] = array
+        self._cells = self._cell_fields.get('C', None)
+        self._grids = {}
+        self._connectivity = connectivity if connectivity and self._points is not None else None
+        return self
+
     @classmethod
     def fromFoam(
         cls,
-        foam: 'Foam', options: str = '', overwrite: bool = False,
+        foam: 'Foam', options: str = '', overwrite: bool = False, cores: t.Optional[int] = None,
         **kwargs: 'Kwargs',
     ) -> t.Iterator['te.Self']:
+        for path in cls.paths(foam, options=options, overwrite=overwrite, cores=cores):
+            yield cls.fromPath(path, foam=foam, **kwargs)
+
+    @classmethod
+    def paths(
+        cls,
+        foam: 'Foam', options: str = '', overwrite: bool = False, cores: t.Optional[int] = None,
+    ) -> t.List[Path]:
+        '''Run `foamToVTK` (with cell centres and volumes), VTK files sorted by time index
+
+        Note:
+            - `cores` is passed to `Command::run`, i.e. steps run one after another by default and the two `postProcess` steps run concurrently within a budget of at least two cores
+        '''
         foam.destination  # assert dest is not None
-        for name in ['writeCellCentres', 'writeCellVolumes']:
-            foam.cmd.run([f'postProcess -func {name}'], suffix=f'.{name}', overwrite=overwrite, exception=False, unsafe=True)
-        foam.cmd.run([f'foamToVTK {options}'], overwrite=overwrite, exception=False, unsafe=True)
+        commands = [
+            {'command': f'postProcess -func {name}', 'suffix': f'.{name}', 'depends_on': []}
+            for name in ['writeCellCentres', 'writeCellVolumes']
+        ]
+        commands.append({'command': f'foamToVTK {options}', 'depends_on': [0, 1]})  # converts C and V as well
+        foam.cmd.run(commands, overwrite=overwrite, exception=False, unsafe=True, cores=cores)
         paths = [
             path
             for path in (foam.destination/'VTK').iterdir()
             if path.is_file() and path.suffix=='.vtk'
         ]
-        for path in sorted(paths, key=lambda p: int(p.stem.rsplit('_', maxsplit=1)[-1])):
-            yield cls.fromPath(path, foam=foam, **kwargs)
+        return sorted(paths, key=lambda p: int(p.stem.rsplit('_', maxsplit=1)[-1]))
 
     @property
     def foam(self) -> 'Foam':
@@ -214,6 +395,13 @@ class VTK(Base):
 
         return self._cell_fields
 
+    @property
+    def topology(self) -> Topology:
+        '''Cell connectivity (read if both `point` and `cell` are set), built on first access and shared by time steps of a static mesh'''
+        assert self._connectivity is not None
+
+        return Topology.cached(self.points, **self._connectivity)
+
     @property
     def x(self) -> Array1:
         return self.points[:, 0]
@@ -229,6 +417,21 @@ class VTK(Base):
     def keys(self) -> None:
         raise NotImplementedError
 
+    def to_arrays(self) -> Fields12:
+        '''Points, fields (`point.<key>`, `cell.<key>`) and connectivity (`topology.<key>`) as flat dictionary'''
+        ans = {} if self._points is None else {'points': self._points}
+        ans.update({f'point.{key}': value for key, value in self._point_fields.items()})
+        ans.update({f'cell.{key}': value for key, value in self._cell_fields.items()})
+        if self._connectivity is not None:
+            ans.update({f'topology.{key}': value for key, value in self._connectivity.items()})
+        return ans
+
+    def grid(self, point: bool = True) -> Grid:
+        '''Spatial index of points (or cells), shared by time steps of a static mesh'''
+        if point not in self._grids:
+            self._grids[point] = Grid.cached(self.points if point else self.cells)
+        return self._grids[point]
+
     def centroid(self, key: str, structured: bool = False) -> Array12:
         if structured:
             coords = self._points
@@ -270,23 +473,69 @@ class VTK(Base):
         keys: t.Optional[SetStr] = None, point: bool = True, func: t.Optional[ProbFunc] = None,
     ) -> t.Dict[Location, Fields01]:
         '''
+        Note:
+            - nearest points (or cells) of all locations are queried at once from `VTK::grid`, custom `func` falls back to brute force
+
         Reference:
             - https://github.com/OpenFOAM/OpenFOAM-7/tree/master/src/sampling/probes
         '''
         keys = keys or self.foam.fields
-        coords = self.points if point else self.cells
         fields = self.point_fields if point else self.cell_fields
-        func: ProbFunc \
-            = func or (lambda x: numpy.square(x).mean(axis=1))
+        indices = self.nearest(locations, point=point, func=func)
         ans = {}
-        for location in locations:
-            index = numpy.argmin(func(coords-location))
+        for location, index in zip(locations, indices):
             ans[tuple(map(float, location))] = {
                 key: fields[key][index]
                 for key in keys
             }
         return ans
 
+    def interpolate(
+        self,
+        locations: t.Union[Array2, t.Sequence[Location]],
+        keys: t.Optional[SetStr] = None, scheme: Scheme = 'cellPoint',
+    ) -> Fields12:
+        '''Interpolated fields at locations, arrays of shape (location[, component]), NaN outside mesh
+
+        Example:
+            >>> from foam.app.postprocess.sample import plane
+            >>> vtk.interpolate(plane((0, 0, 0.005), (0.1, 0, 0), (0, 0.1, 0), (100, 100)), keys={'p'})['p'].shape
+            (10000,)
+
+        Note:
+            - schemes: `cell` (value of containing cell), `cellPoint` (barycentric in tetrahedral decomposition), `inverseDistance` (point values of containing cell)
+        '''
+        interpolation = self.topology.locate(locations, scheme=scheme)
+        return {
+            key: interpolation.apply(self._point_fields.get(key, None), self._cell_fields.get(key, None))
+            for key in (keys or self.foam.fields)
+        }
+
+    def nearest(
+        self,
+        locations: t.Sequence[Location],
+        point: bool = True, func: t.Optional[ProbFunc] = None,
+    ) -> Array1:
+        '''Indices of nearest points (or cells) of locations, `func` maps differences to distances'''
+        if func is None:
+            return self.grid(point).nearest(locations) if len(locations) else numpy.empty(0, dtype=int)
+        coords = self.points if point else self.cells
+        return numpy.ascontiguousarray([numpy.argmin(func(coords-location)) for location in locations], dtype=int)
+
+    def _to_connectivity(self, data: '_vtkmodules.vtkCommonDataModel.vtkDataSet') -> t.Optional[DictStr[Array1]]:
+        '''Keyword arguments of `Topology::cached` (arrays are only wrapped, no conversion)'''
+        if not hasattr(data, 'GetCellTypesArray'):  # not unstructured grid
+            return None
+        cells = data.GetCells()
+        ans = {'types': self._to_numpy(data.GetCellTypesArray())}
+        if len(self._cell_fields.get('cellID', ())) == len(ans['types']):  # decomposed polyhedra
+            ans['owners'] = self._cell_fields['cellID']
+        if hasattr(cells, 'GetOffsetsArray'):  # VTK >= 9
+            ans.update(offsets=self._to_numpy(cells.GetOffsetsArray()), connectivity=self._to_numpy(cells.GetConnectivityArray()))
+        else:
+            ans.update(cells=self._to_numpy(cells.GetData()))
+        return ans
+
     def _to_numpy(self, array: '_vtkmodules.vtkCommonCore.vtkDataArray') -> Array12:
         return vtkmodules.vtk_to_numpy(array)
 
@@ -0,0 +1,376 @@
+__all__ = ['FoamFile', 'Native', 'PolyMesh']
+
+
+import gzip
+import pathlib as p
+import re
+import typing as t
+
+from .core import VTK
+from ...base.lib import numpy
+from ...base.type import Array1, Array2, Array12, DictStr, Path, SetStr
+from ...util.implementation import Base
+from ...util.object.field import Field
+
+if t.TYPE_CHECKING:
+    import typing_extensions as te
+
+    from ...base.core import Foam
+
+    P = te.ParamSpec('P')
+    Kwargs = te.ParamSpecKwargs(P)
+
+
+class FoamFile(Base):
+    '''OpenFOAM file (ASCII or binary) read into NumPy arrays, header and lists only
+
+    Example:
+        >>> FoamFile.fromPath('cavity/constant/polyMesh/points').list().shape
+        (882, 3)
+        >>> FoamFile.fromPath('cavity/0.5/U').internal(400).shape
+        (400, 3)
+
+    Note:
+        - compressed files (`.gz`) are read as well
+        - binary blocks are read with the byte sizes of `arch` in header (e.g. "LSB;label=32;scalar=64")
+
+    Reference:
+        - https://github.com/OpenFOAM/OpenFOAM-7/blob/master/src/OpenFOAM/containers/Lists/UList/UListIO.C
+    '''
+
+    __slots__ = ('_data', '_header', '_cursor')
+    pattern_header = re.compile(rb'FoamFile\s*\{(.*?)\}', re.DOTALL)
+    pattern_entry = re.compile(rb'(\w+)\s+("[^"]*"|[^;]*);')
+    pattern_list = re.compile(rb'(?<![\w.])(\d+)\s*([({])')
+    pattern_internal = re.compile(rb'\binternalField\s+(uniform|nonuniform)\s+(?:List<(\w+)>\s+)?')
+    brackets = bytes.maketrans(b'()', b'  ')
+
+    def __init__(self, data: bytes) -> None:
+        match = self.pattern_header.search(data, 0, 4096)
+        self._data = data
+        self._header = {} if match is None else {
+            key.decode(): value.decode().strip('"')
+            for key, value in self.pattern_entry.findall(match.group(1))
+        }
+        self._cursor = 0 if match is None else match.end()
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls(b'')
+
+    @classmethod
+    def fromPath(cls, path: Path) -> 'te.Self':
+        path = p.Path(path)
+        if not path.exists() and path.with_name(path.name+'.gz').exists():
+            path = path.with_name(path.name+'.gz')
+        data = path.read_bytes()
+        return cls(gzip.decompress(data) if path.suffix == '.gz' else data)
+
+    @classmethod
+    def headerFromPath(cls, path: Path, size: int = 4096) -> DictStr[str]:
+        '''Header only (first `size` bytes are read)'''
+        path = p.Path(path)
+        if path.suffix == '.gz':
+            with gzip.open(path, 'rb') as f:
+                return cls(f.read(size)).header
+        with open(path, 'rb') as f:
+            return cls(f.read(size)).header
+
+    @property
+    def header(self) -> DictStr[str]:
+        return self._header
+
+    @property
+    def binary(self) -> bool:
+        return self._header.get('format', 'ascii') == 'binary'
+
+    @property
+    def dtypes(self) -> DictStr[str]:
+        '''NumPy dtypes of label and scalar'''
+        arch = dict(
+            item.split('=', maxsplit=1)
+            for item in self._header.get('arch', '').split(';')
+            if '=' in item
+        )
+        order = '>' if self._header.get('arch', 'LSB').startswith('MSB') else '<'
+        return {
+            'label': f'{order}i{int(arch.get("label", 32))//8}',
+            'scalar': f'{order}f{int(arch.get("scalar", 64))//8}',
+        }
+
+    def list(self, kind: str = 'scalar', width: t.Optional[int] = None) -> Array12:
+        '''Next list after cursor (`N(...)` or `N{value}`), rows of `width` components'''
+        match = self.pattern_list.search(self._data, self._cursor)
+        if match is None:
+            raise Exception('List is not found')
+        return self._list(int(match.group(1)), match.group(2), match.end(), kind, width)
+
+    def faces(self) -> t.Tuple[Array1, Array1]:
+        '''Offsets and connectivity of `faceList` or `faceCompactList`'''
+        np = numpy._()
+        if self._header.get('class', '') == 'faceCompactList':
+            offsets = self.list('label', 1)
+            return offsets, self.list('label', 1)
+        match = self.pattern_list.search(self._data, self._cursor)
+        if match is None:
+            raise Exception('List is not found')
+        n, start = int(match.group(1)), match.end()
+        end = self._close(start, n)
+        legacy = self._parse(self._data[start:end], 'label')  # n_1 id_1 ... n_2 id_1 ...
+        offsets, ith = np.empty(n+1, dtype=int), 0
+        offsets[0] = 0
+        for kth in range(n):
+            ith += int(legacy[ith]) + 1
+            offsets[kth+1] = ith - kth - 1
+        mask = np.ones(len(legacy), dtype=bool)
+        mask[offsets[:-1]+np.arange(n)] = False
+        self._cursor = end + 1
+        return offsets, legacy[mask]
+
+    def internal(self, size: int) -> Array12:
+        '''Internal field of `size` cells (uniform values are broadcast)'''
+        np = numpy._()
+        width = self._width()
+        match = self.pattern_internal.search(self._data, self._cursor)
+        if match is None:
+            raise Exception('internalField is not found')
+        if match.group(1) == b'uniform':
+            end = self._data.index(b';', match.end())
+            value = self._parse(self._data[match.end():end], 'scalar')
+            ans = np.broadcast_to(value, (size, width) if width > 1 else (size, ))
+            return np.ascontiguousarray(ans)
+        self._cursor = match.end()
+        return self.list('scalar', Field.components.get((match.group(2) or b'scalar').decode(), width))
+
+    def _list(self, n: int, bracket: bytes, start: int, kind: str, width: t.Optional[int]) -> Array12:
+        np = numpy._()
+        width = width or self._width()
+        shape = (n, width) if width > 1 else (n, )
+        if bracket == b'{':  # uniform list
+            end = self._data.index(b'}', start)
+            value = self._parse(self._data[start:end], kind)
+            self._cursor = end + 1
+            return np.ascontiguousarray(np.broadcast_to(value, shape))
+        if self.binary:
+            dtype = np.dtype(self.dtypes[kind])
+            ans = np.frombuffer(self._data, dtype=dtype, count=n*width, offset=start)
+            self._cursor = start + n*width*dtype.itemsize + 1
+            return ans.astype(float if kind == 'scalar' else int).reshape(shape)
+        end = self._close(start, n if width > 1 else 0)
+        self._cursor = end + 1
+        return self._parse(self._data[start:end], kind).reshape(shape)
+
+    def _close(self, start: int, nested: int) -> int:
+        '''Position of closing bracket of list with `nested` sub-lists'''
+        np = numpy._()
+        if not nested:
+            return self._data.index(b')', start)
+        closes = np.flatnonzero(np.frombuffer(self._data, dtype='u1', offset=start) == ord(')'))
+        return start + int(closes[nested])
+
+    def _parse(self, text: bytes, kind: str) -> Array1:
+        np = numpy._()
+        text = text.translate(self.brackets).decode()
+        return np.fromstring(text, dtype=float if kind == 'scalar' else int, sep=' ')
+
+    def _width(self) -> int:
+        type = re.sub(r'^vol|Field$', '', self._header.get('class', 'scalar'))
+        return Field.components.get(type[:1].lower()+type[1:], 1)
+
+
+class PolyMesh(Base):
+    '''Geometry of `constant/polyMesh` computed with NumPy (same decomposition as `primitiveMesh`)
+
+    Example:
+        >>> mesh = PolyMesh.fromPath('cavity/constant/polyMesh')
+        >>> mesh.centres.shape, mesh.volumes.sum()
+        ((400, 3), 1e-05)
+
+    Note:
+        - faces are triangulated around vertex averages for face centres and areas
+        - cells are decomposed into pyramids of faces around the average of face centres for cell centres and volumes
+        - `PolyMesh::cached` shares geometry until mesh files are modified
+
+    Reference:
+        - https://github.com/OpenFOAM/OpenFOAM-7/blob/master/src/OpenFOAM/meshes/primitiveMesh/primitiveMeshFaceCentresAndAreas.C
+        - https://github.com/OpenFOAM/OpenFOAM-7/blob/master/src/OpenFOAM/meshes/primitiveMesh/primitiveMeshCellCentresAndVols.C
+    '''
+
+    __slots__ = ('_points', '_offsets', '_connectivity', '_owner', '_neighbour', '_geometry')
+    files = ('points', 'faces', 'owner', 'neighbour')
+    capacity = 4
+    _cache: t.Dict[t.Tuple[p.Path, t.Tuple[int, ...]], 'PolyMesh'] = {}
+
+    def __init__(self, points: Array2, offsets: Array1, connectivity: Array1, owner: Array1, neighbour: Array1) -> None:
+        self._points = points
+        self._offsets = offsets
+        self._connectivity = connectivity
+        self._owner = owner
+        self._neighbour = neighbour
+        self._geometry: t.Optional[t.Tuple[Array2, Array2, Array2, Array1]] = None
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        np = numpy._()
+        return cls(np.zeros((0, 3)), np.zeros(1, dtype=int), np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0, dtype=int))
+
+    @classmethod
+    def fromPath(cls, path: Path) -> 'te.Self':
+        path = p.Path(path)
+        points = FoamFile.fromPath(path/'points').list('scalar', 3)
+        offsets, connectivity = FoamFile.fromPath(path/'faces').faces()
+        owner = FoamFile.fromPath(path/'owner').list('label', 1)
+        neighbour = FoamFile.fromPath(path/'neighbour').list('label', 1)
+        return cls(points, offsets, connectivity, owner, neighbour)
+
+    @classmethod
+    def cached(cls, path: Path) -> 'te.Self':
+        '''Mesh shared while modification times of files are unchanged'''
+        path = p.Path(path).resolve()
+        key = (path, tuple(cls._mtime(path/name) for name in cls.files))
+        if key not in cls._cache:
+            while len(cls._cache) >= cls.capacity:
+                cls._cache.pop(next(iter(cls._cache)))
+            cls._cache[key] = cls.fromPath(path)
+        return cls._cache[key]
+
+    @property
+    def points(self) -> Array2:
+        return self._points
+
+    @property
+    def faces(self) -> t.Tuple[Array1, Array1]:
+        return self._offsets, self._connectivity
+
+    @property
+    def owner(self) -> Array1:
+        return self._owner
+
+    @property
+    def neighbour(self) -> Array1:
+        return self._neighbour
+
+    @property
+    def n_cells(self) -> int:
+        return int(max(self._owner.max(initial=-1), self._neighbour.max(initial=-1))) + 1
+
+    @property
+    def face_centres(self) -> Array2:
+        return self._geometry_once()[0]
+
+    @property
+    def face_areas(self) -> Array2:
+        '''Area vectors (normal to face, pointing out of owner)'''
+        return self._geometry_once()[1]
+
+    @property
+    def centres(self) -> Array2:
+        return self._geometry_once()[2]
+
+    @property
+    def volumes(self) -> Array1:
+        return self._geometry_once()[3]
+
+    def _geometry_once(self) -> t.Tuple[Array2, Array2, Array2, Array1]:
+        if self._geometry is None:
+            self._geometry = self._compute()
+        return self._geometry
+
+    def _compute(self) -> t.Tuple[Array2, Array2, Array2, Array1]:
+        np = numpy._()
+        offsets, connectivity, points = self._offsets, self._connectivity, self._points
+        counts = np.diff(offsets)
+        faces = np.repeat(np.arange(len(counts)), counts)
+        # faces: triangles of edges and vertex average
+        following = np.arange(1, len(connectivity)+1)
+        following[offsets[1:]-1] = offsets[:-1]
+        this, that = points[connectivity], points[connectivity[following]]
+        average = np.add.reduceat(this, offsets[:-1], axis=0) / counts[:, None]
+        middle = average[faces]
+        normals = np.cross(that-this, middle-this)
+        magnitudes = np.sqrt(np.square(normals).sum(axis=1))
+        area = np.add.reduceat(magnitudes, offsets[:-1])
+        moment = np.add.reduceat(magnitudes[:, None]*(this+that+middle), offsets[:-1], axis=0)
+        small = area < 1e-300
+        face_centres = np.where(small[:, None], average, moment/(3*np.where(small, 1.0, area))[:, None])
+        face_areas = 0.5 * np.add.reduceat(normals, offsets[:-1], axis=0)
+        # cells: pyramids of faces and average of face centres
+        n, internal = self.n_cells, len(self._neighbour)
+        owner, neighbour = self._owner, self._neighbour
+        number = np.bincount(owner, minlength=n) + np.bincount(neighbour, minlength=n)
+        estimate = np.stack([
+            np.bincount(owner, face_centres[:, ith], minlength=n) + np.bincount(neighbour, face_centres[:internal, ith], minlength=n)
+            for ith in range(3)
+        ], axis=1) / np.maximum(number, 1)[:, None]
+        pyramid_owner = (face_areas*(face_centres-estimate[owner])).sum(axis=1)
+        pyramid_neighbour = (face_areas[:internal]*(estimate[neighbour]-face_centres[:internal])).sum(axis=1)
+        centre_owner = 0.75*face_centres + 0.25*estimate[owner]
+        centre_neighbour = 0.75*face_centres[:internal] + 0.25*estimate[neighbour]
+        volumes = np.bincount(owner, pyramid_owner, minlength=n) + np.bincount(neighbour, pyramid_neighbour, minlength=n)
+        centres = np.stack([
+            np.bincount(owner, pyramid_owner*centre_owner[:, ith], minlength=n) + np.bincount(neighbour, pyramid_neighbour*centre_neighbour[:, ith], minlength=n)
+            for ith in range(3)
+        ], axis=1)
+        small = np.abs(volumes) < 1e-300
+        centres = np.where(small[:, None], estimate, centres/np.where(small, 1.0, volumes)[:, None])
+        return face_centres, face_areas, centres, volumes/3
+
+    @staticmethod
+    def _mtime(path: p.Path) -> int:
+        for candidate in (path, path.with_name(path.name+'.gz')):
+            if candidate.exists():
+                return candidate.stat().st_mtime_ns
+        return 0
+
+
+class Native(VTK):
+    '''Time step read from case directory with `PolyMesh` and `FoamFile`, without `foamToVTK`
+
+    Example:
+        >>> vtk = Native.fromPath('cavity/0.5')
+        >>> vtk.cells.shape, sorted(vtk.cell_fields)
+        ((400, 3), ['C', 'U', 'V', 'cellID', 'p'])
+
+    Note:
+        - same interface as `VTK` for cell data (`cells`, `cell_fields`, `centroid`, `probes`, ...), `point_fields` is empty
+        - volume fields (`vol*Field`) of the time directory are read, mesh of `constant/polyMesh` is shared by time steps
+    '''
+
+    __slots__ = ()
+
+    def __init__(self, mesh: PolyMesh, fields: DictStr[Array12], foam: t.Optional['Foam'] = None) -> None:
+        np = numpy._()
+        self._foam = foam
+        self._points, self._cells = mesh.points, mesh.centres
+        self._point_fields = {}
+        self._cell_fields = {**fields, 'C': mesh.centres, 'V': mesh.volumes, 'cellID': np.arange(mesh.n_cells)}
+        self._grids = {}
+        self._connectivity = None
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls(PolyMesh.default(), {})
+
+    @classmethod
+    def fromPath(
+        cls,
+        path: Path,
+        foam: t.Optional['Foam'] = None, keys: t.Optional[SetStr] = None,
+        **kwargs: 'Kwargs',
+    ) -> 'te.Self':
+        '''From time directory (`keys` limits fields read), `point` and `cell` are accepted for compatibility with `VTK`'''
+        path = p.Path(path)
+        mesh = PolyMesh.cached(path.parent/'constant'/'polyMesh')
+        fields = {}
+        for file in sorted(path.iterdir()):
+            name = file.name[:-3] if file.suffix == '.gz' else file.name
+            if not file.is_file() or (keys is not None and name not in keys):
+                continue
+            if FoamFile.headerFromPath(file).get('class', '').startswith('vol'):
+                fields[name] = FoamFile.fromPath(file).internal(mesh.n_cells)
+        return cls(mesh, fields, foam=foam)
+
+    @classmethod
+    def fromFoam(cls, foam: 'Foam', keys: t.Optional[SetStr] = None, **kwargs: 'Kwargs') -> t.Iterator['te.Self']:
+        for time in foam.cmd.times:
+            yield cls.fromPath(foam.cmd.directory(time), foam=foam, keys=keys)
@@ -0,0 +1,319 @@
+__all__ = ['Interpolation', 'Topology', 'line', 'plane']
+
+
+import collections
+import hashlib
+import typing as t
+
+from .spatial import Grid
+from ...base.lib import numpy
+from ...base.type import Array1, Array2, Array12, Location
+from ...util.implementation import Base
+
+if t.TYPE_CHECKING:
+    import typing_extensions as te
+
+
+Scheme = str  # 'cell', 'cellPoint' or 'inverseDistance'
+
+
+class Interpolation(Base):
+    '''Interpolation weights of locations, applied to fields of any (static) time step
+
+    Example:
+        >>> interpolation = vtk.topology.locate(line((0, 0, 0.05), (0.1, 0.1, 0.05), 100))
+        >>> interpolation.apply(vtk.point_fields['p'], vtk.cell_fields['p']).shape
+        (100,)
+
+    Note:
+        - value is `centre * cell_field[cell] + sum(weights * point_field[points])`, NaN for locations outside mesh
+    '''
+
+    __slots__ = ('_scheme', '_cells', '_centre', '_points', '_weights')
+
+    def __init__(self, scheme: Scheme, cells: Array1, centre: Array1, points: Array2, weights: Array2) -> None:
+        self._scheme = scheme
+        self._cells = cells
+        self._centre = centre
+        self._points = points
+        self._weights = weights
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        np = numpy._()
+        return cls('cell', np.zeros(0, dtype=int), np.zeros(0), np.zeros((0, 1), dtype=int), np.zeros((0, 1)))
+
+    @property
+    def scheme(self) -> Scheme:
+        return self._scheme
+
+    @property
+    def cells(self) -> Array1:
+        '''Index of cell (value of `cell_fields`) containing each location, -1 if outside mesh'''
+        return self._cells
+
+    @property
+    def found(self) -> Array1:
+        return self._cells >= 0
+
+    def apply(self, point: t.Optional[Array12] = None, cell: t.Optional[Array12] = None, axis: int = 0) -> Array12:
+        '''Interpolate point (and cell) field, mesh axis is `axis` (e.g. 1 for time-stacked fields)'''
+        np = numpy._()
+        ans = 0.0
+        if self._scheme != 'inverseDistance':
+            assert cell is not None
+
+            values = np.take(cell, np.where(self.found, self._cells, 0), axis=axis)
+            ans = values * self._expand(self._centre, values.ndim, axis)
+        if self._scheme != 'cell':
+            assert point is not None
+
+            values = np.take(point, self._points, axis=axis)  # mesh axis becomes (location, vertex)
+            ans = ans + (values*self._expand(self._weights, values.ndim, axis)).sum(axis=axis+1)
+        mask = self._expand(~self.found, np.ndim(ans), axis)
+        return np.where(mask, np.nan, ans)
+
+    def _expand(self, array: Array12, ndim: int, axis: int) -> Array12:
+        return array.reshape((1,)*axis + array.shape + (1,)*(ndim-axis-array.ndim))
+
+
+class Topology(Base):
+    '''Cell connectivity of unstructured mesh (VTK layout) for point location and interpolation
+
+    Example:
+        >>> topology = vtk.topology
+        >>> interpolation = topology.locate(numpy.random.rand(1000, 3)*0.1, scheme='cellPoint')
+        >>> interpolation.found.all()
+        True
+
+    Note:
+        - cells are decomposed into tetrahedra (vertex average, face centre and face edge), consistently for neighbouring cells
+        - candidate cell of a location is the one with nearest vertex average (`Grid`), then `rounds` rings of cells sharing a vertex
+        - `cellPoint`: barycentric weights of the tetrahedron, vertex average carries cell value and face centre the average of face points
+        - `inverseDistance`: point values of the containing cell weighted by inverse distance to the power `power`
+        - cells other than tetrahedra, hexahedra, wedges and pyramids (e.g. polyhedra with `foamToVTK -poly`) are never located
+        - `Topology::cached` shares topology between meshes with identical points and connectivity (e.g. time steps of a static mesh)
+
+    Reference:
+        - https://github.com/OpenFOAM/OpenFOAM-7/tree/master/src/finiteVolume/interpolation/interpolation/interpolationCellPoint
+        - https://vtk.org/doc/nightly/html/classvtkCellType.html
+    '''
+
+    __slots__ = ('_points', '_offsets', '_connectivity', '_types', '_owners', '_centres', '_incidence')
+    faces = {
+        10: ((0, 1, 3), (1, 2, 3), (2, 0, 3), (0, 2, 1)),  # tetra
+        12: ((0, 4, 7, 3), (1, 2, 6, 5), (0, 1, 5, 4), (3, 7, 6, 2), (0, 3, 2, 1), (4, 5, 6, 7)),  # hexahedron
+        13: ((0, 1, 2), (3, 5, 4), (0, 3, 4, 1), (1, 4, 5, 2), (2, 5, 3, 0)),  # wedge
+        14: ((0, 1, 2, 3), (0, 1, 4), (1, 2, 4), (2, 3, 4), (3, 0, 4)),  # pyramid
+    }
+    rounds = 2
+    capacity = 4  # number of cached topologies
+    _cache: t.Dict[bytes, 'Topology'] = collections.OrderedDict()
+    tolerance = 1e-9  # of barycentric coordinates
+    power = 2
+    chunk = 2**16  # (location, cell) pairs tested at once
+
+    def __init__(
+        self,
+        points: Array2, offsets: Array1, connectivity: Array1, types: Array1,
+        owners: t.Optional[Array1] = None,
+    ) -> None:
+        np = numpy._()
+        self._points = np.asarray(points, dtype=float)
+        self._offsets = np.asarray(offsets, dtype=int)
+        self._connectivity = np.asarray(connectivity, dtype=int)
+        self._types = np.asarray(types, dtype=int)
+        counts = np.diff(self._offsets)
+        self._owners = np.arange(len(counts)) if owners is None else np.asarray(owners, dtype=int)
+        sums = np.add.reduceat(self._points[self._connectivity], self._offsets[:-1], axis=0) if len(counts) else np.zeros((0, 3))
+        self._centres = sums / np.maximum(counts, 1)[:, None]
+        self._incidence: t.Optional[t.Tuple[Array1, Array1]] = None
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        np = numpy._()
+        points = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=float)
+        return cls(points, np.array([0, 4]), np.arange(4), np.array([10]))
+
+    @classmethod
+    def cached(cls, points: Array2, **connectivity: t.Optional[Array1]) -> 'te.Self':
+        '''Topology shared by identical points and connectivity (digest of arrays as key), legacy cell array as `cells`'''
+        np = numpy._()
+        sha = hashlib.blake2b(digest_size=16)
+        for name, array in [('points', points), *sorted(connectivity.items())]:
+            if array is not None:
+                array = np.ascontiguousarray(array)
+                sha.update(f'{name}{array.dtype}{array.shape}'.encode())
+                sha.update(array.data)
+        key = sha.digest()
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+        else:
+            cls._cache[key] = cls.fromLegacy(points, **connectivity) if 'cells' in connectivity else cls(points, **connectivity)
+            while len(cls._cache) > cls.capacity:
+                cls._cache.popitem(last=False)
+        return cls._cache[key]
+
+    @classmethod
+    def fromLegacy(cls, points: Array2, cells: Array1, types: Array1, owners: t.Optional[Array1] = None) -> 'te.Self':
+        '''From legacy cell array (`[n, id_1, ..., id_n, n, ...]`)'''
+        np = numpy._()
+        offsets, ith = [0], 0
+        while ith < len(cells):
+            ith += int(cells[ith]) + 1
+            offsets.append(ith-len(offsets))
+        mask = np.ones(len(cells), dtype=bool)
+        mask[np.array(offsets[:-1], dtype=int)+np.arange(len(offsets)-1)] = False
+        return cls(points, np.array(offsets), np.asarray(cells)[mask], types, owners)
+
+    @property
+    def centres(self) -> Array2:
+        '''Vertex average of each VTK cell'''
+        return self._centres
+
+    @property
+    def arrays(self) -> t.Dict[str, Array1]:
+        '''Connectivity arrays (keyword arguments of constructor except points)'''
+        return {'offsets': self._offsets, 'connectivity': self._connectivity, 'types': self._types, 'owners': self._owners}
+
+    def locate(self, locations: t.Union[Array2, t.Sequence[Location]], scheme: Scheme = 'cellPoint') -> Interpolation:
+        np = numpy._()
+        locations = np.atleast_2d(np.asarray(locations, dtype=float))
+        n, width = len(locations), 8  # vertices of hexahedron
+        cells = np.full(n, -1)
+        centre, points, weights = np.zeros(n), np.zeros((n, width), dtype=int), np.zeros((n, width))
+        if not n or not len(self._types):
+            return Interpolation(scheme, cells, centre, points, weights)
+        queries, candidates = np.arange(n), Grid.cached(self._centres).nearest(locations)
+        tested = np.zeros(0, dtype=int)
+        for round in range(self.rounds+1):
+            # nearer candidates first, pairs of located locations are skipped
+            distance = np.square(self._centres[candidates]-locations[queries]).sum(axis=1)
+            order = np.lexsort((distance, queries))
+            queries, candidates = queries[order], candidates[order]
+            first = np.searchsorted(queries, queries)
+            rank = np.arange(len(queries)) - first
+            order = np.argsort(rank, kind='stable')
+            queries, candidates = queries[order], candidates[order]
+            bounds = np.searchsorted(rank[order], [0, 1, 2, 4, 8, 16, len(queries)+1])
+            for lower, upper in zip(bounds[:-1], bounds[1:]):
+                for ith in range(lower, upper, self.chunk):
+                    end = min(ith+self.chunk, upper)
+                    self._test(locations, queries[ith:end], candidates[ith:end], scheme, cells, centre, points, weights)
+            missing = cells[queries] < 0
+            if round == self.rounds or not missing.any():
+                break
+            tested = np.union1d(tested, queries*len(self._types)+candidates)
+            queries, candidates = self._neighbours(queries[missing], candidates[missing])
+            keep = ~np.isin(queries*len(self._types)+candidates, tested)
+            queries, candidates = queries[keep], candidates[keep]
+        return Interpolation(scheme, cells, centre, points, weights)
+
+    def _test(
+        self,
+        locations: Array2, queries: Array1, candidates: Array1, scheme: Scheme,
+        cells: Array1, centre: Array1, points: Array2, weights: Array2,
+    ) -> None:
+        '''Record weights of (location, cell) pairs where cell contains location (first pair wins)'''
+        np = numpy._()
+        for type, faces in self.faces.items():
+            mask = (self._types[candidates] == type) & (cells[queries] < 0)
+            if not mask.any():
+                continue
+            query, candidate = queries[mask], candidates[mask]
+            face, edge = self._tetrahedra(type)
+            m = face.shape[1]
+            vertices = self._connectivity[self._offsets[candidate, None]+np.arange(m)]  # (pair, vertex)
+            coords = self._points[vertices]
+            origin = self._centres[candidate]
+            e1 = np.einsum('tv,pvd->ptd', face, coords) - origin[:, None]
+            e2 = coords[:, edge[:, 0]] - origin[:, None]
+            e3 = coords[:, edge[:, 1]] - origin[:, None]
+            r = (locations[query] - origin)[:, None]
+            c23, c31, c12 = np.cross(e2, e3), np.cross(e3, e1), np.cross(e1, e2)
+            det = (e1*c23).sum(axis=-1)
+            scale = np.square(e1).sum(axis=-1) ** 1.5
+            with np.errstate(divide='ignore', invalid='ignore'):  # Cramer's rule
+                alpha, beta, gamma = ((r*c).sum(axis=-1)/det for c in (c23, c31, c12))
+            lambdas = np.stack([1-alpha-beta-gamma, alpha, beta, gamma], axis=-1)
+            inside = (lambdas.min(axis=-1) >= -self.tolerance) & (np.abs(det) > 1e-12*scale)
+            hit = inside.any(axis=1)
+            if not hit.any():
+                continue
+            # first pair of each location
+            pair = np.flatnonzero(hit)
+            pair = pair[np.unique(query[pair], return_index=True)[1]]
+            pair = pair[cells[query[pair]] < 0]
+            tet = inside[pair].argmax(axis=1)
+            target = query[pair]
+            cells[target] = self._owners[candidate[pair]]
+            points[target, :m] = vertices[pair]
+            if scheme == 'cell':
+                centre[target] = 1.0
+            elif scheme == 'cellPoint':
+                l = lambdas[pair, tet]
+                local = l[:, 1, None]*face[tet]
+                rows = np.arange(len(pair))
+                np.add.at(local, (rows, edge[tet, 0]), l[:, 2])
+                np.add.at(local, (rows, edge[tet, 1]), l[:, 3])
+                centre[target] = l[:, 0]
+                weights[target, :m] = local
+            else:  # inverseDistance
+                distance = np.sqrt(np.square(coords[pair]-locations[target, None]).sum(axis=-1))
+                exact = distance <= 1e-12*np.sqrt(np.einsum('ptd,ptd->pt', e2[pair], e2[pair])).max(axis=1, keepdims=True)
+                with np.errstate(divide='ignore'):
+                    local = np.where(exact.any(axis=1, keepdims=True), exact.astype(float), distance**-float(self.power))
+                weights[target, :m] = local / local.sum(axis=1, keepdims=True)
+
+    def _tetrahedra(self, type: int) -> t.Tuple[Array2, Array2]:
+        '''Face centre weights (tetrahedron, vertex) and edges (tetrahedron, 2) of cell type'''
+        np = numpy._()
+        faces = self.faces[type]
+        m = max(max(face) for face in faces) + 1
+        face, edge = [], []
+        for vertices in faces:
+            for ith in range(len(vertices)):
+                row = np.zeros(m)
+                row[list(vertices)] = 1 / len(vertices)
+                face.append(row)
+                edge.append((vertices[ith], vertices[(ith+1)%len(vertices)]))
+        return np.array(face), np.array(edge)
+
+    def _neighbours(self, queries: Array1, cells: Array1) -> t.Tuple[Array1, Array1]:
+        '''Unique (location, cell) pairs of cells sharing a vertex with given cells'''
+        np = numpy._()
+        if self._incidence is None:
+            order = np.argsort(self._connectivity, kind='stable')
+            owners = np.repeat(np.arange(len(self._types)), np.diff(self._offsets))
+            starts = np.searchsorted(self._connectivity[order], np.arange(len(self._points)+1))
+            self._incidence = (starts, owners[order])
+        starts, incident = self._incidence
+        counts = np.diff(self._offsets)[cells]
+        vertices = self._connectivity[_ragged(self._offsets[cells], counts)]
+        query = np.repeat(queries, counts)
+        counts = starts[vertices+1] - starts[vertices]
+        neighbours = incident[_ragged(starts[vertices], counts)]
+        keys = np.unique(np.repeat(query, counts)*len(self._types)+neighbours)
+        return keys // len(self._types), keys % len(self._types)
+
+
+def line(start: Location, end: Location, n: int = 100) -> Array2:
+    '''n uniformly distributed locations from start to end (inclusive)'''
+    np = numpy._()
+    start, end = np.asarray(start, dtype=float), np.asarray(end, dtype=float)
+    return start + np.linspace(0, 1, n)[:, None]*(end-start)
+
+
+def plane(origin: Location, a: Location, b: Location, shape: t.Tuple[int, int] = (50, 50)) -> Array2:
+    '''Locations of `origin + i*a + j*b` for i, j in [0, 1], rows of b are contiguous'''
+    np = numpy._()
+    i, j = np.meshgrid(np.linspace(0, 1, shape[0]), np.linspace(0, 1, shape[1]), indexing='ij')
+    origin, a, b = (np.asarray(vector, dtype=float) for vector in (origin, a, b))
+    return (origin + i[..., None]*a + j[..., None]*b).reshape(-1, 3)
+
+
+def _ragged(starts: Array1, counts: Array1) -> Array1:
+    '''Concatenation of `arange(start, start+count)`'''
+    np = numpy._()
+    total = int(counts.sum())
+    return np.repeat(starts-np.cumsum(counts)+counts, counts) + np.arange(total)
@@ -0,0 +1,168 @@
+__all__ = ['Grid']
+
+
+import collections
+import hashlib
+import itertools
+import typing as t
+
+from ...base.lib import numpy
+from ...base.type import Array1, Array2
+from ...util.implementation import Base
+
+if t.TYPE_CHECKING:
+    import typing_extensions as te
+
+
+class Grid(Base):
+    '''Uniform grid spatial index for exact nearest-neighbour queries (Euclidean), batched with NumPy
+
+    Example:
+        >>> grid = Grid.fromPoints(vtk.points)
+        >>> grid.nearest(numpy.random.rand(10000, 3))  # indices of nearest points
+        array([ 512, 1023,   17, ...])
+
+    Note:
+        - bins hold `density` points on average, bins of each query are searched ring by ring until no closer point can exist
+        - queries in sparse regions (or far outside the mesh) fall back to a blocked brute-force search
+        - `Grid::cached` shares index between meshes with identical points (e.g. time steps of a static mesh)
+    '''
+
+    __slots__ = ('_points', '_lower', '_upper', '_size', '_shape', '_order', '_starts')
+    density = 2.0  # points per bin
+    capacity = 8  # number of cached indices
+    memory = 2**22  # elements of distance matrix in brute-force fallback
+    cost = 32  # cost of visiting a bin relative to a distance in brute-force fallback
+    _cache: t.Dict[bytes, 'Grid'] = collections.OrderedDict()
+
+    def __init__(self, points: Array2, density: t.Optional[float] = None) -> None:
+        np = numpy._()
+        self._points = points = np.ascontiguousarray(points, dtype=float)
+        lower, upper = points.min(axis=0), points.max(axis=0)
+        extent = upper - lower
+        active = extent > 1e-12 * max(float(extent.max()), 1e-300)
+        bins = max(len(points)/(density or self.density), 1.0)
+        size = 1.0
+        while active.any():  # axes thinner than a bin are flattened, so that there are at most ~2^d*bins bins
+            size = (float(np.prod(extent[active]))/bins) ** (1/active.sum())
+            if (extent[active] >= size).all():
+                break
+            active &= extent >= size
+        self._lower, self._upper = lower, upper
+        self._size = size
+        self._shape = np.where(active, np.maximum(np.ceil(extent/size), 1), 1).astype(int)
+        ids = self._linear(self._bin(points))
+        self._order = np.argsort(ids, kind='stable')
+        self._starts = np.searchsorted(ids[self._order], np.arange(int(np.prod(self._shape))+1))
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls(numpy._().zeros((1, 3)))
+
+    @classmethod
+    def fromPoints(cls, points: Array2) -> 'te.Self':
+        return cls(points)
+
+    @classmethod
+    def cached(cls, points: Array2) -> 'te.Self':
+        '''Index shared by identical points (digest of coordinates as key)'''
+        np = numpy._()
+        points = np.ascontiguousarray(points, dtype=float)
+        key = hashlib.blake2b(points.data, digest_size=16).digest() + bytes(str(points.shape), 'ascii')
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+        else:
+            cls._cache[key] = cls(points)
+            while len(cls._cache) > cls.capacity:
+                cls._cache.popitem(last=False)
+        return cls._cache[key]
+
+    @property
+    def points(self) -> Array2:
+        return self._points
+
+    def nearest(self, locations: Array2) -> Array1:
+        '''Index of nearest point of each location'''
+        np = numpy._()
+        locations = np.atleast_2d(np.asarray(locations, dtype=float))
+        n = len(locations)
+        best = np.full(n, -1)
+        distance = np.full(n, np.inf)
+        bins = self._bin(locations)
+        gaps = np.maximum(self._lower-locations, 0) + np.maximum(locations-self._upper, 0)  # outside bounding box
+        outside, nearest = np.square(gaps).sum(axis=1), gaps.min(axis=1)
+        active = np.arange(n)
+        visited = 0
+        for radius in itertools.count():
+            offsets = self._ring(radius)
+            visited += len(offsets)
+            if self.cost*visited > len(self._points):  # sparse region, rings cost more than brute force
+                self._brute(locations, active, best)
+                return best
+            if len(offsets):
+                self._search(locations, bins, active, offsets, best, distance)
+            reach = radius * self._size  # lower bound of distance to points in bins not searched yet
+            covered = distance <= outside + reach*reach + 2*reach*nearest
+            exhausted = radius >= self._shape.max()-1
+            active = active[~covered[active]] if not exhausted else active[:0]
+            if not len(active):
+                return best
+
+    def _search(self, locations: Array2, bins: Array2, active: Array1, offsets: Array2, best: Array1, distance: Array1) -> None:
+        np = numpy._()
+        cells = bins[active, None, :] + offsets[None, :, :]  # (query, offset, axis)
+        valid = ((cells >= 0) & (cells < self._shape)).all(axis=2)
+        query = np.broadcast_to(active[:, None], valid.shape)[valid]
+        ids = self._linear(cells[valid])
+        starts, counts = self._starts[ids], self._starts[ids+1] - self._starts[ids]
+        total = int(counts.sum())
+        if not total:
+            return
+        # ragged arange: indices of points in all candidate bins
+        shifts = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        candidates = self._order[shifts + np.arange(total)]
+        owners = np.repeat(query, counts)
+        d2 = np.square(self._points[candidates]-locations[owners]).sum(axis=1)
+        order = np.lexsort((d2, owners))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = owners[order][1:] != owners[order][:-1]
+        owners, d2, candidates = owners[order][first], d2[order][first], candidates[order][first]
+        better = d2 < distance[owners]
+        distance[owners[better]] = d2[better]
+        best[owners[better]] = candidates[better]
+
+    def _brute(self, locations: Array2, active: Array1, best: Array1) -> None:
+        np = numpy._()
+        chunk = max(1, self.memory // max(len(self._points), 1))
+        squares = np.square(self._points).sum(axis=1)
+        for ith in range(0, len(active), chunk):
+            queries = active[ith:ith+chunk]
+            d2 = squares[None, :] - 2*locations[queries]@self._points.T  # |q|^2 is constant per query
+            best[queries] = d2.argmin(axis=1)
+
+    def _ring(self, radius: int) -> Array2:
+        '''Bin offsets at Chebyshev distance `radius` (faces of cube shell), axes with a single bin are not offset'''
+        np = numpy._()
+        if radius == 0:
+            return np.zeros((1, 3), dtype=int)
+        axes = [ith for ith, size in enumerate(self._shape) if size > 1]
+        faces = []
+        for kth, axis in enumerate(axes):
+            ranges = []
+            for ith in range(3):
+                if ith == axis:
+                    ranges.append(np.array([-radius, radius]))
+                elif ith in axes:  # earlier axes exclude their own faces to avoid duplicates
+                    r = radius - 1 if ith in axes[:kth] else radius
+                    ranges.append(np.arange(-r, r+1))
+                else:
+                    ranges.append(np.zeros(1, dtype=int))
+            faces.append(np.stack(np.meshgrid(*ranges, indexing='ij'), axis=-1).reshape(-1, 3))
+        return np.concatenate(faces) if faces else np.zeros((0, 3), dtype=int)
+
+    def _bin(self, points: Array2) -> Array2:
+        np = numpy._()
+        return np.clip(np.floor((points-self._lower)/self._size).astype(int), 0, self._shape-1)
+
+    def _linear(self, bins: Array2) -> Array1:
+        return (bins[..., 0]*self._shape[1] + bins[..., 1])*self._shape[2] + bins[..., 2]
@@ -0,0 +1,132 @@
+__all__ = ['Steps']
+
+
+import bisect
+import collections
+import concurrent.futures as cf
+import threading
+import typing as t
+
+from ...base.type import Func1, ListFloat, Path
+from ...util.implementation import Base
+
+if t.TYPE_CHECKING:
+    import typing_extensions as te
+
+    from .core import VTK
+
+
+class Steps(Base):
+    '''Lazy sequence of time steps, decoded on demand with bounded memory
+
+    Example:
+        >>> steps = foam.post.vtks
+        >>> steps[-1]  # only the latest time step is read
+        <foam.app.postprocess.core.VTK object at ...>
+        >>> steps.at(0.5), steps[::10]
+        (<foam.app.postprocess.core.VTK object at ...>, <foam.app.postprocess.stream.Steps object at ...>)
+        >>> for vtk in steps:  # next step is read in background while current one is processed
+        ...     ...
+
+    Note:
+        - at most `capacity` decoded steps are kept (least recently used are dropped), slices share them
+        - accessing step i prefetches steps i+1, ..., i+`ahead` in a background thread
+    '''
+
+    __slots__ = ('_paths', '_times', '_loader', '_capacity', '_ahead', '_cache', '_pending', '_lock', '_executor')
+
+    def __init__(
+        self,
+        paths: t.List[Path], times: ListFloat, loader: Func1[Path, 'VTK'],
+        capacity: int = 4, ahead: int = 1,
+    ) -> None:
+        self._paths = paths
+        self._times = times
+        self._loader = loader
+        self._capacity = capacity
+        self._ahead = ahead
+        self._cache: t.Dict[Path, 'VTK'] = collections.OrderedDict()
+        self._pending: t.Dict[Path, cf.Future] = {}
+        self._lock = threading.Lock()
+        self._executor: t.Optional[cf.ThreadPoolExecutor] = None
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __iter__(self) -> t.Iterator['VTK']:
+        for ith in range(len(self)):
+            yield self[ith]
+
+    def __getitem__(self, index: t.Union[int, slice]) -> t.Union['VTK', 'te.Self']:
+        if isinstance(index, slice):
+            return self._view(index)
+        index = range(len(self))[index]  # negative index and IndexError
+        ans = self._load(self._paths[index])
+        for path in self._paths[index+1:index+1+self._ahead]:
+            self._prefetch(path)
+        return ans
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls([], [], lambda path: None)
+
+    @property
+    def paths(self) -> t.List[Path]:
+        return self._paths
+
+    @property
+    def times(self) -> ListFloat:
+        return self._times
+
+    def at(self, time: float) -> 'VTK':
+        '''Time step of given time'''
+        ith = bisect.bisect_left(self._times, time)
+        if ith == len(self._times) or self._times[ith] != time:
+            raise KeyError(time)
+        return self[ith]
+
+    def clear(self) -> None:
+        '''Drop decoded time steps'''
+        with self._lock:
+            self._cache.clear()
+
+    def _load(self, path: Path) -> 'VTK':
+        with self._lock:
+            if path in self._cache:
+                self._cache.move_to_end(path)
+                return self._cache[path]
+            future = self._pending.get(path, None)
+        ans = self._loader(path) if future is None else future.result()
+        self._store(path, ans)
+        return ans
+
+    def _prefetch(self, path: Path) -> None:
+        with self._lock:
+            if path in self._cache or path in self._pending:
+                return
+            if self._executor is None:
+                self._executor = cf.ThreadPoolExecutor(max_workers=1)
+            self._pending[path] = self._executor.submit(self._task, path)
+
+    def _task(self, path: Path) -> 'VTK':
+        try:
+            ans = self._loader(path)
+            self._store(path, ans)
+        finally:
+            with self._lock:
+                self._pending.pop(path, None)
+        return ans
+
+    def _store(self, path: Path, vtk: 'VTK') -> None:
+        with self._lock:
+            self._cache[path] = vtk
+            self._cache.move_to_end(path)
+            while len(self._cache) > self._capacity:
+                self._cache.popitem(last=False)
+
+    def _view(self, index: slice) -> 'te.Self':
+        ans = self.__class__.__new__(self.__class__)
+        for name in self.__slots__:
+            setattr(ans, name, getattr(self, name))
+        ans._paths, ans._times = self._paths[index], self._times[index]
+        return ans
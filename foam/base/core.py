@@ -1,24 +1,28 @@
 __all__ = ['Foam']
 
 
+import concurrent.futures as cf
 import copy
 import functools as f
 import gc
 import os
 import pathlib as p
 import shutil
+import threading
+import time
 import typing as t
 import urllib.parse
 import urllib.request
 import warnings as w
 
-from .type import CmdItems, DictAny2, DictStr2, FoamItems, ListStr, Path, SetStr
+from .type import CmdItems, DictAny2, DictStr2, FoamItems, Func0, ListStr, Path, SetStr
 from ..compat.functools import cached_property
 from ..parse import Parser
 from ..util.function import deprecated_classmethod
 from ..util.implementation import Base
 from ..util.object.conversion import Conversion
 from ..util.object.data import Data
+from ..util.object.manifest import Manifest
 from ..util.object.version import Version
 
 if t.TYPE_CHECKING:
@@ -32,6 +36,9 @@ if t.TYPE_CHECKING:
     Kwargs = te.ParamSpecKwargs(P)
 
 
+SaveItem = t.Tuple[str, Func0[None]]  # digest, write
+
+
 class Foam(Base):
     '''Convert multiple dictionary type data to OpenFOAM test case
 
@@ -42,13 +49,15 @@ class Foam(Base):
         >>> foam.cmd.all_run()
     '''
 
-    __slots__ = ('_items', '_root', '_dest', '_parser', '_cmd', '_info', '_post')
+    __slots__ = ('_items', '_root', '_dest', '_manifest', '_owned', '_parser', '_cmd', '_info', '_post')
     __version__ = Version.fromString('0.13.5')
 
     def __init__(self, data: FoamItems, root: Path, warn: bool = True) -> None:
         self._items = data
         self._root = p.Path(root)
         self._dest: t.Optional[p.Path] = None
+        self._manifest: t.Optional[Manifest] = None
+        self._owned: t.Optional[t.List[DictAny2]] = None  # copy-on-write, one trie per item
 
         self._parser: t.Optional[Parser] = None
         self._cmd: t.Optional['Command'] = None
@@ -67,7 +76,8 @@ class Foam(Base):
 
     def __getitem__(self, key: str) -> t.Optional[Data]:
         try:
-            return Data.fromAny(self._items[self.meta['order'].index(key)])
+            index = self.meta['order'].index(key)
+            return Data.fromAny(self._items[index], None if self._owned is None else self._owned[index])
         except ValueError:
             return None
 
@@ -149,8 +159,8 @@ class Foam(Base):
         '''Supported path mode: file, directory'''
         path = p.Path(path)
         if path.is_file():
-            type_or_suffix = path.suffix if type is None else type  # type or path.suffix
-            return cls.fromText(path.read_text(), path.parent, type_or_suffix, warn=warn)
+            data = Conversion.fromPath(path, all=True, type=type).to_document()  # cached
+            return cls(data, path.parent, warn=warn)
         elif path.is_dir():
             return cls.fromOpenFoam(path)
         else:
@@ -158,7 +168,7 @@ class Foam(Base):
 
     @classmethod
     def fromOpenFoam(cls, path: Path, **kwargs: 'Kwargs') -> 'te.Self':
-        '''From OpenFOAM directory'''
+        '''From OpenFOAM directory (keyword arguments of `Lark`, e.g. `workers` and `ignore`)'''
         return Parser.toFoam(path, **kwargs)
 
     @classmethod
@@ -238,6 +248,13 @@ class Foam(Base):
         shutil.rmtree(self.destination)
         self._dest = None
 
+    @property
+    def manifest(self) -> Manifest:
+        '''Files written, skipped and removed by the last `Foam::save`'''
+        assert self._manifest is not None, 'Please call `Foam::save` method first'
+
+        return self._manifest
+
     @cached_property
     def application(self) -> str:
         '''Inspired by `getApplication`
@@ -298,54 +315,136 @@ class Foam(Base):
             count = min(count, len(grids)-grids.count('1'))
         return count
 
-    def copy(self) -> 'te.Self':
-        other = self.__class__(copy.deepcopy(self._items), self._root)
+    def copy(self, cow: bool = False) -> 'te.Self':
+        '''Deep copy, or copy-on-write copy sharing nested containers and embedded payloads
+
+        Example:
+            >>> other = foam.copy(cow=True)
+            >>> other['foam']['system', 'controlDict', 'endTime'] = 1.0  # only the path is copied
+
+        Note:
+            - with `cow`, nested containers of both cases are copied on first access through `Foam::__getitem__` (plain `dict` and `list` that can be modified), raw containers (e.g. `Data::data`) are shared and must not be modified
+        '''
+        if cow:
+            items = [item.copy() if isinstance(item, (dict, list)) else item for item in self._items]
+            other = self.__class__(items, self._root)
+            if self._owned is None:
+                self._owned = [{} for _ in self._items]
+            for owned in self._owned:  # in place, `Data` of this case see the reset
+                owned.clear()
+            other._owned = [{} for _ in other._items]
+        else:
+            other = self.__class__(copy.deepcopy(self._items), self._root)
         other._dest = self._dest
         return other
 
-    def save(self, dest: Path, paraview: bool = True) -> 'te.Self':
-        '''Persist case to hard disk'''
+    def save(
+        self,
+        dest: Path, paraview: bool = True,
+        incremental: bool = False, workers: t.Optional[int] = None,
+    ) -> 'te.Self':
+        '''Persist case to hard disk
+
+        Note:
+            - a manifest of content hashes is kept in the destination, `incremental` skips unchanged files and removes files that are no longer part of the case
+            - `workers` renders and writes independent files concurrently in a thread pool (static items are assumed not to overlap)
+            - see `Foam::manifest` for what was written, skipped and removed, and how long each file took
+        '''
         self._dest = p.Path(dest)
         self._dest.mkdir(parents=True, exist_ok=True)
-        self._save_foam()
-        self._save_static()
+        self._manifest = Manifest.fromPath(self._dest) if incremental else Manifest(self._dest)
+        foams, statics = list(self._items_foam()), list(self._items_static())
         if paraview:
-            self._write(self._dest/'paraview.foam', '')
+            statics.append(('paraview.foam', f.partial(self._render, self._path('paraview.foam'), '')))
+        self._manifest.remove(self._manifest.orphans(name for name, _ in foams+statics))
+        for directory in sorted({self._path(name).parent for name, _ in foams+statics}):
+            directory.mkdir(parents=True, exist_ok=True)
+        for items in [foams, statics]:  # static items may overwrite dictionary files
+            if workers is None:
+                results = list(map(self._save_item, items))
+            else:
+                with cf.ThreadPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(self._save_item, items))
+            for (name, _), (digest, written, seconds) in zip(items, results):
+                self._manifest.record(name, digest, written, seconds)
+        self._manifest.dump()
         return self
 
     def reset(self) -> 'te.Self':
-        self._dest = self._cmd = self._info = self._post = None
+        self._dest = self._manifest = self._cmd = self._info = self._post = None
         for obj in gc.get_objects():
             if isinstance(obj, f._lru_cache_wrapper):
                 obj.cache_clear()
         return self
 
-    def _write(self, path: p.Path, string: str, permission: t.Optional[int] = None) -> None:
-        with open(path, 'w', encoding='utf-8', newline='\n') as f:  # CRLF -> LF
-            f.write(string)
-        if permission is not None:
-            path.chmod(int(str(permission), base=8))
-
-    def _save_static(self) -> None:
+    def _write(self, path: p.Path, content: t.Union[bytes, str], permission: t.Optional[int] = None) -> None:
+        '''Atomic write (temporary file plus rename), a half-written file is never visible'''
+        data = content.encode('utf-8') if isinstance(content, str) else content  # no newline translation
+        temp = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            with open(os.open(temp, os.O_WRONLY|os.O_CREAT|os.O_TRUNC, 0o666), 'wb') as f:
+                f.write(data)
+            if permission is not None:
+                temp.chmod(int(str(permission), base=8))
+            os.replace(temp, path)
+        finally:
+            if temp.exists():
+                temp.unlink()
+
+    def _copy(self, path: p.Path, source: p.Path, permission: t.Optional[int] = None) -> None:
+        '''Atomic copy (see `Foam::_write`), content is streamed'''
+        temp = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            shutil.copyfile(source, temp)
+            if permission is not None:
+                temp.chmod(int(str(permission), base=8))
+            os.replace(temp, path)
+        finally:
+            if temp.exists():
+                temp.unlink()
+
+    def _items_static(self) -> t.Iterator[t.Tuple[str, Func0[SaveItem]]]:
         # TODO: add to parse sub-module
         for static in self['static'] or []:
-            self.parser.static[tuple(static['type'])](static)
+            yield static['name'], f.partial(self._render_static, static)
 
-    def _save_foam(self) -> None:
+    def _items_foam(self) -> t.Iterator[t.Tuple[str, Func0[SaveItem]]]:
         foam = self['foam']
         for keys, data in self._extract_files({} if foam is None else foam.data):
             # pre-process FoamFile to avoid duplicate descriptions (not recommended yet)
-            if data['FoamFile'] is None:
+            data, header = data.copy(), data['FoamFile']  # data may be shared (copy-on-write)
+            if header is None:
                 data.pop('FoamFile')
-            elif isinstance(data['FoamFile'], str):
-                data['FoamFile'] = {'class': data['FoamFile']}
-            if 'FoamFile' in data:
+            else:
+                header = {'class': header} if isinstance(header, str) else header.copy()
                 for key, value in [('version', 2.0), ('format', 'ascii'), ('object', keys[-1])]:
-                    data['FoamFile'].setdefault(key, value)
+                    header.setdefault(key, value)
+                if header['format'] == 'binary':
+                    header.setdefault('arch', '"LSB;label=32;scalar=64"')
+                data['FoamFile'] = header
             # write the parsed text data
-            path = self._path(*map(str, keys))  # self._dest is not None
-            path.parent.mkdir(parents=True, exist_ok=True)
-            self._write(path, '\n'.join(self.parser.case.data(data)))
+            name = p.Path(*map(str, keys)).as_posix()
+            yield name, f.partial(self._render_foam, self._path(name), data)
+
+    def _render(self, path: p.Path, content: t.Union[bytes, str]) -> SaveItem:
+        return Manifest.digest(content), f.partial(self._write, path, content)
+
+    def _render_foam(self, path: p.Path, data: DictAny2) -> SaveItem:
+        case = self.parser.case
+        return self._render(path, case.dumpb(data) if case.is_binary(data) else case.dumps(data))
+
+    def _render_static(self, static: DictAny2) -> SaveItem:
+        return self.parser.static.digest(static), f.partial(self.parser.static[tuple(static['type'])], static)
+
+    def _save_item(self, item: t.Tuple[str, Func0[SaveItem]]) -> t.Tuple[str, bool, float]:
+        '''Render, hash and (if changed) write, returns digest, whether written and seconds elapsed'''
+        name, render = item
+        start = time.perf_counter()
+        digest, write = render()
+        written = self._manifest.changed(name, digest)
+        if written:
+            write()
+        return digest, written, time.perf_counter()-start
 
     def _extract_files(
         self,
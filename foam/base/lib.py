@@ -46,6 +46,10 @@ class classproperty:
 class lark:
     '''pip install ifoam[lark]'''
 
+    @classproperty
+    def LarkError(cls) -> t.Type['_lark.exceptions.LarkError']:
+        return cls._().exceptions.LarkError
+
     @classmethod
     def Lark(cls, *args: 'P.args', **kwargs: 'P.kwargs') -> '_lark.Lark':
         return cls._().Lark(*args, **kwargs)
@@ -90,6 +94,18 @@ class numpy:
     def argmin(cls, *args: 'P.args', **kwargs: 'P.kwargs') -> '_numpy.ndarray':
         return cls._().argmin(*args, **kwargs)
 
+    @classmethod
+    def ascontiguousarray(cls, *args: 'P.args', **kwargs: 'P.kwargs') -> '_numpy.ndarray':
+        return cls._().ascontiguousarray(*args, **kwargs)
+
+    @classmethod
+    def empty(cls, *args: 'P.args', **kwargs: 'P.kwargs') -> '_numpy.ndarray':
+        return cls._().empty(*args, **kwargs)
+
+    @classmethod
+    def frombuffer(cls, *args: 'P.args', **kwargs: 'P.kwargs') -> '_numpy.ndarray':
+        return cls._().frombuffer(*args, **kwargs)
+
     @classmethod
     def loadtxt(cls, *args: 'P.args', **kwargs: 'P.kwargs') -> '_numpy.ndarray':
         return cls._().loadtxt(*args, **kwargs)
@@ -213,6 +229,11 @@ class vtkmodules:
 class yaml:
     '''pip install ifoam'''
 
+    @classproperty
+    def Loader(cls) -> t.Union[t.Type['_yaml.SafeLoader'], t.Type['_yaml.CSafeLoader']]:
+        '''C-accelerated loader if libyaml is available'''
+        return cls._loader()
+
     @classmethod
     def dump(cls, *args: 'P.args', **kwargs: 'P.kwargs') -> str:
         kwargs = {'Dumper': cls._dumper(), **kwargs}
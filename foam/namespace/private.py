@@ -1,8 +1,9 @@
-__all__ = ['CaseBase', 'Envelope', 'Figure', 'Iterator', 'SMTP', 'Timer']
+__all__ = ['CaseBase', 'Envelope', 'Figure', 'Iterator', 'SMTP', 'Sweep', 'Timer']
 
 
 from ..util.private.case import CaseBase
 from ..util.private.email import Envelope, SMTP
 from ..util.private.figure import Figure
 from ..util.private.iterator import Iterator
+from ..util.private.sweep import Sweep
 from ..util.private.timer import Timer
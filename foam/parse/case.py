@@ -1,10 +1,12 @@
 __all__ = ['Case']
 
 
+import io
 import typing as t
 
 from ..base.type import Any, DictStrAny, ListAny
 from ..compat.functools import singledispatchmethod
+from ..util.object.field import Field
 from ..util.implementation import Singleton
 
 if t.TYPE_CHECKING:
@@ -39,14 +41,62 @@ class Case(Singleton):
         dimensions [0 1 -1 0 0 0 0];
         internalField uniform (0 0 0);
         boundaryField {movingWall {type fixedValue; value uniform (1 0 0);} fixedWalls {type noSlip;} frontAndBack {type empty;}}
+
+        >>> print(case.dumps({'internalField': 'uniform 0', 'value': [1, 2]}, indent=4))
+        internalField uniform 0;
+        value
+        (
+            1
+            2
+        );
     '''
 
     __slots__ = ()
+    chunk = 4096  # number of list elements joined at a time
 
     @classmethod
     def default(cls) -> 'te.Self':
         return cls()
 
+    def dump(self, data: DictStrAny, file: t.TextIO, indent: t.Optional[int] = None) -> None:
+        '''Stream tokens into file-like object (compact if `indent` is None, else pretty-printed)
+
+        Note:
+            - use `Case::dumpb` if `FoamFile.format` is binary
+        '''
+        file.writelines(self.tokens(data, indent))
+
+    def dumpb(self, data: DictStrAny, indent: t.Optional[int] = None) -> bytes:
+        '''Fields are written as binary blocks if `FoamFile.format` is binary'''
+        with io.BytesIO() as f:
+            f.writelines(
+                token.encode() if isinstance(token, str) else token
+                for token in self.tokens(data, indent)
+            )
+            return f.getvalue()
+
+    def dumps(self, data: DictStrAny, indent: t.Optional[int] = None) -> str:
+        '''Same as `'\\n'.join(Case::data(data))` if `indent` is None'''
+        with io.StringIO() as f:
+            self.dump(data, f, indent)
+            return f.getvalue()
+
+    def tokens(
+        self,
+        data: DictStrAny, indent: t.Optional[int] = None, binary: t.Optional[bool] = None,
+    ) -> t.Iterator[t.Union[memoryview, str]]:
+        '''Tokens are strings except for binary blocks of `Field` (`binary` defaults to `FoamFile.format`)'''
+        if binary is None:
+            binary = self.is_binary(data)
+        if indent is None:
+            return self._tokens_compact(data, '\n', binary)
+        else:
+            return self._tokens_pretty(data, ' '*indent, '', binary)
+
+    def is_binary(self, data: DictStrAny) -> bool:
+        header = data.get('FoamFile', None)
+        return isinstance(header, dict) and header.get('format', None) == 'binary'
+
     def data(self, data: DictStrAny) -> t.Iterator[str]:
         for key, value in data.items():
             yield f'{self.key(key)} {self.value(value)}'
@@ -73,25 +123,103 @@ class Case(Singleton):
 
     @value.register(list)
     def _(self, value: ListAny) -> str:
-        if not value or isinstance(value[0], (str, int, float)):
+        if self._is_scalars(value):
             return f'({" ".join(map(str, value))});'
-        elif isinstance(value[0], dict):
+        else:
             strings = []
             for element in value:
-                head = tuple(k for k, v in element.items() if v is None)
-                if head:
-                    element_cloned = element.copy()
-                    element_cloned.pop(head[0])
-                    string = ' '.join(self.data(element_cloned))
-                    strings.append(f'{head[0]} {{{string}}}')
-                else:
-                    string = ' '.join(self.data(element))
-                    strings.append(f'{{{string}}}')
+                head, element = self._head(element)
+                string = ' '.join(self.data(element))
+                strings.append(f'{{{string}}}' if head is None else f'{head} {{{string}}}')
             return f'({" ".join(strings)});'
-        else:
-            raise Exception(f'Unknown list "{value}"')
 
     @value.register(dict)
     def _(self, value: DictStrAny) -> str:
         string = ' '.join(self.data(value))
         return f'{{{string}}}'
+
+    @value.register(Field)
+    def _(self, value: Field) -> str:
+        return f'{value.to_ascii()};'
+
+    def _tokens_compact(self, data: DictStrAny, sep: str, binary: bool) -> t.Iterator[t.Union[memoryview, str]]:
+        for ith, (key, value) in enumerate(data.items()):
+            if ith:
+                yield sep
+            yield self.key(key)
+            yield ' '
+            if isinstance(value, dict):
+                yield '{'
+                yield from self._tokens_compact(value, ' ', binary)
+                yield '}'
+            elif isinstance(value, Field):
+                yield from value.tokens(binary)
+                yield ';'
+            elif isinstance(value, list):
+                yield '('
+                if self._is_scalars(value):
+                    yield from self._join(value, ' ', '', '')
+                else:
+                    for jth, element in enumerate(value):
+                        head, element = self._head(element)
+                        if jth:
+                            yield ' '
+                        if head is not None:
+                            yield f'{head} '
+                        yield '{'
+                        yield from self._tokens_compact(element, ' ', binary)
+                        yield '}'
+                yield ');'
+            else:
+                yield self.value(value)
+
+    def _tokens_pretty(self, data: DictStrAny, tab: str, pad: str, binary: bool) -> t.Iterator[t.Union[memoryview, str]]:
+        inner = pad + tab
+        for key, value in data.items():
+            key = self.key(key)
+            if isinstance(value, dict):
+                yield f'{pad}{key}\n{pad}{{\n'
+                yield from self._tokens_pretty(value, tab, inner, binary)
+                yield f'{pad}}}\n'
+            elif isinstance(value, Field):
+                yield f'{pad}{key} '
+                yield from value.tokens(binary)
+                yield ';\n'
+            elif isinstance(value, list) and value:
+                yield f'{pad}{key}\n{pad}(\n'
+                if self._is_scalars(value):
+                    yield from self._join(value, '\n'+inner, inner, '\n')
+                else:
+                    for element in value:
+                        head, element = self._head(element)
+                        yield f'{inner}{{\n' if head is None else f'{inner}{head}\n{inner}{{\n'
+                        yield from self._tokens_pretty(element, tab, inner+tab, binary)
+                        yield f'{inner}}}\n'
+                yield f'{pad});\n'
+            else:
+                yield f'{pad}{key} {self.value(value)}\n'
+
+    def _join(self, value: ListAny, sep: str, prefix: str, suffix: str) -> t.Iterator[str]:
+        '''Join list elements in chunks to bound the size of intermediate strings'''
+        for ith in range(0, len(value), self.chunk):
+            yield prefix if ith==0 else sep
+            yield sep.join(map(str, value[ith:ith+self.chunk]))
+        if value:
+            yield suffix
+
+    def _head(self, element: DictStrAny) -> t.Tuple[t.Optional[str], DictStrAny]:
+        head = tuple(k for k, v in element.items() if v is None)
+        if head:
+            element_cloned = element.copy()
+            element_cloned.pop(head[0])
+            return head[0], element_cloned
+        else:
+            return None, element
+
+    def _is_scalars(self, value: ListAny) -> bool:
+        if not value or isinstance(value[0], (str, int, float)):
+            return True
+        elif isinstance(value[0], dict):
+            return False
+        else:
+            raise Exception(f'Unknown list "{value}"')
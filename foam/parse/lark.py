@@ -1,16 +1,23 @@
 __all__ = ['Lark']
 
 
+import concurrent.futures as cf
+import fnmatch
+import functools as f
+import mmap
 import os
 import pathlib as p
 import re
 import typing as t
 
 from ..base.lib import lark
-from ..base.type import DictStrAny, FoamItems, Path
+from ..base.type import Any, DictStrAny, FoamItems, Path
 from ..compat.functools import cached_property
 from ..util.function import deprecated_classmethod, grammar
-from ..util.implementation import Singleton
+from ..util.implementation import Base, Singleton
+from ..util.object.data import Data
+from ..util.object.field import Field
+from ..util.object.manifest import Manifest
 
 if t.TYPE_CHECKING:
     import typing_extensions as te
@@ -24,16 +31,37 @@ if t.TYPE_CHECKING:
 class Lark(Singleton):
     '''Lark is a parsing toolkit for Python
 
+    Example:
+        >>> lark = Lark.fromPath('cavity', workers=4, ignore=('processor*', '[1-9]*'))
+        >>> lark.parse()
+
+        >>> lark = Lark.fromPath('cavity', threshold=2**20)  # files larger than 1 MiB are referenced
+        >>> lark.parse()
+        >>> lark.static[0]['type']
+        ['path', 'lazy']
+
     TODO:
-        - unit-test (Lark, Foam.fromOpenFoam)
+        - unit-test (Foam.fromOpenFoam)
     '''
 
-    __slots__ = ('_root', '_embed', '_foam', '_static')
+    __slots__ = ('_root', '_embed', '_threshold', '_workers', '_ignore', '_foam', '_static')
     order = ['meta', 'foam', 'static', 'other']
+    directories = {'0', 'constant', 'system'}  # dictionaries outside are kept as static items
+    placeholder = '$__field{}__'  # WORD in grammar
+    sniff = 8192  # number of bytes used to detect text file
+    pattern_binary = re.compile(rb'\bformat\s+binary\s*;')
+    pattern_field = re.compile(rb'nonuniform\s+List<(%s)>\s+(\d+)\s*\(' % '|'.join(Field.components).encode())
 
-    def __init__(self, path: Path, embed: bool = True) -> None:
+    def __init__(
+        self,
+        path: Path, embed: bool = True, threshold: t.Optional[int] = None,
+        workers: t.Optional[int] = None, ignore: t.Tuple[str, ...] = (),
+    ) -> None:
         self._root = p.Path(path)
         self._embed = embed
+        self._threshold = threshold  # size above which embedded files become lazy references
+        self._workers = workers
+        self._ignore = (Manifest.name, '.cache', *ignore)  # globs of relative paths (`.cache` of `postprocess.cache.Cache`)
         # foam, static
         self._foam = {}
         self._static = []
@@ -60,21 +88,64 @@ class Lark(Singleton):
 
     @cached_property
     def lark(self) -> '_lark.Lark':
+        '''LALR parser, transforms the dictionary while parsing'''
+        return self.parser('lalr')
+
+    @cached_property
+    def earley(self) -> '_lark.Lark':
+        '''Earley parser, fallback for files that LALR fails on'''
+        return self.parser('earley')
+
+    @classmethod
+    @f.lru_cache(maxsize=None)
+    def parser(cls, name: str = 'lalr') -> '_lark.Lark':
+        '''Shared parser (the analysed LALR grammar is cached on disk)'''
         kwargs = {
-            'debug': False,
-            'cache': False,  # cache only works with parser='lalr' for now
-            'parser': 'earley', # or 'lalr'
-            'lexer': 'dynamic',  # Parser 'lalr' does not support lexer 'dynamic', expected one of ('basic', 'contextual')
-            'transformer': None,
-            'start': 'start',
-        }
-        return lark.Lark(grammar(), **kwargs)
+            'lalr': {
+                'cache': True,  # cache only works with parser='lalr' for now
+                'parser': 'lalr',
+                'lexer': 'contextual',
+                'transformer': Transformer.default(),
+            },
+            'earley': {
+                'cache': False,
+                'parser': 'earley',
+                'lexer': 'dynamic',  # Parser 'lalr' does not support lexer 'dynamic', expected one of ('basic', 'contextual')
+                'transformer': None,
+            },
+        }[name]
+        return lark.Lark(grammar(), debug=False, start='start', **kwargs)
+
+    def ignored(self, name: str) -> bool:
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in self._ignore)
+
+    def paths(self) -> t.List[p.Path]:
+        '''Files not ignored (ignored directories are not walked), sorted'''
+        ans = []
+        for directory, dirnames, filenames in os.walk(self._root):
+            relative = p.Path(directory).relative_to(self._root)
+            dirnames[:] = [d for d in dirnames if not self.ignored((relative/d).as_posix())]
+            ans.extend(
+                self._root / relative / filename
+                for filename in filenames if not self.ignored((relative/filename).as_posix())
+            )
+        return sorted(ans)
 
     def parse(self) -> None:
-        for path in self._root.rglob('*'):
-            if path.is_file():
-                # TODO: foam part
-                self._static.append(self._static_item(path))
+        '''Parse files (in process pool if `workers` is specified), document order does not depend on `workers`'''
+        paths = self.paths()
+        if self._workers is None:
+            self._collect(paths, map(self.item, paths))
+        else:
+            chunksize = max(1, len(paths)//(4*self._workers))
+            args = [(self._root, self._embed, self._threshold, path) for path in paths]
+            with cf.ProcessPoolExecutor(self._workers) as executor:  # shut down on errors as well
+                self._collect(paths, executor.map(_item, args, chunksize=chunksize))
+
+    def item(self, path: p.Path) -> t.Tuple[t.Optional[DictStrAny], t.Optional[DictStrAny]]:
+        '''Dictionary (foam part) or static item of file'''
+        data = self.parse_file(path)
+        return (None, self._static_item(path)) if data is None else (data, None)
 
     def parse_once(self) -> None:
         '''#pragma once'''
@@ -84,10 +155,95 @@ class Lark(Singleton):
     def parsed(self) -> bool:
         return bool(self._foam) or bool(self._static)
 
+    def parse_file(self, path: Path) -> t.Optional[DictStrAny]:
+        '''Parse OpenFOAM dictionary in `0`, `constant` or `system` (also of `processor*`), None if it can not be represented
+
+        Example:
+            >>> Lark.fromPath('cavity').parse_file('cavity/system/controlDict')['application']
+            'icoFoam'
+        '''
+        path = p.Path(path)
+        parts = path.relative_to(self._root).parts
+        if parts and parts[0].startswith('processor'):  # decomposed case
+            parts = parts[1:]
+        if len(parts) < 2 or parts[0] not in self.directories:
+            return None
+        try:
+            text, fields = self.split(path)
+        except (UnicodeDecodeError, OSError):
+            return None
+        if 'FoamFile' not in text:
+            return None
+        try:
+            data = self.parse_text(text)
+        except (lark.LarkError, Unsupported):
+            return None
+        if not isinstance(data.get('FoamFile', None), dict):
+            return None
+        return Transformer.replace(data, fields) if fields else data
+
+    def parse_text(self, text: str) -> DictStrAny:
+        '''LALR first, Earley only if LALR fails'''
+        try:
+            return self.lark.parse(text)
+        except lark.LarkError:
+            return Transformer.default().transform(self.earley.parse(text))
+
+    def split(self, path: Path) -> t.Tuple[str, t.List[Field]]:
+        '''Split OpenFOAM file into text and fields, binary blocks are read through memory map and replaced by placeholders
+
+        Example:
+            >>> text, fields = Lark.fromPath('cavity').split('cavity/0/U')
+            >>> text
+            'FoamFile {...} internalField $__field0__;'
+            >>> fields[0].array.shape
+            (400, 3)
+
+        Note:
+            - binary blocks are decoded with the scalar size and byte order of `arch` in header, and copied out of the map
+        '''
+        from ..app.postprocess.native import FoamFile
+
+        path = p.Path(path)
+        if path.stat().st_size == 0:
+            return '', []
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            if self.pattern_binary.search(buffer, 0, 4096) is None:  # header only
+                return buffer[:].decode(), []
+            dtype = FoamFile(buffer[:4096]).dtypes['scalar']
+            itemsize = int(dtype[2:])
+            parts, fields, cursor = [], [], 0
+            while True:
+                match = self.pattern_field.search(buffer, cursor)
+                if match is None:
+                    break
+                field = Field.fromBuffer(buffer, match.group(1).decode(), int(match.group(2)), offset=match.end(), dtype=dtype)
+                field = Field(field.array.astype(Field.dtype), field.type)  # copy, the map is closed on return
+                end = match.end() + field.array.size*itemsize
+                if buffer[end:end+1] != b')':
+                    raise Exception(f'Binary block is not terminated: {path}')
+                parts.append(buffer[cursor:match.start()].decode())
+                parts.append(self.placeholder.format(len(fields)))
+                fields.append(field)
+                cursor = end + 1
+            parts.append(buffer[cursor:].decode())
+        return ''.join(parts), fields
+
     def to_foam_data(self) -> FoamItems:
         self.parse_once()
         return [getattr(self, o) for o in self.order]
 
+    def _collect(
+        self,
+        paths: t.List[p.Path], items: t.Iterable[t.Tuple[t.Optional[DictStrAny], t.Optional[DictStrAny]]],
+    ) -> None:
+        foam = Data.fromDict(self._foam)
+        for path, (data, static) in zip(paths, items):
+            if data is None:
+                self._static.append(static)
+            else:
+                foam[path.relative_to(self._root).parts] = data
+
     def _openfoam(self) -> str:
         '''OpenFOAM Version'''
         pattern = re.compile(r'^(OpenFOAM-)([\d.x]+)$')
@@ -99,18 +255,148 @@ class Lark(Singleton):
 
     def _static_item(self, path: p.Path) -> DictStrAny:
         name = path.relative_to(self._root).as_posix()
-        permission = oct(path.stat().st_mode)[-3:]
-        if self._embed:
-            data = path.read_bytes()
+        stat = path.stat()
+        permission = oct(stat.st_mode)[-3:]
+        if not self._embed:
+            return {'name': name, 'type': ['path', 'raw'], 'permission': permission, 'data': path.as_posix()}
+        if self._threshold is not None and stat.st_size > self._threshold:
+            return {
+                'name': name, 'type': ['path', 'lazy'], 'permission': permission, 'data': path.as_posix(),
+                'size': stat.st_size, 'mtime': stat.st_mtime_ns,
+            }
+        data = path.read_bytes()
+        if self._is_text(data[:self.sniff]):
             try:
-                data = data.decode()
+                return {'name': name, 'type': ['embed', 'text'], 'permission': permission, 'data': data.decode()}
             except UnicodeDecodeError:
-                type = ['embed', 'binary']
-            else:
-                type = ['embed', 'text']
-        else:
-            data = path.as_posix()
-            type = ['path', 'raw']
-        return {'name': name, 'type': type, 'permission': permission, 'data': data}
+                pass
+        return {'name': name, 'type': ['embed', 'binary'], 'permission': permission, 'data': data}
+
+    def _is_text(self, prefix: bytes) -> bool:
+        '''UTF-8 without NUL (a multi-byte character may be truncated at the end of prefix)'''
+        if b'\0' in prefix:
+            return False
+        try:
+            prefix.decode()
+        except UnicodeDecodeError as e:
+            return e.reason == 'unexpected end of data' and e.start >= len(prefix)-3
+        return True
 
     from_path = deprecated_classmethod(fromPath)
+
+
+def _item(args: t.Tuple[p.Path, bool, t.Optional[int], p.Path]) -> t.Tuple[t.Optional[DictStrAny], t.Optional[DictStrAny]]:
+    '''Worker of process pool (parser is created once per process)'''
+    root, embed, threshold, path = args
+    return Lark.new(root, embed=embed, threshold=threshold).item(path)
+
+
+class Transformer(Base):
+    '''Transform parse tree into the dictionary of `Foam` (rule names in grammar)
+
+    Example:
+        >>> Transformer.default().transform(Lark.parser('earley').parse('a (b {c d;});'))
+        {'a': [{'b': None, 'c': 'd'}]}
+
+    Note:
+        - Instances are plain callbacks, no dependency on `lark.Transformer`
+        - Values with single token are converted to numbers, others are joined by space
+    '''
+
+    __slots__ = ()
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls()
+
+    @classmethod
+    def replace(cls, data: Any, fields: t.List[Field]) -> Any:
+        '''Replace placeholders (see `Lark::split`) with fields'''
+        if isinstance(data, dict):
+            return {key: cls.replace(value, fields) for key, value in data.items()}
+        if isinstance(data, list):
+            return [cls.replace(value, fields) for value in data]
+        if isinstance(data, str) and data.startswith('$__field'):
+            return fields[int(data[8:-2])]
+        return data
+
+    def transform(self, tree: '_lark.Tree') -> Any:
+        '''Transform tree created by parser without transformer (Earley)'''
+        if isinstance(tree, lark._().Tree):
+            return getattr(self, tree.data)(list(map(self.transform, tree.children)))
+        return tree
+
+    def start(self, children: t.List[t.Tuple[str, Any]]) -> DictStrAny:
+        return dict(children)
+
+    def dictionary(self, children: t.List[t.Any]) -> t.Tuple[str, DictStrAny]:
+        return children[0], dict(children[1:])
+
+    def entry(self, children: t.List[t.Any]) -> t.Tuple[str, Any]:
+        return children[0], self._scalar_or_list(children[1:])
+
+    def directive(self, children: t.List[t.Any]) -> t.NoReturn:
+        raise Unsupported(f'Directive "{children[0]}" is not supported')
+
+    def key(self, children: t.List['_lark.Token']) -> str:
+        key = str(children[0])
+        return key[1:-1] if key.startswith('"') else key
+
+    def list(self, children: t.List[t.Any]) -> 'List':
+        return List(children)
+
+    def dimension(self, children: t.List[t.Any]) -> str:
+        return f'[{" ".join(map(self._string, children))}]'
+
+    def anonymous(self, children: t.List[t.Tuple[str, Any]]) -> DictStrAny:
+        return dict(children)
+
+    def _scalar_or_list(self, children: t.List[t.Any]) -> Any:
+        if not children:
+            return ''
+        if len(children) > 1:
+            return ' '.join(map(self._string, children))
+        child = children[0]
+        if isinstance(child, List):
+            return self._items(child)
+        if getattr(child, 'type', None) == 'NUMBER':
+            return self._number(child)
+        return str(child)
+
+    def _items(self, children: 'List') -> t.List[Any]:
+        if not any(isinstance(child, dict) for child in children):
+            return list(map(self._string, children))
+        # list of dictionaries, e.g. boundary in blockMeshDict
+        ans, head = [], None
+        for child in children:
+            if isinstance(child, dict):
+                ans.append(child if head is None else {head: None, **child})
+                head = None
+            elif head is None and getattr(child, 'type', None) == 'WORD':
+                head = str(child)
+            else:
+                raise Unsupported(f'Unknown list item "{child}"')
+        if head is not None:
+            raise Unsupported(f'Unknown list item "{head}"')
+        return ans
+
+    def _number(self, token: str) -> t.Union[int, float]:
+        try:
+            return int(token)
+        except ValueError:
+            return float(token)
+
+    def _string(self, child: t.Any) -> str:
+        if isinstance(child, List):
+            return f'({" ".join(map(self._string, child))})'
+        if isinstance(child, dict):
+            raise Unsupported('Dictionary can only be a list item')
+        return str(child)
+
+
+class Unsupported(Exception):
+    '''Content that is valid OpenFOAM syntax but can not be represented as dictionary (file is kept as static item)'''
+
+
+class List(list):
+    '''Parenthesized list in parse tree (distinguished from `list` returned by `Transformer::_list`)'''
@@ -14,6 +14,7 @@ from ..util.function import deprecated_classmethod
 from ..util.implementation import Base
 from ..util.object.conversion import Conversion
 from ..util.object.data import Data
+from ..util.object.manifest import Manifest
 
 if t.TYPE_CHECKING:
     import typing_extensions as te
@@ -61,6 +62,22 @@ class Static(Base):
     def fromFoam(cls, foam: 'Foam') -> 'te.Self':
         return cls(foam)
 
+    def digest(self, static: DictStrAny) -> str:
+        '''Content hash of static item (size and modification time for referenced paths)'''
+        types = static.get('type', [])
+        parts = [static['name'], ' '.join(types), str(static.get('permission', None))]
+        if types == ['path', 'lazy']:
+            parts.append(static.get('hash', None) or f'{static["size"]} {static["mtime"]}')
+        elif types and types[0] == 'path':
+            in_ = self._in(static['data'])
+            for path in (sorted(in_.rglob('*')) if in_.is_dir() else [in_]):
+                if path.is_file():
+                    stat = path.stat()
+                    parts.append(f'{path.as_posix()} {stat.st_size} {stat.st_mtime_ns}')
+        else:
+            parts.append(static.get('data', None) or '')
+        return Manifest.digest(*parts)
+
     @match.register()
     def _(self, static: DictStrAny) -> None:
         # do nothing
@@ -74,7 +91,7 @@ class Static(Base):
     @match.register('embed', 'binary')
     def _(self, static: DictStrAny) -> None:
         out = self._out(static['name'])
-        out.write_bytes(static['data'])
+        self._foam._write(out, static['data'])
 
     @match.register('embed', '7z')
     def _(self, static: DictStrAny) -> None:
@@ -92,6 +109,16 @@ class Static(Base):
         else:
             raise Exception('Target is neither a file nor a directory')
 
+    @match.register('path', 'lazy')
+    def _(self, static: DictStrAny) -> None:
+        # keyed on size and modification time, content is hashed only if they changed and a hash is given
+        out, in_ = self._out(static['name']), self._in(static['data'])
+        stat = in_.stat()
+        if (stat.st_size, stat.st_mtime_ns) != (static['size'], static['mtime']) \
+                and ('hash' not in static or Manifest.digestFile(in_) != static['hash']):
+            raise Exception(f'Referenced file "{in_}" has changed')
+        self._foam._copy(out, in_, static.get('permission', None))
+
     @match.register('path', '7z')
     def _(self, static: DictStrAny) -> None:
         out, in_ = self._out(static['name']), self._in(static['data'])
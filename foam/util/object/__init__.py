@@ -1,4 +1,4 @@
-__all__ = ['conversion', 'data', 'option', 'popen', 'result', 'version']
+__all__ = ['conversion', 'data', 'field', 'manifest', 'option', 'popen', 'result', 'version']
 
 
-from . import conversion, data, option, popen, result, version
+from . import conversion, data, field, manifest, option, popen, result, version
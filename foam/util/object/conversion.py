@@ -1,6 +1,7 @@
 __all__ = ['Conversion']
 
 
+import functools as f
 import json
 import pathlib as p
 import pickle
@@ -33,11 +34,15 @@ class Conversion(Base):
         - 3
         c:
             '4': 5
+
+    Note:
+        - `fromPath` caches parsed documents (keyed on path, modification time, size and loader), every call returns a fresh copy
     '''
 
     __slots__ = ('_document', )
     _alias = {'pkl': 'pickle', 'yml': 'yaml'}
     _types = {'json', 'pickle', 'toml', 'yaml'}
+    _cacheable = {'json', 'yaml'}  # documents of builtin types only
 
     def __init__(self, document: Document) -> None:
         self._document = document
@@ -81,10 +86,19 @@ class Conversion(Base):
         return cls.fromBytes(text.encode(), type, all)
 
     @classmethod
-    def fromPath(cls, path: Path, all: bool = False, type: t.Optional[str] = None) -> 'te.Self':
+    def fromPath(
+        cls,
+        path: Path, all: bool = False, type: t.Optional[str] = None, cache: bool = True,
+    ) -> 'te.Self':
         path = p.Path(path)
         type_or_suffix = path.suffix if type is None else type  # type or path.suffix
-        return cls.fromBytes(path.read_bytes(), type_or_suffix, all)
+        type = cls.typeFromSuffix(type_or_suffix)
+        if not cache or type not in cls._cacheable:
+            return cls.fromBytes(path.read_bytes(), type_or_suffix, all)
+        stat = path.stat()
+        loader = yaml.Loader.__name__ if type == 'yaml' else ''
+        key = (path.resolve().as_posix(), stat.st_mtime_ns, stat.st_size, type, all, loader)
+        return cls.fromPickle(cls._cached(*key))  # unpickling is a cheap deep copy
 
     @classmethod
     def fromJSON(cls, text: str) -> 'te.Self':
@@ -103,6 +117,12 @@ class Conversion(Base):
         document = list(yaml.load_all(text)) if all else yaml.load(text)
         return cls(document)
 
+    @classmethod
+    @f.lru_cache(maxsize=64)
+    def _cached(cls, path: str, mtime: int, size: int, type: str, all: bool, loader: str) -> bytes:
+        document = cls.fromBytes(p.Path(path).read_bytes(), type, all).to_document()
+        return pickle.dumps(document, protocol=pickle.HIGHEST_PROTOCOL)
+
     @classmethod
     def typeFromSuffix(self, type_or_suffix: str) -> str:
         type = type_or_suffix.lstrip('.')
@@ -1,13 +1,14 @@
 __all__ = ['Data']
 
 
+import copy
 import pathlib as p
 import typing as t
 
 from .conversion import Conversion
 from ..function import deprecated_classmethod
 from ..implementation import Base
-from ...base.type import Any, DictStrAny, FoamItem, Func0, Keys, ListAny, Path
+from ...base.type import Any, DictAny2, DictStrAny, FoamItem, Func0, Keys, ListAny, Path, TupleSeq
 
 if t.TYPE_CHECKING:
     import typing_extensions as te
@@ -16,6 +17,9 @@ if t.TYPE_CHECKING:
     Args, Kwargs = te.ParamSpecArgs(P), te.ParamSpecKwargs(P)
 
 
+Owned = DictAny2  # trie of keys, containers on these paths are not shared with other cases, `None` if nothing below is shared (see `Foam::copy`)
+
+
 class Data(Base):
     '''Multi-key dictionary or list (not recommended)
 
@@ -37,12 +41,16 @@ class Data(Base):
         ('left', 'y') []
         ('right', 'x') []
         ('right', 'y') [{Ellipsis}]
+
+    Note:
+        - `owned` enables copy-on-write (see `Foam::copy`): assignment copies the containers on the path that are not owned, nested containers are copied on read (plain `dict` or `list` that is not shared)
     '''
 
-    __slots__ = ('_data', )
+    __slots__ = ('_data', '_owned')
 
-    def __init__(self, data: FoamItem) -> None:
+    def __init__(self, data: FoamItem, owned: t.Optional[Owned] = None) -> None:
         self._data = data
+        self._owned = owned
 
     def __contains__(self, keys: Keys[Any]) -> bool:
         if isinstance(keys, tuple):
@@ -59,6 +67,11 @@ class Data(Base):
             return self._data.__contains__(keys)
 
     def __getitem__(self, keys: Keys[Any]) -> Any:
+        if self._owned is not None and not isinstance(keys, list):
+            if isinstance(keys, slice):
+                return [self.__getitem__(ith) for ith in range(len(self._data))[keys]]
+            ans, path = _resolve(self._data, keys if isinstance(keys, tuple) else (keys, ))
+            return self._own(path) if path and isinstance(ans, (dict, list)) else ans
         if isinstance(keys, tuple):
             ans = self._data
             for key in keys:
@@ -74,18 +87,19 @@ class Data(Base):
         if isinstance(keys, tuple):
             assert keys
 
-            ans = self._data
+            ans, owned = self._data, self._owned
             for key in keys[:-1]:
                 if isinstance(ans, dict):
-                    ans = ans.setdefault(key, {})
-                elif isinstance(ans, list):
-                    ans = ans[key]
-                else:
+                    ans.setdefault(key, {})
+                elif not isinstance(ans, list):
                     raise Exception(f'Unknown type "{type(ans).__name__}"')
-            ans[keys[-1]] = value
+                ans, owned = _own(ans, key, owned)
+            _assign(ans, keys[-1], value, owned)
         elif isinstance(keys, list):
             # TODO: throw DeprecationWarning
             self.__setitem__(tuple(keys), value)
+        elif self._owned is not None:
+            self.__setitem__((keys, ), value)
         else:
             self._data[keys] = value
 
@@ -105,8 +119,8 @@ class Data(Base):
         return self._data.__str__()
 
     @classmethod
-    def fromAny(cls, data: FoamItem) -> 'te.Self':
-        return cls(data)
+    def fromAny(cls, data: FoamItem, owned: t.Optional[Owned] = None) -> 'te.Self':
+        return cls(data, owned)
 
     @classmethod
     def fromDict(cls, data: t.Optional[DictStrAny] = None) -> 'te.Self':
@@ -199,7 +213,9 @@ class Data(Base):
 
     def get(self, key: Any, default: t.Optional[Any] = None) -> Any:
         # TODO: retained due to compatibility needs
-        if isinstance(self._data, dict):
+        if self._owned is not None:
+            return self.gets(key, default=default)
+        elif isinstance(self._data, dict):
             return self._data.get(key, default)
         elif isinstance(self._data, list):
             try:
@@ -217,6 +233,10 @@ class Data(Base):
 
     def setdefault(self, key: Any, default: t.Optional[Any] = None) -> Any:
         # TODO: retained due to compatibility needs
+        if self._owned is not None:
+            if key not in self._data:
+                self.__setitem__(key, default)
+            return self.__getitem__(key)
         return self._data.setdefault(key, default)
 
     def set_default(self, *keys: 'Args', default: t.Optional[Any] = None) -> 'te.Self':
@@ -229,6 +249,18 @@ class Data(Base):
             self.__setitem__(keys, value)
         return self
 
+    def _own(self, path: TupleSeq[Any]) -> FoamItem:
+        '''Container at path (copy-on-write), copied deeply unless nothing below is shared'''
+        assert self._owned is not None and path
+
+        ans, owned = self._data, self._owned
+        for key in path[:-1]:
+            ans, owned = _own(ans, key, owned)
+        if owned is not None and owned.get(path[-1], {}) is not None:
+            ans[path[-1]] = copy.deepcopy(ans[path[-1]])
+            owned[path[-1]] = None
+        return ans[path[-1]]
+
     def items(self, with_list: bool = False) -> t.Iterator[t.Tuple[Keys[Any], Any]]:
         yield from self._items(self._data, with_list=with_list)
 
@@ -251,3 +283,36 @@ class Data(Base):
     from_list = deprecated_classmethod(fromList)
     from_list_length = deprecated_classmethod(fromListLength)
     load_from_path = deprecated_classmethod(loadFromPath)
+
+
+def _resolve(data: FoamItem, keys: TupleSeq[Any]) -> t.Tuple[Any, TupleSeq[Any]]:
+    '''Value at keys and keys with list indices made non-negative'''
+    path = []
+    for key in keys:
+        if isinstance(data, list):
+            key = range(len(data))[key]
+        data = data[key]
+        path.append(key)
+    return data, tuple(path)
+
+
+def _own(parent: FoamItem, key: Any, owned: t.Optional[Owned]) -> t.Tuple[Any, t.Optional[Owned]]:
+    '''Child of owned container, copied first if it is shared with other cases'''
+    if isinstance(parent, list):
+        key = range(len(parent))[key]
+    child = parent[key]
+    if owned is None:
+        return child, None
+    if key not in owned:
+        if isinstance(child, (dict, list)):
+            child = parent[key] = child.copy()
+        owned[key] = {}
+    return child, owned[key]
+
+
+def _assign(container: FoamItem, key: Any, value: Any, owned: t.Optional[Owned]) -> None:
+    if isinstance(container, list):
+        key = range(len(container))[key]
+    container[key] = value
+    if owned is not None:
+        owned.pop(key, None)  # assigned value may be shared
@@ -0,0 +1,114 @@
+__all__ = ['Field']
+
+
+import typing as t
+
+from ..implementation import Base
+from ...base.lib import numpy
+
+if t.TYPE_CHECKING:
+    import typing_extensions as te
+
+    import numpy as _numpy
+
+
+class Field(Base):
+    '''Nonuniform OpenFOAM field (`List<scalar>`, `List<vector>`, ...) backed by NumPy array
+
+    Example:
+        >>> field = Field.fromArray(numpy.zeros((2, 3)))
+        >>> field.type, field.size
+        ('vector', 2)
+        >>> print(''.join(field.tokens(binary=False)))
+        nonuniform List<vector> 2((0.0 0.0 0.0) (0.0 0.0 0.0))
+
+    Reference:
+        - https://github.com/OpenFOAM/OpenFOAM-7/blob/master/src/OpenFOAM/containers/Lists/UList/UListIO.C
+    '''
+
+    __slots__ = ('_array', '_type')
+    chunk = 4096  # number of elements formatted at a time
+    dtype = '<f8'  # arch "LSB;label=32;scalar=64"
+    components = {'scalar': 1, 'vector2D': 2, 'vector': 3, 'symmTensor': 6, 'tensor': 9}
+
+    def __init__(self, array: '_numpy.ndarray', type: t.Optional[str] = None) -> None:
+        self._array = array
+        self._type = type or self.typeFromShape(array.shape)
+
+    def __eq__(self, other: t.Any) -> bool:
+        if isinstance(other, Field):
+            return self._type == other._type and self._array.shape == other._array.shape and bool((self._array == other._array).all())
+        return NotImplemented
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return f'Field({self._array!r}, {self._type!r})'
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls.fromArray([])
+
+    @classmethod
+    def fromArray(cls, array: t.Any, type: t.Optional[str] = None) -> 'te.Self':
+        return cls(numpy.ascontiguousarray(array, dtype=cls.dtype), type)
+
+    @classmethod
+    def fromBuffer(cls, buffer: t.Any, type: str, size: int, offset: int = 0, dtype: t.Optional[str] = None) -> 'te.Self':
+        '''Zero-copy view of binary block (bytes, mmap, ...), `dtype` of scalar in `arch` of header'''
+        number = cls.components[type]
+        array = numpy.frombuffer(buffer, dtype=dtype or cls.dtype, count=size*number, offset=offset)
+        return cls(array if number == 1 else array.reshape(size, number), type)
+
+    @classmethod
+    def typeFromShape(cls, shape: t.Tuple[int, ...]) -> str:
+        if len(shape) == 1:
+            return 'scalar'
+        for type, number in cls.components.items():
+            if len(shape) == 2 and shape[1] == number:
+                return type
+        raise Exception(f'Unknown shape "{shape}"')
+
+    @property
+    def array(self) -> '_numpy.ndarray':
+        return self._array
+
+    @property
+    def type(self) -> str:
+        return self._type
+
+    @property
+    def size(self) -> int:
+        return self._array.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.size * self.components[self._type] * 8
+
+    def tokens(self, binary: bool = False) -> t.Iterator[t.Union[memoryview, str]]:
+        '''Binary block (raw little-endian doubles) or ASCII list, without the trailing semicolon'''
+        if binary:
+            yield f'nonuniform List<{self._type}> {self.size}\n('
+            yield memoryview(numpy.ascontiguousarray(self._array, dtype=self.dtype)).cast('B')
+            yield ')'
+        else:
+            yield f'nonuniform List<{self._type}> {self.size}('
+            for ith in range(0, self.size, self.chunk):
+                rows = self._array[ith:ith+self.chunk].tolist()
+                if ith:
+                    yield ' '
+                if self._array.ndim == 1:
+                    yield ' '.join(map(repr, rows))
+                else:
+                    yield ' '.join(f'({" ".join(map(repr, row))})' for row in rows)
+            yield ')'
+
+    def to_ascii(self) -> str:
+        return ''.join(self.tokens(binary=False))
+
+    def to_bytes(self) -> bytes:
+        return b''.join(
+            token.encode() if isinstance(token, str) else token.tobytes()
+            for token in self.tokens(binary=True)
+        )
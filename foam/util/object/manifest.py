@@ -0,0 +1,148 @@
+__all__ = ['Manifest']
+
+
+import hashlib
+import json
+import os
+import pathlib as p
+import shutil
+import threading
+import typing as t
+
+from ..implementation import Base
+from ...base.type import DictStr2, DictStrAny, DictStrFloat, ListAny, ListStr, Path
+
+if t.TYPE_CHECKING:
+    import typing_extensions as te
+
+
+class Manifest(Base):
+    '''Content hashes of the files written by `Foam::save` (one manifest per destination)
+
+    Example:
+        >>> manifest = Manifest.fromPath('case')
+        >>> manifest.record('system/controlDict', Manifest.digest('...'))
+        True
+        >>> manifest.written
+        ['system/controlDict']
+        >>> manifest.dump()
+
+    Note:
+        - size and modification time of each file are recorded as well, files edited on disk after saving count as changed
+    '''
+
+    __slots__ = ('_root', '_old', '_new', '_written', '_skipped', '_removed', '_timings')
+    name = '.manifest.json'
+
+    def __init__(self, root: Path, data: t.Optional[DictStrAny] = None) -> None:
+        self._root = p.Path(root)
+        self._old: DictStrAny = data or {}
+        self._new: DictStr2 = {}
+        self._written: ListStr = []
+        self._skipped: ListStr = []
+        self._removed: ListStr = []
+        self._timings: DictStrFloat = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._new
+
+    def __getitem__(self, name: str) -> str:
+        return self._new[name]
+
+    def __repr__(self) -> str:
+        return f'Manifest({self._root!r}, {self._new!r})'
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        return cls('.')
+
+    @classmethod
+    def fromPath(cls, root: Path) -> 'te.Self':
+        '''Load manifest of previous save, empty if it does not exist or is broken'''
+        path = p.Path(root) / cls.name
+        try:
+            data = json.loads(path.read_text())
+        except (FileNotFoundError, ValueError):
+            data = {}
+        return cls(root, data if isinstance(data, dict) else {})
+
+    @classmethod
+    def digest(cls, *contents: t.Union[bytes, str]) -> str:
+        sha = hashlib.sha256()
+        for content in contents:
+            sha.update(content.encode() if isinstance(content, str) else content)
+            sha.update(b'\0')
+        return sha.hexdigest()
+
+    @classmethod
+    def digestFile(cls, path: Path, chunk: int = 2**20) -> str:
+        '''Content hash of file, read in chunks (bounded memory)'''
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(chunk), b''):
+                sha.update(block)
+        return sha.hexdigest()
+
+    @property
+    def root(self) -> p.Path:
+        return self._root
+
+    @property
+    def written(self) -> ListStr:
+        return self._written
+
+    @property
+    def skipped(self) -> ListStr:
+        return self._skipped
+
+    @property
+    def removed(self) -> ListStr:
+        return self._removed
+
+    @property
+    def timings(self) -> DictStrFloat:
+        '''Seconds spent rendering and writing each file'''
+        return self._timings
+
+    def changed(self, name: str, digest: str) -> bool:
+        old = self._old.get(name, None)
+        if not isinstance(old, dict) or old.get('digest', None) != digest:  # new, or manifest of older version
+            return True
+        return old.get('stat', None) != self._stat(name)
+
+    def record(self, name: str, digest: str, written: bool = True, seconds: float = 0.0) -> bool:
+        self._new[name] = digest
+        self._timings[name] = seconds
+        (self._written if written else self._skipped).append(name)
+        return written
+
+    def orphans(self, names: t.Iterable[str]) -> ListStr:
+        '''Names recorded by the previous save but no longer part of the case'''
+        return sorted(self._old.keys()-set(names))
+
+    def remove(self, names: t.Iterable[str]) -> ListStr:
+        for name in names:
+            path = self._root / name
+            if path.is_dir():
+                shutil.rmtree(path)
+            elif path.exists():
+                path.unlink()
+            self._removed.append(name)
+        return self._removed
+
+    def dump(self) -> p.Path:
+        '''Dump manifest atomically (temporary file plus rename)'''
+        path = self._root / self.name
+        temp = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        data = {name: {'digest': digest, 'stat': self._stat(name)} for name, digest in self._new.items()}
+        temp.write_text(json.dumps(data, indent=4, sort_keys=True))
+        temp.replace(path)
+        return path
+
+    def _stat(self, name: str) -> t.Optional[ListAny]:
+        '''Size and modification time of file, `None` if it does not exist'''
+        try:
+            stat = (self._root/name).stat()
+        except FileNotFoundError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
@@ -1,4 +1,4 @@
-__all__ = ['case', 'email', 'end', 'figure', 'iterator', 'timer']
+__all__ = ['case', 'email', 'end', 'figure', 'iterator', 'sweep', 'timer']
 
 
-from . import case, email, end, figure, iterator, timer
+from . import case, email, end, figure, iterator, sweep, timer
@@ -65,6 +65,9 @@ class CaseBase(abc.ABC):
         [0, 0]
         [0, 0]
         [0, 0]
+
+    Note:
+        - use `Sweep` to materialize and run variants in parallel
     '''
 
     __slots__ = ('_foam', '_kwargs', '_optional', '_required')
@@ -0,0 +1,151 @@
+__all__ = ['Sweep']
+
+
+import concurrent.futures as cf
+import itertools
+import json
+import os
+import pathlib as p
+import typing as t
+
+from .case import CaseBase, CaseParameter
+from ..implementation import Base
+from ..object.data import Data
+from ...base.type import DictStrAny, ListInt, Path
+
+if t.TYPE_CHECKING:
+    import typing_extensions as te
+
+    P = te.ParamSpec('P')
+    Kwargs = te.ParamSpecKwargs(P)
+
+
+class Sweep(Base):
+    '''Parameter sweep of `CaseBase` (materialized in parallel, run by a core-bounded scheduler)
+
+    Example:
+        >>> sweep = Sweep.fromGrid(CaseCavity.new(t=0.3, dt=0.005), 'case', t=[0.3, 0.4, 0.5], dt=[0.005, 0.0025])
+        >>> sweep.save(workers=4)
+        >>> sweep.run(cores=8)  # cases that completed successfully are skipped
+        {'case/0': [0, 0], 'case/1': [0, 0], ...}
+
+    Note:
+        - parameters known by `CaseBase::required` are required, others are optional
+        - each case occupies `Foam::number_of_processors` cores while running
+    '''
+
+    __slots__ = ('_template', '_root', '_parameters', '_cases')
+    meta = 'meta.json'  # CaseParameter
+    done = '.done.json'  # CaseParameter and return codes of successful run
+
+    def __init__(self, template: CaseBase, root: Path, parameters: t.List[DictStrAny]) -> None:
+        self._template = template
+        self._root = p.Path(root)
+        self._parameters = parameters
+        self._cases: t.Dict[p.Path, CaseBase] = {}
+
+    def __len__(self) -> int:
+        return len(self._parameters)
+
+    @classmethod
+    def default(cls) -> 'te.Self':
+        raise NotImplementedError
+
+    @classmethod
+    def fromGrid(cls, template: CaseBase, root: Path, **grid: t.Iterable[t.Any]) -> 'te.Self':
+        '''Cartesian product of parameter values'''
+        keys = list(grid)
+        parameters = [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+        return cls(template, root, parameters)
+
+    @classmethod
+    def fromSamples(cls, template: CaseBase, root: Path, samples: t.Iterable[DictStrAny]) -> 'te.Self':
+        '''Parameter samples, e.g. Latin hypercube'''
+        return cls(template, root, list(samples))
+
+    @property
+    def paths(self) -> t.List[p.Path]:
+        return [self._root/str(ith) for ith in range(len(self._parameters))]
+
+    @property
+    def parameters(self) -> t.List[DictStrAny]:
+        return self._parameters
+
+    def case(self, ith: int) -> CaseBase:
+        required = self._template.parameter.required
+        parameter = self._parameters[ith]
+        return self._template \
+            .copy(deepcopy=False) \
+            .set_required(**{k: v for k, v in parameter.items() if k in required}) \
+            .set_optional(**{k: v for k, v in parameter.items() if k not in required})
+
+    def completed(self, path: p.Path, parameter: CaseParameter) -> bool:
+        '''Case ran successfully with the same parameter'''
+        try:
+            done = Data.loadFromPath(path, self.done, type='json').to_dict()
+        except (FileNotFoundError, ValueError):
+            return False
+        return done.get('parameter', None) == self._normalize(parameter)
+
+    def save(self, workers: t.Optional[int] = None) -> 'te.Self':
+        '''Materialize cases (in thread pool if `workers` is specified), completed cases are not overwritten'''
+        indices = range(len(self._parameters))
+        if workers is None:
+            list(map(self._save, indices))
+        else:
+            with cf.ThreadPoolExecutor(workers) as executor:
+                list(executor.map(self._save, indices))
+        return self
+
+    def run(self, cores: t.Optional[int] = None, **kwargs: 'Kwargs') -> t.Dict[str, ListInt]:
+        '''Run cases concurrently with at most `cores` processes (keyword arguments of `Command::all_run`)'''
+        budget = cores or os.cpu_count() or 1
+        kwargs = {'overwrite': True, **kwargs}
+        ans: t.Dict[str, ListInt] = {}
+        pending = []
+        for ith, path in enumerate(self.paths):
+            if path not in self._cases:
+                self._save(ith)
+            if path in self._cases:
+                pending.append(path)
+            else:
+                ans[path.as_posix()] = Data.loadFromPath(path, self.done, type='json')['codes']
+        with cf.ThreadPoolExecutor(max(1, min(budget, len(pending)))) as executor:
+            running: t.Dict[cf.Future, t.Tuple[p.Path, int]] = {}
+            free = budget
+            while pending or running:
+                for path in list(pending):  # first fit, smaller cases fill in the gaps
+                    need = min(budget, max(1, int(self._cases[path].foam.number_of_processors)))
+                    if need <= free:
+                        pending.remove(path)
+                        free -= need
+                        running[executor.submit(self._run, path, kwargs)] = (path, need)
+                finished, _ = cf.wait(running, return_when=cf.FIRST_COMPLETED)
+                for future in finished:
+                    path, need = running.pop(future)
+                    free += need
+                    ans[path.as_posix()] = future.result()
+        return {path.as_posix(): ans[path.as_posix()] for path in self.paths}
+
+    def _save(self, ith: int) -> None:
+        path = self.paths[ith]
+        case = self.case(ith)
+        if self.completed(path, case.parameter):
+            return
+        case.save(path)
+        case.parameter.dump_to_path(path, self.meta)
+        self._cases[path] = case
+
+    def _run(self, path: p.Path, kwargs: DictStrAny) -> ListInt:
+        case, done = self._cases[path], path/self.done
+        if done.exists():
+            done.unlink()
+        codes = case.foam.cmd.all_run(**kwargs)
+        if all(code == 0 for code in codes):
+            Data.fromDict({'parameter': self._normalize(case.parameter), 'codes': codes}) \
+                .dump(path/self.done, type='json')
+        return codes
+
+    def _normalize(self, parameter: CaseParameter) -> DictStrAny:
+        '''Same representation as loaded from JSON'''
+        return json.loads(json.dumps(parameter._asdict()))
@@ -0,0 +1,35 @@
+import io
+import random
+
+from foam.namespace.full import Timer
+from foam.parse.case import Case
+
+
+def data(n: int) -> dict:
+    '''Large `blockMeshDict` vertices and `setFieldsDict` regions'''
+    return {
+        'vertices': [f'({random.random()} {random.random()} {random.random()})' for _ in range(n)],
+        'regions': [
+            {'boxToCell': None, 'box': '(0 0 0) (1 1 1)', 'fieldValues': [f'volScalarFieldValue alpha.water {ith}' for ith in range(n//1000)]},
+            {'boxToCell': None, 'box': '(1 1 1) (2 2 2)', 'fieldValues': {'nested': {'values': list(range(n))}}},
+        ],
+    }
+
+
+repeat = 5
+
+case = Case.default()
+timer = Timer.default()
+for n in [10**5, 10**6]:
+    document = data(n)
+    for ith in range(repeat):
+        with timer.tic_toc(n, 'join', ith):
+            '\n'.join(case.data(document))
+        with timer.tic_toc(n, 'dumps', ith):
+            case.dumps(document)
+        with timer.tic_toc(n, 'dump', ith), io.StringIO() as f:
+            case.dump(document, f)
+        with timer.tic_toc(n, 'indent', ith):
+            case.dumps(document, indent=4)
+    for method in ['join', 'dumps', 'dump', 'indent']:
+        print(f'{n:>8} {method:>6} {min(timer[n, method, ith] for ith in range(repeat)):.4f}s')
@@ -0,0 +1,53 @@
+'''Throughput of `Lark` over OpenFOAM tutorials (files per second)
+
+Example:
+    $ python script/bench/dictionary.py $FOAM_TUTORIALS
+'''
+import os
+import pathlib as p
+import sys
+
+from foam.namespace.full import Timer
+from foam.parse.lark import Lark, Transformer
+
+
+root = p.Path(sys.argv[1] if len(sys.argv) > 1 else os.environ['FOAM_TUTORIALS'])
+paths = [
+    path for path in root.rglob('*')
+    if path.is_file() and path.relative_to(root).parts[-2:-1] and path.stat().st_size < 2**20
+]
+lark, transformer = Lark.fromPath(root), Transformer.default()
+texts = []
+for path in paths:
+    try:
+        text = path.read_text()
+    except UnicodeDecodeError:
+        continue
+    if 'FoamFile' in text:
+        texts.append(text)
+
+timer = Timer.default()
+count = {'lalr': 0, 'earley': 0, 'fallback': 0}
+with timer.tic_toc('lalr'):
+    for text in texts:
+        try:
+            lark.lark.parse(text)
+            count['lalr'] += 1
+        except Exception:
+            pass
+with timer.tic_toc('fallback'):
+    for text in texts:
+        try:
+            lark.parse_text(text)
+            count['fallback'] += 1
+        except Exception:
+            pass
+with timer.tic_toc('earley'):
+    for text in texts[:200]:  # Earley is too slow for the whole tree
+        try:
+            transformer.transform(lark.earley.parse(text))
+            count['earley'] += 1
+        except Exception:
+            pass
+for name, number in [('lalr', len(texts)), ('fallback', len(texts)), ('earley', min(200, len(texts)))]:
+    print(f'{name:>8} {count[name]:>6}/{number:<6} {number/timer[name]:>10.1f} files/s')
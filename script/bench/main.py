@@ -1,48 +1,208 @@
+'''Benchmarks of library hot paths on synthetic cases (no OpenFOAM installation required)
+
+Example:
+    $ WM_PROJECT_VERSION=7 python script/bench/main.py --repeat 9 --warmup 2
+    $ WM_PROJECT_VERSION=7 python script/bench/main.py --select 'vtk.*' --threshold 0.05
+
+Note:
+    - each benchmark runs `warmup` + `repeat` times, warmup runs are discarded, median and IQR are reported
+    - summaries are stored in history file (`--history`) keyed by git commit ("-dirty" if working tree is modified)
+    - regression: median slower than baseline (previous commit in history, or `--baseline`) by more than `threshold`, exit code is 1
+    - benchmarks depending on missing optional packages (e.g. vtkmodules) are skipped
+'''
+import argparse
+import datetime
+import fnmatch
 import json
 import os
 import pathlib as p
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
 import typing as t
 
-from foam.namespace.full import Foam, Timer
-
-
-def is_valid(foam: Foam, threshold: t.Optional[int] = None) -> bool:
-    threshold = threshold or os.cpu_count()
-    if foam.number_of_processors == 1:
-        return True
-    elif foam.number_of_processors > threshold:
-        return False
-    else:
-        for static in foam['static']:
-            if static['name'] == 'Allrun':
-                break
-        else:
-            return False
-        return 'runParallel' in static['data']
-
-
-repeat = 7
-n_time = 19
-
-bench = {}
-timer = Timer.default()
-root = p.Path('extra', 'tutorial', 'tutorials', os.environ['WM_PROJECT_VERSION'])
-for path in root.rglob('*.yaml'):
-    foam = Foam.fromPath(path).save(f'case/{path.stem}')
-    control = foam['foam']['system', 'controlDict']
-    if control['startFrom']=='startTime' and control['stopAt']=='endTime' and is_valid(foam, 4):
-        key = path.as_posix()
-        bench[key] = [[None, None] for _ in range(repeat)]
-        control['endTime'] = float(control['startTime']) + n_time*float(control['deltaT'])
-        for ith in range(repeat):
-            for jth, func in enumerate([
-                lambda: foam.cmd.raw('./Allrun'),
-                lambda: foam.cmd.all_run(),
-            ]):
-                foam.cmd.all_clean()
-                with timer.tic_toc(key, ith, jth) as t:
-                    func()
-                bench[key][ith][jth] = float(t)
-                print(path, float(t))
-with open('bench.json', 'w') as f:
-    json.dump(bench, f)
+from foam.namespace.full import Conversion, Data, Foam, Timer, VTK
+from foam.parse.case import Case
+from foam.parse.lark import Lark
+from foam.util.object.field import Field
+
+
+Bench = t.Callable[[], t.Any]
+Setup = t.Callable[[p.Path, int], Bench]
+
+
+def document(n: int) -> dict:
+    '''Large `blockMeshDict` vertices and `setFieldsDict` regions'''
+    return {
+        'vertices': [f'({random.random()} {random.random()} {random.random()})' for _ in range(n)],
+        'regions': [
+            {'boxToCell': None, 'box': '(0 0 0) (1 1 1)', 'fieldValues': [f'volScalarFieldValue alpha.water {ith}' for ith in range(n//1000)]},
+            {'boxToCell': None, 'box': '(1 1 1) (2 2 2)', 'fieldValues': {'nested': {'values': list(range(n))}}},
+        ],
+    }
+
+
+def case(n: int) -> Foam:
+    '''Cavity with nonuniform internal fields of n cells'''
+    foam = Foam.fromDemo('cavity', verbose=False)
+    foam['foam']['0', 'U', 'internalField'] = Field.fromArray([[random.random() for _ in range(3)] for _ in range(n)])
+    foam['foam']['0', 'p', 'internalField'] = Field.fromArray([random.random() for _ in range(n)])
+    return foam
+
+
+def vtk(path: p.Path, n: int) -> p.Path:
+    '''Legacy VTK unstructured grid of n x n x 1 hexahedra, fields as written by `foamToVTK`'''
+    points = [(i/n, j/n, k*0.1) for k in range(2) for j in range(n+1) for i in range(n+1)]
+    index = lambda i, j, k: k*(n+1)**2 + j*(n+1) + i
+    cells = [
+        (index(i, j, 0), index(i+1, j, 0), index(i+1, j+1, 0), index(i, j+1, 0), index(i, j, 1), index(i+1, j, 1), index(i+1, j+1, 1), index(i, j+1, 1))
+        for j in range(n) for i in range(n)
+    ]
+    centres = [((i+0.5)/n, (j+0.5)/n, 0.05) for j in range(n) for i in range(n)]
+    lines = ['# vtk DataFile Version 2.0', 'synthetic', 'ASCII', 'DATASET UNSTRUCTURED_GRID', f'POINTS {len(points)} float']
+    lines += [' '.join(map(str, point)) for point in points]
+    lines += [f'CELLS {len(cells)} {9*len(cells)}'] + [' '.join(map(str, (8, *cell))) for cell in cells]
+    lines += [f'CELL_TYPES {len(cells)}'] + ['12'] * len(cells)
+    lines += [f'CELL_DATA {len(cells)}', 'FIELD attributes 5']
+    lines += [f'cellID 1 {len(cells)} int'] + [str(ith) for ith in range(len(cells))]
+    lines += [f'C 3 {len(cells)} float'] + [' '.join(map(str, centre)) for centre in centres]
+    lines += [f'V 1 {len(cells)} float'] + [str(0.1/n**2)] * len(cells)
+    lines += [f'p 1 {len(cells)} float'] + [str(random.random()) for _ in cells]
+    lines += [f'U 3 {len(cells)} float'] + [f'{random.random()} {random.random()} 0' for _ in cells]
+    lines += [f'POINT_DATA {len(points)}', 'FIELD attributes 2']
+    lines += [f'p 1 {len(points)} float'] + [str(random.random()) for _ in points]
+    lines += [f'U 3 {len(points)} float'] + [f'{random.random()} {random.random()} 0' for _ in points]
+    path.write_text('\n'.join(lines)+'\n')
+    return path
+
+
+def setup_yaml(root: p.Path, n: int) -> Bench:
+    path = root / 'document.yaml'
+    Data.fromList([document(n)]).dump(path, type='yaml')  # one YAML document
+    return lambda: Conversion.fromPath(path, all=True, cache=False)
+
+
+def setup_save(root: p.Path, n: int) -> Bench:
+    foam = case(n)
+    return lambda: foam.save(root/'save')
+
+
+def setup_case(root: p.Path, n: int) -> Bench:
+    data, case = document(n), Case.default()
+    return lambda: '\n'.join(case.data(data))
+
+
+def setup_lark(root: p.Path, n: int) -> Bench:
+    case(n).save(root/'lark')
+    return lambda: Lark(root/'lark').parse()
+
+
+def setup_vtk(root: p.Path, n: int) -> Bench:
+    path = vtk(root/'case.vtk', n)
+    return lambda: VTK.fromPath(path)
+
+
+def setup_probes(root: p.Path, n: int) -> Bench:
+    mesh = VTK.fromPath(vtk(root/'probes.vtk', n))
+    locations = [(random.random(), random.random(), 0.05) for _ in range(100)]
+    return lambda: mesh.probes(*locations, keys={'p', 'U'})
+
+
+def setup_centroids(root: p.Path, n: int) -> Bench:
+    mesh = VTK.fromPath(vtk(root/'centroids.vtk', n))
+    return lambda: mesh.centroids({'p'})  # z-component of synthetic U is zero (degenerate weights)
+
+
+benches: t.Dict[str, t.Tuple[Setup, int]] = {
+    'yaml.load': (setup_yaml, 10**5),
+    'foam.save': (setup_save, 10**5),
+    'case.data': (setup_case, 10**5),
+    'lark.parse': (setup_lark, 10**4),
+    'vtk.fromPath': (setup_vtk, 100),
+    'vtk.probes': (setup_probes, 100),
+    'vtk.centroids': (setup_centroids, 100),
+}
+
+
+def commit() -> str:
+    try:
+        sha = subprocess.check_output(['git', 'rev-parse', 'HEAD'], text=True, stderr=subprocess.DEVNULL).strip()
+        dirty = subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{sha}-dirty' if dirty else sha
+
+
+def summary(times: t.List[float]) -> t.Dict[str, float]:
+    q1, _, q3 = statistics.quantiles(times, n=4) if len(times) > 1 else (times[0], None, times[0])
+    return {'median': statistics.median(times), 'iqr': q3-q1, 'min': min(times), 'n': len(times)}
+
+
+def measure(name: str, setup: Setup, n: int, repeat: int, warmup: int) -> t.Optional[t.Dict[str, float]]:
+    root = p.Path(tempfile.mkdtemp(prefix='bench-'))
+    timer = Timer.default()
+    try:
+        bench = setup(root, n)
+        for ith in range(warmup+repeat):
+            with timer.tic_toc(ith):
+                bench()
+    except ImportError as e:  # optional dependency
+        print(f'{name:<16} skipped ({e.__class__.__name__}: {str(e).splitlines()[0]})')
+        return None
+    finally:
+        shutil.rmtree(root)
+    return summary([timer[ith] for ith in range(warmup, warmup+repeat)])
+
+
+def regressions(
+    results: t.Dict[str, t.Dict[str, float]], baseline: t.Dict[str, t.Dict[str, float]], threshold: float,
+) -> t.Dict[str, float]:
+    '''Relative slowdown of medians beyond threshold'''
+    ans = {}
+    for name, result in results.items():
+        if name in baseline:
+            ratio = result['median']/baseline[name]['median'] - 1
+            if ratio > threshold:
+                ans[name] = ratio
+    return ans
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks of library hot paths with regression tracking')
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--threshold', type=float, default=0.1, help='relative slowdown flagged as regression')
+    parser.add_argument('--select', default='*', help='fnmatch pattern of benchmark names')
+    parser.add_argument('--history', default='bench.json')
+    parser.add_argument('--baseline', default=None, help='commit to compare with (default: previous commit in history)')
+    args = parser.parse_args()
+    os.environ.setdefault('WM_PROJECT_VERSION', '7')
+
+    path, key = p.Path(args.history), commit()
+    history = json.loads(path.read_text()) if path.exists() else {}
+    results = {}
+    for name, (setup, n) in benches.items():
+        if fnmatch.fnmatch(name, args.select):
+            result = measure(name, setup, n, args.repeat, args.warmup)
+            if result is not None:
+                results[name] = result
+                print(f'{name:<16} median {result["median"]:.4f}s  IQR {result["iqr"]:.4f}s  (n={n})')
+    previous = [commit for commit in history if commit != key]
+    baseline = args.baseline or (previous[-1] if previous else None)
+    old = history.pop(key, {})  # latest run of a commit goes last
+    history[key] = {
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': {**old.get('results', {}), **results},
+    }
+    path.write_text(json.dumps(history, indent=4))
+    if baseline is not None and baseline in history:
+        flagged = regressions(results, history[baseline]['results'], args.threshold)
+        for name, ratio in flagged.items():
+            print(f'REGRESSION {name}: {ratio:+.1%} vs {baseline[:12]}')
+        sys.exit(1 if flagged else 0)
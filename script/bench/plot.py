@@ -1,29 +1,31 @@
+'''Median (IQR as error bar) of each benchmark over history written by `main.py`
+
+Example:
+    $ python script/bench/plot.py bench.json
 '''
-{
-    "extra/tutorial/tutorials/7/combustion/XiEngineFoam/kivaTest.yaml": [
-        [6.067416335456073, 6.059840555302799],
-        [6.1161600118502975, 6.008307630196214],
-        [5.987000908702612, 6.0543485432863235],
-        [6.09351275768131, 6.01447874493897],
-        [6.02929066028446, 6.012912446632981],
-        [6.1631866386160254, 6.035926444455981],
-        [5.987829647958279, 6.058706551790237]
-    ]
-}
-'''
+import sys
+
 from foam.namespace.full import Conversion, Figure
 
 
-data = Conversion.fromPath('bench.json').to_document()
-times = []
-for key, value in data.items():
-    t1, t2 = map(list, zip(*value))
-    times.append(sum(t1)/len(t1) - sum(t2)/len(t2))
+history = Conversion.fromPath(sys.argv[1] if len(sys.argv) > 1 else 'bench.json').to_document()
+commits = list(history)
+names = sorted({name for entry in history.values() for name in entry['results']})
 
-Figure \
+figure = Figure \
     .setRcParams(('axes.unicode_minus', False)) \
-    .new(figsize=(8, 6)) \
-    .mpl.hist(times) \
-    .mpl.set(xlabel='Time (seconds)', title='$t_{shell}-t_{python}$') \
+    .new(figsize=(8, 6))
+for name in names:
+    xs, ys, es = [], [], []
+    for ith, commit in enumerate(commits):
+        result = history[commit]['results'].get(name, None)
+        if result is not None:
+            xs.append(ith)
+            ys.append(result['median'])
+            es.append(result['iqr']/2)
+    figure.mpl.errorbar(xs, ys, yerr=es, label=name, marker='o', capsize=3)
+figure \
+    .mpl.set(xlabel='Commit', ylabel='Time (seconds)', yscale='log', xticks=range(len(commits)), xticklabels=[c[:7] for c in commits]) \
+    .mpl.legend() \
     .mpl.grid() \
-    .save('demo.png')
+    .save('bench.png')
@@ -0,0 +1,36 @@
+'''Time and memory per variant of `Foam::copy` (deep copy vs copy-on-write)
+
+Example:
+    $ python script/bench/variant.py
+'''
+import tracemalloc
+
+from foam import Foam
+from foam.namespace.full import Timer
+from foam.util.object.field import Field
+
+
+def large(cells: int) -> Foam:
+    '''Cavity with large embedded mesh and nonuniform field'''
+    foam = Foam.fromDemo('cavity', verbose=False)
+    foam['static'].data.append({'name': 'constant/polyMesh/points', 'type': ['embed', 'binary'], 'data': bytes(24*cells)})
+    foam['foam']['0', 'p', 'internalField'] = Field.fromArray([0.0]*cells)
+    return foam
+
+
+number = 100
+
+timer = Timer.default()
+for name, foam in [('cavity', Foam.fromDemo('cavity', verbose=False)), ('large', large(10**6))]:
+    for cow in [False, True]:
+        tracemalloc.start()
+        with timer.tic_toc(name, cow):
+            variants = []
+            for ith in range(number):
+                variant = foam.copy(cow=cow)
+                variant['foam']['system', 'controlDict', 'endTime'] = ith
+                variants.append(variant)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del variants
+        print(f'{name:>8} cow={cow!s:<5} {timer[name, cow]/number*1e3:>10.4f} ms/variant {memory/number/2**10:>12.1f} KiB/variant')
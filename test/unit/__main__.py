@@ -3,6 +3,7 @@ import unittest
 from app import *
 from base import *
 from parse import *
+from util import *
 
 
 if __name__ == '__main__':
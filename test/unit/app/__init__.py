@@ -1,6 +1,6 @@
-__all__ = ['Test4Command', 'Test4Information', 'Test4PostProcess']
+__all__ = ['Test4Command', 'Test4Information', 'Test4PostProcess', 'Test4PostProcessArrays']
 
 
 from .command import Test as Test4Command
 from .information import Test as Test4Information
-from .postprocess import Test as Test4PostProcess
+from .postprocess import Test as Test4PostProcess, TestArrays as Test4PostProcessArrays
@@ -1,11 +1,20 @@
 __all__ = ['Test']
 
 
+import asyncio
+import os
 import pathlib as p
 import shutil
+import signal
+import time
+import typing as t
 import unittest
 
 from foam import Foam
+from foam.app.command.adapter import Apps, Default
+from foam.app.command.criterion import Budget, Residual
+from foam.app.command.monitor import Monitor
+from foam.base.type import ListInt
 from foam.util.decorator import suppress
 
 
@@ -44,6 +53,163 @@ class Test(unittest.TestCase):
         with self.assertRaises(Exception):
             self._foam.cmd.all_run(overwrite=False, exception=True)
 
+    @suppress.stdout.decorator_without_previous
+    def test_run_schedule(self) -> None:
+        commands = [
+            {'command': 'sleep 0.5', 'suffix': '.1', 'depends_on': []},
+            {'command': 'sleep 0.5', 'suffix': '.2', 'depends_on': [], 'name': 'second'},
+            {'command': 'false', 'depends_on': [0, 'second']},
+        ]
+        timer = time.perf_counter()
+        codes = self._foam.cmd.run(commands, overwrite=True, unsafe=True, cores=2)
+        self.assertListEqual(codes, [0, 0, 1])
+        self.assertLess(time.perf_counter()-timer, 0.9)
+        with self.assertRaises(Exception):
+            self._foam.cmd.run([{'command': 'true', 'depends_on': [1]}], overwrite=True, cores=2)
+
+    @suppress.stdout.decorator_without_previous
+    def test_arun(self) -> None:
+        async def main() -> t.List[ListInt]:
+            return await asyncio.gather(*(
+                self._foam.cmd.arun(['sleep 0.5', 'true'], suffix=f'.{ith}', overwrite=True)
+                for ith in range(4)
+            ))
+
+        timer = time.perf_counter()
+        self.assertListEqual(asyncio.run(main()), [[0, 0]]*4)
+        self.assertLess(time.perf_counter()-timer, 1.5)
+        self.assertTrue((self._foam.destination/'log.sleep.3').exists())
+        timer = time.perf_counter()
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(self._foam.cmd.arun(['sleep 5'], overwrite=True, timeout=0.2))
+        self.assertLess(time.perf_counter()-timer, 2.0)
+
+    @suppress.stdout.decorator_without_previous
+    def test_run_log(self) -> None:
+        expected = ''.join(f'{ith}\n' for ith in range(1, 200001)).encode()
+        for direct in [False, True]:
+            codes = self._foam.cmd.run(['seq 1 200000'], overwrite=True, direct=direct)
+            self.assertListEqual(codes, [0])
+            self.assertEqual((self._foam.destination/'log.seq').read_bytes(), expected)
+
+    def test_step(self) -> None:
+        class Recorder(Default):
+            __slots__ = ('lines', )
+
+            def __init__(self) -> None:
+                self.lines = []
+
+            def feed(self, lines: bytes) -> None:
+                self.lines.append(lines)
+
+        app, rest = Recorder(), b''
+        for chunk in [b'Time = 1\nCou', b'rant\n', b'', b'Time = 2']:
+            rest = self._foam.cmd._step(app, rest, chunk)
+        self._foam.cmd._step(app, rest, b'', final=True)
+        self.assertListEqual(app.lines, [b'Time = 1\n', b'Courant\n', b'Time = 2'])
+
+    @suppress.stderr.decorator_without_previous
+    def test_adapter(self) -> None:
+        with Apps['icoFoam'](self._foam) as app:
+            app.interval = 60.0  # throttled after the first update
+            app.feed(b'Time = 0.1\nCourant Number mean: 0\n')
+            app.feed(b'  Time = 0.2\nTime = 0.3\nExecutionTime = 1 s\n')
+            self.assertEqual(app._new, 0.3)
+            self.assertEqual(app.pbar.n, 0.1)
+        self.assertEqual(app.pbar.n, 0.3)
+        with Apps['decomposePar'](self._foam) as app:
+            self.assertEqual(app.now(b'Processor 0\nTime = 1\nProcessor 3\nProcessor 4 faces\n'), 3)
+
+    @suppress.stdout.decorator_without_previous
+    def test_monitor(self) -> None:
+        step = (
+            'Time = {time}\n\nCourant Number mean: 0.1 max: {time}\n'
+            'smoothSolver:  Solving for Ux, Initial residual = 1, Final residual = 1e-06, No Iterations 19\n'
+            'DICPCG:  Solving for p, Initial residual = 0.5, Final residual = 5e-07, No Iterations 35\n'
+            'time step continuity errors : sum local = 5e-09, global = -1e-19, cumulative = -2e-19\n'
+            'DICPCG:  Solving for p, Initial residual = 0.25, Final residual = 1e-07, No Iterations 34\n'
+            'time step continuity errors : sum local = 4e-09, global = -1e-19, cumulative = -3e-19\n'
+            'ExecutionTime = {time} s  ClockTime = 0 s\n\n'
+        )
+        path = self._foam.destination / 'sample'
+        path.write_text('Starting time loop\n\n'+''.join(step.format(time=ith/10) for ith in range(1, 301)))
+        codes = self._foam.cmd.run([{'command': 'cat sample', 'monitor': True}, 'true'], overwrite=True)
+        self.assertListEqual(codes, [0, 0])
+        self.assertNotIn('log.true', self._foam.cmd.monitors)
+        monitor = self._foam.cmd.monitors['log.cat']
+        self.assertSetEqual(set(monitor.keys()), {
+            'CourantMean', 'CourantMax', 'Ux', 'UxFinalRes', 'UxIters', 'p', 'pFinalRes', 'pIters',
+            'p_1', 'pFinalRes_1', 'pIters_1', 'contLocal', 'contGlobal', 'contCumulative',
+            'contLocal_1', 'contGlobal_1', 'contCumulative_1', 'executionTime', 'clockTime',
+        })
+        self.assertEqual(monitor['p_1'].shape, (300, 2))
+        self.assertEqual(monitor['contLocal_1'].shape, (300, 2))
+        self.assertListEqual(monitor['pIters'][-1].tolist(), [30.0, 35.0])
+        self.assertTrue((monitor['executionTime'][:, 0] == monitor['executionTime'][:, 1]).all())
+        self.assertEqual(monitor.time, 30.0)
+        for key, value in Monitor.fromPath(path).to_dict().items():
+            self.assertTrue((value == monitor[key]).all())
+        path.unlink()
+
+    @suppress.stdout.decorator_without_previous
+    def test_criteria(self) -> None:
+        path, control = self._foam.destination/'solver', self._foam.destination/'system'/'controlDict'
+        path.write_text(
+            '#!/bin/sh\n'
+            'i=0\n'
+            'for r in 1 0.1 0.01 0.001 0.0001 0.00001 0.000001 0.0000001 0.00000001 0.000000001; do\n'
+            '  i=$((i+1)); echo "Time = $i"\n'
+            '  echo "smoothSolver:  Solving for Ux, Initial residual = $r, Final residual = 0, No Iterations 1"\n'
+            '  sleep 0.1; grep -q writeNow system/controlDict && exit 0\n'
+            'done\n'
+            'exit 1\n'
+        )
+        path.chmod(0o755)
+        original = control.read_bytes()
+        step = {'command': './solver', 'monitor': True}
+        self.assertListEqual(self._foam.cmd.run([step], overwrite=True, criteria=[Residual(1e-4)]), [0])
+        monitor = self._foam.cmd.monitors['log.solver']
+        self.assertTrue(monitor.reason.startswith('Residual'))
+        self.assertLess(monitor.time, 10)
+        self.assertEqual(control.read_bytes(), original)
+        step.update(signal=signal.SIGTERM)
+        self.assertListEqual(self._foam.cmd.run([step], overwrite=True, criteria=[Budget(0.2)]), [-signal.SIGTERM])
+        self.assertTrue(self._foam.cmd.monitors['log.solver'].reason.startswith('Budget'))
+        path.unlink()
+
+    @suppress.stdout.decorator_without_previous
+    def test_stats(self) -> None:
+        self._foam.cmd.run(['sleep 0.5', {'command': 'seq 1 100000', 'direct': True}], overwrite=True)
+        stats = self._foam.cmd.stats
+        self.assertEqual(stats['log.sleep']['command'], 'sleep 0.5')
+        self.assertGreaterEqual(stats['log.sleep']['wall'], 0.5)
+        self.assertGreater(stats['log.sleep']['maxrss'], 0)
+        self.assertGreaterEqual(stats['log.sleep']['processes'], 1)
+        self.assertEqual(stats['log.seq']['code'], 0)
+        self.assertSetEqual(set(stats['log.seq']), {'command', 'log', 'code', 'start', 'wall', 'user', 'sys', 'maxrss', 'read_bytes', 'write_bytes', 'processes'})
+        self.assertNotIn(self._foam.destination/self._foam.cmd.record, self._foam.cmd.logs)
+
+    def test_times(self) -> None:
+        root = self._foam.destination
+        names = ['0.10', '0.2', '0.3', '0.4', '0.5', '1e-1x']
+        for name in names:
+            (root/name).mkdir()
+            (root/'processor1'/name).mkdir(parents=True)
+        self.assertListEqual(self._foam.cmd.times, [0.0, 0.1, 0.2, 0.3, 0.4, 0.5])
+        self.assertListEqual(self._foam.cmd.processors, [1])
+        self.assertListEqual(self._foam.cmd.select(0.1, 0.45, stride=2), [0.1, 0.3])
+        self.assertListEqual(self._foam.cmd.select(start=0.3, processor=1), [0.3, 0.4, 0.5])
+        self.assertEqual(self._foam.cmd.directory(0.1), root/'0.10')
+        with self.assertRaises(KeyError):
+            self._foam.cmd.directory(0.15)
+        old = root.stat().st_mtime_ns - 10**10
+        os.utime(root, ns=(old, old))
+        self.assertIs(self._foam.cmd._scan(root), self._foam.cmd._scan(root))
+        (root/'0.6').mkdir()  # modification time changes
+        self.assertEqual(self._foam.cmd.times[-1], 0.6)
+        for name in names + ['0.6', 'processor1']:
+            shutil.rmtree(root/name)
+
     def test_all_clean(self) -> None:
         self._foam.cmd.all_clean()
         self.assertSetEqual(self._foam.cmd.logs, set())
@@ -1,10 +1,17 @@
 import pathlib as p
 import shutil
+import tempfile
 import unittest
 
 import numpy as np
 
 from foam import Foam
+from foam.app.postprocess.cache import Cache
+from foam.app.postprocess.core import PostProcess, VTK
+from foam.app.postprocess.native import FoamFile, Native
+from foam.app.postprocess.sample import Topology, line
+from foam.app.postprocess.spatial import Grid
+from foam.app.postprocess.stream import Steps
 from foam.util.decorator import suppress
 
 
@@ -77,3 +84,143 @@ class Test(unittest.TestCase):
                 self.assertIsInstance(key, str)
                 self.assertIsInstance(value, np.ndarray)
                 self.assertIn(len(value.shape), {1, 2})
+
+    def test_vtk_probes(self) -> None:
+        vtk = self._foam.post.vtks[-1]
+        locations = [tuple(cell) for cell in vtk.cells[:10]]
+        grid = vtk.probes(*locations, keys={'p'}, point=False)
+        brute = vtk.probes(*locations, keys={'p'}, point=False, func=lambda x: np.square(x).sum(axis=1))
+        self.assertDictEqual(grid, brute)
+
+    def test_vtk_interpolate(self) -> None:
+        vtk = self._foam.post.vtks[-1]
+        values = vtk.interpolate(vtk.cells[:10], keys={'p', 'U'}, scheme='cell')
+        self.assertTrue(np.allclose(values['p'], vtk.cell_fields['p'][:10]))
+        self.assertEqual(values['U'].shape, (10, 3))
+        values = self._foam.post.interpolate(line((0, 0.05, 0.005), (0.1, 0.05, 0.005), 20), keys={'p'})
+        self.assertEqual(values['p'].shape, (len(self._foam.post.vtks), 20))
+
+    def test_postprocess_cube(self) -> None:
+        vtks = self._foam.post.vtks
+        cube = self._foam.post.cube('U')
+        self.assertEqual(cube.shape, (len(vtks), *vtks[0].cell_fields['U'].shape))
+        self.assertTrue(np.allclose(cube[-1], vtks[-1].cell_fields['U']))
+        self.assertEqual(self._foam.post.average('p').shape, (len(vtks), ))
+        for time, vtk in zip(self._foam.post.times, vtks):
+            self.assertTrue(np.allclose(self._foam.post.centroid('p')[time], vtk.centroid('p')))
+
+    def test_native(self) -> None:
+        vtk = self._foam.post.vtks[-1]
+        native = Native.fromPath(self._foam.cmd.directory(self._foam.post.times[-1]), foam=self._foam)
+        for key in ['C', 'V', 'p', 'U']:
+            self.assertTrue(np.allclose(native.cell_fields[key], vtk.cell_fields[key], rtol=1e-5, atol=1e-12))
+
+
+class TestArrays(unittest.TestCase):
+    '''Test for spatial index, topology, lazy time steps, native reader and cache (no OpenFOAM required)'''
+
+    def test_grid(self) -> None:
+        rng = np.random.default_rng(0)
+        for points in [rng.random((5000, 3)), rng.random((5000, 3))*[1, 1, 0], rng.random((20000, 3))*[1, 1, 1e-9], rng.normal(size=(2000, 3))**3, rng.random((1, 3))]:
+            locations = rng.random((500, 3))*3 - 1
+            indices = Grid.cached(points).nearest(locations)
+            expected = [np.square(points-location).sum(axis=1).min() for location in locations]
+            self.assertTrue(np.allclose(np.square(points[indices]-locations).sum(axis=1), expected))
+            self.assertLessEqual(np.prod(Grid.cached(points)._shape), 8*len(points)/Grid.density)
+        self.assertIs(Grid.cached(points.copy()), Grid.cached(points))
+
+    def test_topology(self) -> None:
+        rng = np.random.default_rng(0)
+        n = 8
+        index = lambda i, j, k: (i*(n+1)+j)*(n+1) + k
+        points = np.stack(np.meshgrid(*[np.arange(n+1)/n]*3, indexing='ij'), axis=-1).reshape(-1, 3)
+        inner = ((points > 0) & (points < 1)).all(axis=1)
+        points[inner] += (rng.random((inner.sum(), 3))-0.5) * 0.5/n
+        cells = np.array([
+            [index(i, j, k), index(i+1, j, k), index(i+1, j+1, k), index(i, j+1, k), index(i, j, k+1), index(i+1, j, k+1), index(i+1, j+1, k+1), index(i, j+1, k+1)]
+            for i in range(n) for j in range(n) for k in range(n)
+        ])
+        topology = Topology(points, np.arange(len(cells)+1)*8, cells.ravel(), np.full(len(cells), 12))
+        linear = lambda x: x @ [1.0, 2.0, 3.0] + 4.0
+        locations = np.concatenate([rng.random((1000, 3)), line((2, 2, 2), (3, 3, 3), 2)])
+        values = topology.locate(locations, scheme='cellPoint').apply(linear(points), linear(topology.centres))
+        self.assertTrue(np.allclose(values[:-2], linear(locations[:-2])))  # exact for linear fields
+        self.assertTrue(np.isnan(values[-2:]).all())
+        interpolation = topology.locate(locations, scheme='inverseDistance')
+        stacked = interpolation.apply(np.stack([linear(points), 2*linear(points)]), axis=1)
+        self.assertEqual(stacked.shape, (2, len(locations)))
+        self.assertTrue(np.allclose(stacked[1, :-2], 2*stacked[0, :-2]))
+        self.assertTrue(((stacked[0, :-2] >= linear(points).min()) & (stacked[0, :-2] <= linear(points).max())).all())
+        cells = topology.locate(locations, scheme='cell').cells
+        self.assertTrue((cells == interpolation.cells).all())
+        # static meshes share one topology across time steps
+        connectivity = topology.arrays
+        self.assertIs(Topology.cached(points.copy(), **connectivity), Topology.cached(points, **connectivity))
+        self.assertIsNot(Topology.cached(points+1.0, **connectivity), Topology.cached(points, **connectivity))
+
+    def test_steps(self) -> None:
+        loaded = []
+        loader = lambda path: loaded.append(path) or path.upper()
+        steps = Steps(list('abcdef'), [0.0, 0.1, 0.2, 0.3, 0.4, 0.5], loader, capacity=2, ahead=1)
+        self.assertEqual(len(steps), 6)
+        self.assertEqual(steps[-1], 'F')
+        self.assertEqual(loaded, ['f'])
+        self.assertEqual(steps.at(0.2), 'C')
+        self.assertRaises(KeyError, steps.at, 0.25)
+        self.assertRaises(IndexError, steps.__getitem__, 6)
+        self.assertEqual(list(steps[::2]), ['A', 'C', 'E'])
+        self.assertEqual(steps[1:3].times, [0.1, 0.2])
+        self.assertEqual(list(steps), list('ABCDEF'))
+        self.assertLessEqual(len(steps._cache), 2)
+
+    def test_foam_file(self) -> None:
+        header = b'FoamFile {version 2.0; format %s; arch "LSB;label=32;scalar=64"; class %s; object x;}\n// * * //\n'
+        file = FoamFile(header % (b'ascii', b'faceList') + b'2\n(\n4(0 1 2 3)\n3(4 5 6)\n)\n')
+        offsets, connectivity = file.faces()
+        self.assertListEqual(offsets.tolist(), [0, 4, 7])
+        self.assertListEqual(connectivity.tolist(), list(range(7)))
+        file = FoamFile(header % (b'binary', b'vectorField') + b'2\n(' + np.arange(6, dtype='<f8').tobytes() + b')')
+        self.assertListEqual(file.list().tolist(), [[0, 1, 2], [3, 4, 5]])
+        file = FoamFile(header % (b'ascii', b'volVectorField') + b'internalField nonuniform List<vector> 2((0 1 2) (3 4 5));')
+        self.assertListEqual(file.internal(2).tolist(), [[0, 1, 2], [3, 4, 5]])
+        file = FoamFile(header % (b'ascii', b'volScalarField') + b'internalField uniform 1e-3;')
+        self.assertListEqual(file.internal(2).tolist(), [1e-3, 1e-3])
+        file = FoamFile(header % (b'binary', b'labelList') + b'3{7}')
+        self.assertListEqual(file.list('label', 1).tolist(), [7, 7, 7])
+
+    def test_cache(self) -> None:
+        root = p.Path(tempfile.mkdtemp())
+        try:
+            source = root / 'VTK' / 'case_1.vtk'
+            source.parent.mkdir()
+            source.write_text('x')
+            arrays = {
+                'points': np.random.rand(4, 3), 'cell.p': np.random.rand(1), 'cell.C': np.random.rand(1, 3),
+                'topology.offsets': np.array([0, 4]), 'topology.connectivity': np.arange(4),
+                'topology.types': np.array([10]), 'topology.owners': np.array([0]),
+            }
+            Cache.fromPath(root).put(source, 0.5, arrays)
+            cache = Cache.fromPath(root)
+            self.assertDictEqual(cache.sources, {0.5: source})
+            vtk = VTK.fromArrays(cache.get(source))
+            self.assertIsInstance(vtk.cell_fields['p'], np.memmap)
+            self.assertTrue(np.array_equal(vtk.cells, arrays['cell.C']))
+            self.assertTrue(all(np.array_equal(value, arrays[key]) for key, value in vtk.to_arrays().items()))
+            source.write_text('xy')  # modified source
+            self.assertIsNone(Cache.fromPath(root).get(source))
+            Cache.fromPath(root).put(source, 0.5, arrays)
+            source.unlink()  # removed source, e.g. `foamToVTK` output deleted once cached
+            self.assertIn(source, Cache.fromPath(root))
+            # entries of other read modes or loader options do not match
+            directory = root / '0.5'
+            directory.mkdir()
+            variants = [PostProcess._variant(cls, kwargs) for cls, kwargs in [(Native, {'keys': {'p'}}), (Native, {}), (VTK, {})]]
+            self.assertEqual(PostProcess._variant(VTK, {'point': True, 'cell': True}), variants[-1])
+            Cache.fromPath(root, variant=variants[0]).put(directory, 0.5, {'cell.p': arrays['cell.p']})
+            self.assertDictEqual(Cache.fromPath(root, variant=variants[0]).sources, {0.5: directory})
+            for variant in variants[1:]:
+                cache = Cache.fromPath(root, variant=variant)
+                self.assertIsNone(cache.get(directory))
+                self.assertNotIn(0.5, cache.sources)
+        finally:
+            shutil.rmtree(root)
@@ -1,11 +1,16 @@
 __all__ = ['Test']
 
 
+import os
 import pathlib as p
 import shutil
 import unittest
 
+import yaml
+
+import foam
 from foam import Foam
+from foam.util.object.conversion import Conversion
 
 
 class Test(unittest.TestCase):
@@ -28,6 +33,64 @@ class Test(unittest.TestCase):
         foams = Foam.from_remote_demos(timeout=7.0, verbose=False)
         self.assertGreater(len(foams), 0)
 
+    def test_from_path_cache(self) -> None:
+        path = self._path.parent / 'cache.yaml'
+        shutil.copyfile(p.Path(foam.__file__).parent/'static'/'demo'/os.environ['WM_PROJECT_VERSION']/'cavity.yaml', path)
+        Conversion._cached.cache_clear()
+        foams = [Foam.fromPath(path, warn=False) for _ in range(3)]
+        self.assertEqual(Conversion._cached.cache_info().misses, 1)
+        foams[0]['foam']['system', 'controlDict', 'endTime'] = -1
+        self.assertNotEqual(foams[1]['foam']['system', 'controlDict', 'endTime'], -1)
+        path.write_text(path.read_text().replace('icoFoam', 'pisoFoam'))
+        self.assertEqual(Foam.fromPath(path, warn=False).application, 'pisoFoam')
+        self.assertEqual(Conversion._cached.cache_info().misses, 2)
+        path.unlink()
+
+    def test_copy_cow(self) -> None:
+        foam = Foam.fromDemo('cavity', verbose=False)
+        foam['static'].data.append({'name': 'payload', 'type': ['embed', 'binary'], 'data': bytes(1024)})
+        other = foam.copy(cow=True)
+        other['foam']['system', 'controlDict', 'endTime'] = 1.0
+        foam['foam']['constant', 'transportProperties', 'nu'] = '[0 2 -1 0 0 0 0] 0.02'
+        self.assertNotEqual(foam['foam']['system', 'controlDict', 'endTime'], 1.0)
+        self.assertEqual(other['foam']['constant', 'transportProperties', 'nu'], '[0 2 -1 0 0 0 0] 0.01')
+        # only the path from section to leaf is copied
+        self.assertIsNot(foam['foam'].data['system']['controlDict'], other['foam'].data['system']['controlDict'])
+        self.assertIs(foam['foam'].data['system']['fvSchemes'], other['foam'].data['system']['fvSchemes'])
+        self.assertIs(foam['static'][-1]['data'], other['static'][-1]['data'])
+        # chained indexing copies on read
+        control = other['foam']['system']['controlDict']
+        control['endTime'] = 77
+        other['foam']['system', 'fvSchemes']['ddtSchemes']['default'] = 'CrankNicolson 0.9'
+        other['static'][-1]['name'] = 'other'
+        other['static'].data.append({'name': 'appended', 'type': ['embed', 'text'], 'data': ''})
+        self.assertEqual(other['foam']['system', 'controlDict', 'endTime'], 77)
+        self.assertEqual(control['endTime'], 77)
+        self.assertNotEqual(foam['foam']['system', 'controlDict', 'endTime'], 77)
+        self.assertEqual(foam['foam']['system', 'fvSchemes', 'ddtSchemes', 'default'], 'Euler')
+        self.assertEqual(foam['static'][-1]['name'], 'payload')
+        self.assertEqual(len(foam['static'])+1, len(other['static']))
+        other['static'].data.pop()
+        # saving does not modify shared dictionaries
+        other.save(self._path)
+        self.assertListEqual(list(foam['foam']['0', 'U', 'FoamFile']), ['version', 'format', 'class', 'object'])
+        self.assertDictEqual(foam.copy()['foam'].data, foam['foam'].data)
+
+    def test_copy_cow_plain(self) -> None:
+        foam = Foam.fromDemo('cavity', verbose=False)
+        foam['other'].data['pipeline'] = ['blockMesh', {'command': 'icoFoam', 'suffix': '.ico'}]
+        other = foam.copy(cow=True)
+        for ith, case in enumerate([foam, other]):
+            case.save(self._path/f'cow{ith}')
+            self.assertListEqual(
+                [case.cmd._command(command)['command'] for command in case.pipeline],
+                ['blockMesh', 'icoFoam'],
+            )
+            self.assertIsInstance(case['foam']['system', 'controlDict'], dict)
+            text = yaml.safe_dump(case['foam']['system'])
+            self.assertDictEqual(yaml.safe_load(text)['controlDict'], case['foam']['system', 'controlDict'])
+            shutil.rmtree(self._path/f'cow{ith}')
+
     def test_data_meta(self) -> None:
         self.assertTrue(self._foam.data.is_list())
         self.assertTrue(self._foam.meta.is_dict())
@@ -61,3 +124,36 @@ class Test(unittest.TestCase):
 
     def test_save(self) -> None:
         self._foam.save(self._path)
+
+    def test_save_workers(self) -> None:
+        foam = self._foam.copy()
+        serial = {
+            name: (self._path/name).read_bytes()
+            for name in foam.save(self._path).manifest.written
+        }
+        parallel = {
+            name: (self._path/name).read_bytes()
+            for name in foam.save(self._path, workers=4).manifest.written
+        }
+        self.assertDictEqual(serial, parallel)
+        self.assertSetEqual(set(foam.manifest.timings), set(parallel))
+
+    def test_save_incremental(self) -> None:
+        foam = self._foam.copy()
+        foam.save(self._path, incremental=True)
+        foam.save(self._path, incremental=True)
+        self.assertListEqual(foam.manifest.written, [])
+        self.assertGreater(len(foam.manifest.skipped), 0)
+        content = (self._path/'system'/'controlDict').read_bytes()
+        (self._path/'system'/'controlDict').write_bytes(b'garbage')
+        foam.save(self._path, incremental=True)
+        self.assertListEqual(foam.manifest.written, ['system/controlDict'])
+        self.assertEqual((self._path/'system'/'controlDict').read_bytes(), content)
+        foam['foam']['system', 'controlDict', 'endTime'] = 2 * foam['foam']['system', 'controlDict', 'endTime']
+        foam['static'].data.append({'name': 'orphan', 'type': ['embed', 'text'], 'data': ''})
+        foam.save(self._path, incremental=True)
+        self.assertListEqual(foam.manifest.written, ['system/controlDict', 'orphan'])
+        foam['static'].data.pop()
+        foam.save(self._path, incremental=True)
+        self.assertListEqual(foam.manifest.removed, ['orphan'])
+        self.assertFalse((self._path/'orphan').exists())
@@ -1,6 +1,8 @@
 __all__ = ['Test']
 
 
+import io
+import typing as t
 import unittest
 
 from foam.parse.case import Case
@@ -18,7 +20,51 @@ class Test(unittest.TestCase):
         pass
 
     def test_data(self) -> None:
-        data = {
+        data = self._data()
+        self.assertListEqual(
+            list(self._case.data(data)), [
+                'dict {a (True False); b 1; c 3.14; d e; f {g {h {i j;}}} k (l m n);}',
+                'list-1 (a {b c;} d {e f;});',
+                'list-2 ({a,b c; "d|e" f;} {"(g)" h; "i.*" j k;});',
+            ],
+        )
+
+    def test_dumps(self) -> None:
+        data = self._data()
+        self.assertEqual(self._case.dumps(data), '\n'.join(self._case.data(data)))
+        with io.StringIO() as f:
+            self._case.dump({'a': list(range(2*self._case.chunk+1))}, f)
+            self.assertEqual(f.getvalue(), '\n'.join(self._case.data({'a': list(range(2*self._case.chunk+1))})))
+
+    def test_dumps_indent(self) -> None:
+        self.assertListEqual(
+            self._case.dumps({'list-1': self._data()['list-1'], 'k': ['l', 'm'], 'f': {'g': 'h'}, 'e': []}, indent=4).splitlines(), [
+                'list-1',
+                '(',
+                '    a',
+                '    {',
+                '        b c;',
+                '    }',
+                '    d',
+                '    {',
+                '        e f;',
+                '    }',
+                ');',
+                'k',
+                '(',
+                '    l',
+                '    m',
+                ');',
+                'f',
+                '{',
+                '    g h;',
+                '}',
+                'e ();',
+            ],
+        )
+
+    def _data(self) -> t.Dict[str, t.Any]:
+        return {
             'dict': {
                 'a': [True, False],
                 'b': 1,
@@ -36,10 +82,3 @@ class Test(unittest.TestCase):
                 {'(g)': 'h', 'i.*': 'j k'},
             ],
         }
-        self.assertListEqual(
-            list(self._case.data(data)), [
-                'dict {a (True False); b 1; c 3.14; d e; f {g {h {i j;}}} k (l m n);}',
-                'list-1 (a {b c;} d {e f;});',
-                'list-2 ({a,b c; "d|e" f;} {"(g)" h; "i.*" j k;});',
-            ],
-        )
@@ -1,10 +1,149 @@
 __all__ = ['Test']
 
 
+import pathlib as p
+import shutil
 import unittest
 
+import numpy as np
+
+from foam import Foam
+from foam.parse.case import Case
+from foam.parse.lark import Lark, Transformer
+from foam.util.object.field import Field
+
 
 class Test(unittest.TestCase):
     '''Test for Lark'''
 
-    pass
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._root = p.Path(__file__).parent / 'case-lark'
+        cls._root.mkdir(parents=True, exist_ok=True)
+        cls._lark = Lark.fromPath(cls._root)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        shutil.rmtree(cls._root)
+
+    def test_split_binary(self) -> None:
+        internal, value = Field.fromArray(np.random.rand(7, 3)), Field.fromArray(np.random.rand(3))
+        data = {
+            'FoamFile': {'version': 2.0, 'format': 'binary', 'class': 'volVectorField', 'object': 'U'},
+            'internalField': internal,
+            'boundaryField': {'inlet': {'type': 'fixedValue', 'value': value}},
+        }
+        path = self._root / 'U'
+        path.write_bytes(Case.default().dumpb(data))
+        text, fields = self._lark.split(path)
+        self.assertIn('internalField $__field0__;', text)
+        self.assertIn('value $__field1__;', text)
+        self.assertListEqual(fields, [internal, value])
+
+    def test_split_arch(self) -> None:
+        array = np.random.rand(5, 3)
+        header = b'FoamFile { version 2.0; format binary; arch "MSB;label=32;scalar=32"; class volVectorField; object U; }\n'
+        path = self._root / 'U32'
+        path.write_bytes(header + b'internalField nonuniform List<vector> 5\n(' + array.astype('>f4').tobytes() + b');\n')
+        text, fields = self._lark.split(path)
+        self.assertIn('internalField $__field0__;', text)
+        self.assertTrue(np.allclose(fields[0].array, array, rtol=1e-6))
+        path.unlink()
+
+    def test_split_ascii(self) -> None:
+        data = {
+            'FoamFile': {'version': 2.0, 'format': 'ascii', 'class': 'volScalarField', 'object': 'p'},
+            'internalField': Field.fromArray([1.0, 2.0]),
+        }
+        path = self._root / 'p'
+        path.write_text(Case.default().dumps(data))
+        text, fields = self._lark.split(path)
+        self.assertIn('internalField nonuniform List<scalar> 2(1.0 2.0);', text)
+        self.assertListEqual(fields, [])
+
+    def test_parse_text(self) -> None:
+        text = '''
+            FoamFile { version 2.0; format ascii; class dictionary; object fvSolution; }
+            solvers { "(U|k)" { solver smoothSolver; tolerance 1e-05; } pFinal { $p; relTol 0; } }
+            divSchemes { div(phi,U) Gauss linear; div((nuEff*dev2(T(grad(U))))) Gauss linear; }
+            nu [0 2 -1 0 0 0 0] 0.01;  // comment
+            vertices ( (0 0 0) (1 0 0) ); /* multi
+            line */
+            boundary ( movingWall { type wall; faces ((3 7 6 2)); } );
+            edges ();
+        '''
+        data = self._lark.parse_text(text)
+        self.assertDictEqual(data['solvers'], {'(U|k)': {'solver': 'smoothSolver', 'tolerance': 1e-05}, 'pFinal': {'$p': '', 'relTol': 0}})
+        self.assertListEqual(list(data['divSchemes']), ['div(phi,U)', 'div((nuEff*dev2(T(grad(U)))))'])
+        self.assertEqual(data['nu'], '[0 2 -1 0 0 0 0] 0.01')
+        self.assertListEqual(data['vertices'], ['(0 0 0)', '(1 0 0)'])
+        self.assertListEqual(data['boundary'], [{'movingWall': None, 'type': 'wall', 'faces': ['(3 7 6 2)']}])
+        self.assertListEqual(data['edges'], [])
+        # Earley fallback produces the same dictionary
+        earley = Transformer.default().transform(Lark.parser('earley').parse(text))
+        self.assertDictEqual(earley, data)
+
+    def test_parse_file(self) -> None:
+        directory = self._root / '0'
+        directory.mkdir(exist_ok=True)
+        data = {
+            'FoamFile': {'version': 2.0, 'format': 'binary', 'class': 'volScalarField', 'object': 'T'},
+            'internalField': Field.fromArray(np.random.rand(7)),
+        }
+        (directory/'T').write_bytes(Case.default().dumpb(data))
+        self.assertEqual(self._lark.parse_file(directory/'T')['internalField'], data['internalField'])
+        (directory/'include').write_text('FoamFile { version 2.0; format ascii; class dictionary; object include; }\n#include "other"\n')
+        self.assertIsNone(self._lark.parse_file(directory/'include'))
+        # broken files are not silently turned into static items
+        (directory/'T').write_bytes(Case.default().dumpb(data).replace(b');', b'];'))
+        with self.assertRaisesRegex(Exception, 'Binary block is not terminated'):
+            self._lark.parse_file(directory/'T')
+
+    def test_parse(self) -> None:
+        src, dst = self._root / 'src', self._root / 'dst'
+        Foam.fromDemo('cavity', verbose=False).save(src)
+        (src/'system'/'include').write_text('FoamFile { version 2.0; format ascii; class dictionary; object include; }\n#include "other"\n')
+        lark = Lark(src)
+        lark.parse()
+        self.assertListEqual(sorted(lark.foam), ['0', 'constant', 'system'])
+        self.assertEqual(lark.foam['system']['controlDict']['application'], 'icoFoam')
+        self.assertSetEqual({s['name'] for s in lark.static}, {'Allrun', 'paraview.foam', 'system/include'})
+        Foam(lark.to_foam_data(), src, warn=False).save(dst)
+        for path in src.rglob('*'):
+            if path.is_file() and path.name != '.manifest.json':
+                self.assertEqual(path.read_bytes(), (dst/path.relative_to(src)).read_bytes(), path)
+
+    def test_parse_workers(self) -> None:
+        src = self._root / 'workers'
+        Foam.fromDemo('cavity', verbose=False).save(src)
+        for ith in range(2):
+            Foam.fromDemo('cavity', verbose=False).save(src/f'processor{ith}')
+        serial, parallel = Lark(src), Lark(src, workers=2)
+        serial.parse()
+        parallel.parse()
+        self.assertListEqual(serial.to_foam_data(), parallel.to_foam_data())
+        self.assertIn('processor1/Allrun', {s['name'] for s in serial.static})
+        self.assertIn('controlDict', serial.foam['processor1']['system'])
+        ignored = Lark(src, workers=2, ignore=('processor*', 'paraview.foam'))
+        ignored.parse()
+        self.assertSetEqual({s['name'] for s in ignored.static}, {'Allrun'})
+        self.assertListEqual(sorted(ignored.foam), ['0', 'constant', 'system'])
+
+    def test_parse_threshold(self) -> None:
+        src = self._root / 'threshold'
+        src.mkdir()
+        (src/'small').write_text('small')
+        (src/'large').write_bytes(b'\0'*1024)
+        (src/'unicode').write_text('\u00e9'*8192)
+        lark = Lark(src, threshold=512)
+        lark.parse()
+        static = {s['name']: s for s in lark.static}
+        self.assertListEqual(static['small']['type'], ['embed', 'text'])
+        self.assertListEqual(static['unicode']['type'], ['path', 'lazy'])
+        self.assertDictEqual(
+            {key: static['large'][key] for key in ['type', 'data', 'size']},
+            {'type': ['path', 'lazy'], 'data': (src/'large').as_posix(), 'size': 1024},
+        )
+        self.assertNotIn('hash', static['large'])  # content is not hashed during ingestion
+        self.assertTrue(lark._is_text('\u00e9'.encode()*4096+'\u00e9'.encode()[:1]))
+        self.assertFalse(lark._is_text(b'\0'*8))
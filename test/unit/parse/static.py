@@ -3,6 +3,7 @@ __all__ = ['Test']
 
 import io
 import json
+import os
 import pathlib as p
 import shutil
 import time
@@ -13,6 +14,7 @@ import py7zr
 
 from foam import Foam
 from foam.parse.static import Static
+from foam.util.object.manifest import Manifest
 
 
 class Test(unittest.TestCase):
@@ -59,6 +61,26 @@ class Test(unittest.TestCase):
         self.assertTrue(path_dst.exists())
         self.assertEqual(path_dst.read_bytes(), self._content)
 
+    def test_path_lazy(self) -> None:
+        path_src = self._root / self._random_path(suffix='lazy').name
+        path_src.write_bytes(self._content)
+        path_dst = self._random_path(suffix='py')
+        stat = path_src.stat()
+        data = self._data(name=path_dst.name, types=['path', 'lazy'], data=path_src.as_posix(), permission=755)
+        data.update(size=stat.st_size, mtime=stat.st_mtime_ns)
+        self._process(data)
+        self.assertEqual(path_dst.read_bytes(), self._content)
+        self.assertEqual(oct(path_dst.stat().st_mode)[-3:], '755')
+        # touched only: changed without hash, unchanged with hash
+        os.utime(path_src, ns=(stat.st_atime_ns, stat.st_mtime_ns+10**9))
+        with self.assertRaises(Exception):
+            self._process(data)
+        self._process({**data, 'hash': Manifest.digestFile(path_src)})
+        path_src.write_bytes(self._content+b'#')
+        with self.assertRaises(Exception):
+            self._process({**data, 'hash': Manifest.digestFile(path_dst)})
+        path_src.unlink()
+
     def test_path_7z(self) -> None:
         path_src = p.Path(__file__)
         path_dst = self._case / path_src.name
@@ -0,0 +1,4 @@
+__all__ = ['Test4Sweep']
+
+
+from .sweep import Test as Test4Sweep
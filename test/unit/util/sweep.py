@@ -0,0 +1,99 @@
+__all__ = ['Test']
+
+
+import json
+import os
+import pathlib as p
+import shutil
+import threading
+import time
+import typing as t
+import unittest
+import unittest.mock
+
+import foam
+from foam.app.command.core import Command
+from foam.util.private.case import CaseBase
+from foam.util.private.sweep import Sweep
+
+
+class CaseCavity(CaseBase):
+    __template__ = p.Path(foam.__file__).parent / 'static' / 'demo' / os.environ['WM_PROJECT_VERSION'] / 'cavity.yaml'
+
+    def optional(self) -> t.Dict[str, t.Any]:
+        return {'n': 1}
+
+    def required(self, t: float, dt: float) -> t.Dict[str, t.Any]:
+        return self.dict_without_keys(vars(), 'self')
+
+    def finalize(self, foam: 'foam.Foam', optional: t.Dict[str, t.Any], required: t.Dict[str, t.Any]) -> None:
+        foam['foam'].set_via_dict({'system': {'controlDict': {'endTime': required['t'], 'deltaT': required['dt']}}})
+        if optional['n'] > 1:
+            foam['foam']['system', 'decomposeParDict'] = {
+                'FoamFile': {'class': 'dictionary'}, 'numberOfSubdomains': optional['n'], 'method': 'scotch',
+            }
+
+
+class Test(unittest.TestCase):
+    '''Test for Sweep (`Command::all_run` is stubbed, no OpenFOAM required)'''
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._root = p.Path(__file__).parent / 'sweep'
+        cls._lock = threading.Lock()
+
+    def setUp(self) -> None:
+        self._calls: t.List[str] = []
+        self._usage, self._peak = 0, 0
+        self._failing: t.Set[str] = set()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self._root, ignore_errors=True)
+
+    def test_grid(self) -> None:
+        sweep = Sweep.fromGrid(CaseCavity.new(t=0.3, dt=0.005), self._root, t=[0.3, 0.4], dt=[0.005, 0.0025])
+        self.assertListEqual(sweep.paths, [self._root/str(ith) for ith in range(4)])
+        self.assertListEqual(sweep.parameters, [
+            {'t': 0.3, 'dt': 0.005}, {'t': 0.3, 'dt': 0.0025}, {'t': 0.4, 'dt': 0.005}, {'t': 0.4, 'dt': 0.0025},
+        ])
+        sweep.save(workers=2)
+        for path, parameter in zip(sweep.paths, sweep.parameters):
+            meta = json.loads((path/Sweep.meta).read_text())
+            self.assertDictEqual(meta, {'optional': {'n': 1}, 'required': parameter})
+            self.assertIn(f'endTime {parameter["t"]};', (path/'system'/'controlDict').read_text())
+
+    def test_run(self) -> None:
+        samples = [{'t': 0.1, 'dt': 0.01, 'n': n} for n in [2, 1, 3, 1, 2]]
+        sweep = Sweep.fromSamples(CaseCavity.new(t=0.1, dt=0.01), self._root, samples).save()
+        self.assertDictEqual(json.loads((sweep.paths[2]/Sweep.meta).read_text())['optional'], {'n': 3})
+        self._failing = {'1'}
+        with self._stub():
+            codes = sweep.run(cores=3)
+        self.assertListEqual(list(codes), [path.as_posix() for path in sweep.paths])
+        self.assertEqual(codes[sweep.paths[1].as_posix()], [0, 1])
+        self.assertListEqual(sorted(self._calls), ['0', '1', '2', '3', '4'])
+        self.assertLessEqual(self._peak, 3)
+        self.assertGreater(self._peak, 1)  # cases ran concurrently
+        # completed cases are skipped on rerun, failed ones are run again
+        self._calls, self._failing = [], set()
+        rerun = Sweep.fromSamples(CaseCavity.new(t=0.1, dt=0.01), self._root, samples)
+        with self._stub():
+            codes = rerun.run(cores=3)
+        self.assertListEqual(self._calls, ['1'])
+        self.assertTrue(all(code == [0, 0] for code in codes.values()))
+        self.assertTrue(all((path/Sweep.done).exists() for path in rerun.paths))
+
+    def _stub(self) -> t.ContextManager[t.Any]:
+        '''Stub of `Command::all_run` recording calls and cores in use'''
+        return unittest.mock.patch.object(Command, 'all_run', lambda command, **kwargs: self._all_run(command, **kwargs))
+
+    def _all_run(self, command: Command, **kwargs: t.Any) -> t.List[int]:
+        name, need = command._foam.destination.name, command._foam.number_of_processors
+        with self._lock:
+            self._calls.append(name)
+            self._usage += need
+            self._peak = max(self._peak, self._usage)
+        time.sleep(0.05)
+        with self._lock:
+            self._usage -= need
+        return [0, 1 if name in self._failing else 0]